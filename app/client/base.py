@@ -4,26 +4,71 @@ Base API Client
 
 import asyncio
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import httpx
 
 from app.core.config import get_settings
 from app.core.logging import logger
-from app.core.constants import MIN_REQUEST_INTERVAL
+from app.core import codec
+from app.core.metrics import metrics, SIZE_BUCKETS
 from app.shared.exceptions import APIException, RateLimitException
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .priority import get_request_scheduler
+from .transport import HTTPTransport, get_http_transport
+from .singleflight import SingleFlight, get_singleflight
+from .retry import RetryPolicy, RetryBudget, get_retry_budget, parse_retry_after
+from .circuit_breaker import CircuitBreakerRegistry, get_circuit_breakers
+from .cache import ResponseCache, get_response_cache
 
 settings = get_settings()
 
+# Per endpoint/tr_id API metrics
+_LABELS = ("endpoint", "tr_id")
+_queue_wait = metrics.histogram(
+    "api_queue_wait_seconds", "Time queued behind other API requests", _LABELS
+)
+_limiter_wait = metrics.histogram(
+    "api_limiter_wait_seconds", "Time waiting for rate limit budget", _LABELS
+)
+_network_time = metrics.histogram(
+    "api_network_seconds", "Upstream request/response time", _LABELS
+)
+_decode_time = metrics.histogram("api_decode_seconds", "Response JSON decode time", _LABELS)
+_response_bytes = metrics.histogram(
+    "api_response_bytes", "Response payload size", _LABELS, buckets=SIZE_BUCKETS
+)
+_responses = metrics.counter(
+    "api_responses_total", "API responses by status (or 'error')", _LABELS + ("status",)
+)
+
 
 class BaseAPIClient:
     """Base class for API clients with rate limiting and error handling"""
     
-    def __init__(self, base_url: Optional[str] = None):
+    # Retry policies keyed by tr_id or endpoint (overridden by subclasses)
+    retry_policies: Dict[str, RetryPolicy] = {}
+    default_retry_policy: RetryPolicy = RetryPolicy()
+    
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        transport: Optional[HTTPTransport] = None,
+        singleflight: Optional[SingleFlight] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
         self.base_url = base_url or settings.KIWOOM_BASE_URL
-        self._client: Optional[httpx.AsyncClient] = None
-        self._last_request_time: float = 0
+        # Borrowed connection pool; owned by the application lifespan
+        self._transport = transport
         self._request_count: int = 0
-        self._rate_limit_lock = asyncio.Lock()
+        # Shared across all client instances unless explicitly overridden
+        self._rate_limiter = rate_limiter or get_rate_limiter()
+        self._singleflight = singleflight or get_singleflight()
+        self._retry_budget = retry_budget or get_retry_budget()
+        self._circuit_breakers = circuit_breakers or get_circuit_breakers()
+        self._cache = cache or get_response_cache()
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -35,33 +80,143 @@ class BaseAPIClient:
         await self.close()
     
     async def _ensure_client(self):
-        """Ensure HTTP client is initialized"""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
-                base_url=self.base_url,
-                timeout=httpx.Timeout(30.0),
-                follow_redirects=True,
-            )
+        """Ensure the shared HTTP transport is attached"""
+        if self._transport is None:
+            self._transport = get_http_transport()
     
     async def close(self):
-        """Close HTTP client"""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
-    
-    async def _wait_for_rate_limit(self):
-        """Wait to comply with rate limiting"""
-        async with self._rate_limit_lock:
-            current_time = time.time()
-            time_since_last_request = current_time - self._last_request_time
-            
-            if time_since_last_request < MIN_REQUEST_INTERVAL:
-                wait_time = MIN_REQUEST_INTERVAL - time_since_last_request
-                logger.debug(f"Rate limiting: waiting {wait_time:.3f}s")
-                await asyncio.sleep(wait_time)
-            
-            self._last_request_time = time.time()
-            self._request_count += 1
+        """
+        Release the HTTP transport
+        
+        The transport is shared, so pooled connections stay open for other
+        clients; they are closed by close_http_transport() on shutdown.
+        """
+    
+    async def _wait_for_rate_limit(
+        self, rate_limiter: Optional[RateLimiter] = None
+    ) -> Tuple[float, float]:
+        """
+        Wait to comply with rate limiting
+        
+        Args:
+            rate_limiter: Limiter to take a token from (default: client's limiter)
+        
+        Returns:
+            (seconds queued behind other requests, seconds waiting for budget)
+        """
+        # Queue by priority lane (see request_priority) before taking a token
+        waited = await get_request_scheduler(rate_limiter or self._rate_limiter).acquire()
+        self._request_count += 1
+        return waited
+    
+    async def _route_request(
+        self,
+        endpoint: str,
+        headers: Optional[Dict[str, str]],
+        exclude: Tuple[Any, ...],
+    ) -> Tuple[Optional[Dict[str, str]], RateLimiter, Optional[Any]]:
+        """
+        Choose where one attempt goes (hook for credential pools)
+        
+        Args:
+            endpoint: API endpoint
+            headers: Request headers
+            exclude: Routes that were throttled earlier in this request
+        
+        Returns:
+            (headers to send, rate limiter to wait on, route handle or None)
+        """
+        return headers, self._rate_limiter, None
+    
+    def _route_finished(
+        self,
+        route: Any,
+        status_code: Optional[int],
+        retry_after: Optional[float],
+    ) -> bool:
+        """
+        Report an attempt outcome for a route
+        
+        Returns:
+            True if a throttled request can fail over to another route now
+        """
+        return False
+    
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """
+        Get single-flight statistics
+        
+        Returns:
+            Shared-call counters (process-wide)
+        """
+        return self._singleflight.get_stats()
+    
+    def get_retry_stats(self) -> Dict[str, Any]:
+        """
+        Get retry budget statistics
+        
+        Returns:
+            Retry budget counters (process-wide)
+        """
+        return self._retry_budget.get_stats()
+    
+    def get_circuit_stats(self) -> Dict[str, Any]:
+        """
+        Get circuit breaker states
+        
+        Returns:
+            Per-endpoint breaker stats and recent state changes (process-wide)
+        """
+        return self._circuit_breakers.get_stats()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get response cache statistics
+        
+        Returns:
+            Hit/miss/eviction counters (process-wide)
+        """
+        return self._cache.get_stats()
+    
+    def invalidate_cache(self, tr_id: Optional[str] = None) -> int:
+        """
+        Drop cached responses
+        
+        Args:
+            tr_id: Only drop responses for this tr_id (default: all)
+        
+        Returns:
+            Number of entries removed
+        """
+        return self._cache.invalidate(tr_id)
+    
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """
+        Get priority lane metrics
+        
+        Returns:
+            Per-lane queue depth and wait times for this client's limiter
+        """
+        return get_request_scheduler(self._rate_limiter).get_stats()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get API latency histograms and client stats
+        
+        Returns:
+            Snapshot of queue/limiter/network/decode timings, payload sizes
+            and status counts per endpoint/tr_id (shared by all clients)
+        """
+        return metrics.snapshot()
+    
+    def get_rate_limit_status(self) -> Dict[str, Any]:
+        """
+        Get remaining rate limit budget
+        
+        Returns:
+            Rate limiter statistics (shared by all clients)
+        """
+        return self._rate_limiter.get_stats()
     
     async def _request(
         self,
@@ -75,6 +230,12 @@ class BaseAPIClient:
         """
         Make HTTP request with rate limiting and error handling
         
+        Concurrent identical GET requests are coalesced into one upstream call;
+        every caller receives the same parsed response object, which must be
+        treated as read-only. GETs for tr_ids listed in CACHE_TTL_BY_TR_ID are
+        served from the response cache. Transient failures (network errors, 429, 5xx)
+        are retried according to get_retry_policy().
+        
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint
@@ -89,50 +250,171 @@ class BaseAPIClient:
         Raises:
             APIException: On API errors
             RateLimitException: On rate limit errors
+            CircuitOpenException: If the endpoint's circuit is open
         """
         await self._ensure_client()
-        await self._wait_for_rate_limit()
         
+        if method == "GET":
+            # Identical concurrent GETs share one upstream call and response
+            key = self._request_key(method, endpoint, headers, params)
+            
+            async def fetch():
+                return await self._singleflight.do(
+                    key,
+                    lambda: self._send(method, endpoint, headers, params, json, data),
+                )
+            
+            tr_id = key[2]
+            if self._cache.is_cacheable(tr_id):
+                return await self._cache.get_or_fetch(key, tr_id, fetch)
+            return await fetch()
+        
+        return await self._send(method, endpoint, headers, params, json, data)
+    
+    @staticmethod
+    def _request_key(
+        method: str,
+        endpoint: str,
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, Any]],
+    ) -> tuple:
+        """Build identity of a request for coalescing"""
+        tr_id = (headers or {}).get("tr_id")
+        param_items = tuple(sorted((params or {}).items()))
+        return (method, endpoint, tr_id, param_items)
+    
+    def get_retry_policy(self, endpoint: str, tr_id: Optional[str] = None) -> RetryPolicy:
+        """
+        Resolve retry policy for a request
+        
+        Policies are looked up by tr_id first, then by endpoint path.
+        
+        Args:
+            endpoint: API endpoint
+            tr_id: Transaction ID header, if any
+        
+        Returns:
+            Retry policy to apply
+        """
+        if tr_id and tr_id in self.retry_policies:
+            return self.retry_policies[tr_id]
+        return self.retry_policies.get(endpoint, self.default_retry_policy)
+    
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, Any]],
+        json: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Send request upstream, retrying transient failures per policy"""
         url = endpoint if endpoint.startswith("http") else f"{self.base_url}{endpoint}"
+        tr_id = (headers or {}).get("tr_id")
+        policy = self.get_retry_policy(endpoint, tr_id)
+        breaker = self._circuit_breakers.get(f"{endpoint}:{tr_id}" if tr_id else endpoint)
+        labels = (endpoint, tr_id or "")
+        self._retry_budget.record_request()
         
-        logger.debug(f"API Request: {method} {url}")
-        
-        try:
-            response = await self._client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                json=json,
-                data=data,
-            )
+        attempt = 0
+        throttled_routes: Tuple[Any, ...] = ()
+        while True:
+            attempt += 1
+            # Fail fast while the endpoint is known to be degraded
+            breaker.before_call()
             
-            # Check for rate limiting
-            if response.status_code == 429:
-                logger.warning("Rate limit exceeded")
-                raise RateLimitException()
+            retry_after: Optional[float] = None
+            route = None
+            try:
+                send_headers, rate_limiter, route = await self._route_request(
+                    endpoint, headers, throttled_routes
+                )
+                queue_wait, limiter_wait = await self._wait_for_rate_limit(rate_limiter)
+                _queue_wait.labels(*labels).observe(queue_wait)
+                _limiter_wait.labels(*labels).observe(limiter_wait)
+                
+                logger.debug(f"API Request: {method} {url} (attempt {attempt})")
+                
+                started = time.perf_counter()
+                response = await self._transport.request(
+                    method=method,
+                    url=url,
+                    headers=send_headers,
+                    params=params,
+                    json=json,
+                    data=data,
+                )
+                _network_time.labels(*labels).observe(time.perf_counter() - started)
+            except httpx.RequestError as e:
+                self._route_finished(route, None, None)
+                _responses.inc(*labels, "error")
+                breaker.record_failure()
+                logger.warning(f"Request error: {str(e)}")
+                error: Exception = APIException(message=f"Request failed: {str(e)}")
+                retryable = policy.retry_on_network_errors
+            except BaseException:
+                # Cancellation etc.: free a half-open probe slot
+                self._route_finished(route, None, None)
+                breaker.release()
+                raise
+            else:
+                # Log response
+                logger.debug(f"API Response: {response.status_code}")
+                _responses.inc(*labels, str(response.status_code))
+                _response_bytes.labels(*labels).observe(len(response.content))
+                
+                if response.status_code == 429:
+                    breaker.release()
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                elif response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                failover = self._route_finished(route, response.status_code, retry_after)
+                
+                if response.is_success:
+                    started = time.perf_counter()
+                    try:
+                        result = codec.loads(response.content)
+                    except codec.JSONDecodeError as e:
+                        raise APIException(message=f"Invalid JSON response: {str(e)}")
+                    _decode_time.labels(*labels).observe(time.perf_counter() - started)
+                    return result
+                
+                retryable = policy.should_retry_status(response.status_code)
+                
+                # Check for rate limiting
+                if response.status_code == 429:
+                    logger.warning(f"Rate limit exceeded (Retry-After: {retry_after})")
+                    error = RateLimitException(retry_after=retry_after)
+                    if failover:
+                        # Another route has budget: fail over without backoff
+                        throttled_routes += (route,)
+                        attempt -= 1
+                        continue
+                else:
+                    log = logger.warning if retryable else logger.error
+                    log(f"HTTP error: {response.status_code} - {response.text}")
+                    error = APIException(
+                        message=f"HTTP {response.status_code}: {response.text}",
+                        status_code=response.status_code,
+                    )
             
-            # Log response
-            logger.debug(f"API Response: {response.status_code}")
+            if not retryable or attempt >= policy.max_attempts:
+                raise error
             
-            # Raise for HTTP errors
-            response.raise_for_status()
+            delay = policy.backoff(attempt, retry_after)
+            if delay is None:
+                logger.warning(f"Retry-After {retry_after}s exceeds policy, not retrying")
+                raise error
             
-            # Parse JSON response
-            return response.json()
+            if not self._retry_budget.try_spend():
+                logger.warning("Retry budget exhausted, not retrying")
+                raise error
             
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error: {e.response.status_code} - {e.response.text}")
-            raise APIException(
-                message=f"HTTP {e.response.status_code}: {e.response.text}",
-                status_code=e.response.status_code,
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Request error: {str(e)}")
-            raise APIException(message=f"Request failed: {str(e)}")
-        except Exception as e:
-            logger.exception(f"Unexpected error: {str(e)}")
-            raise APIException(message=f"Unexpected error: {str(e)}")
+            logger.info(f"Retrying {method} {endpoint} in {delay:.3f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
     
     async def get(
         self,
@@ -0,0 +1,181 @@
+"""
+TTL + LRU response cache for Kiwoom REST reads
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, Awaitable, Hashable
+
+from app.core.logging import logger
+from app.core.constants import CACHE_MAX_ENTRIES, CACHE_TTL_BY_TR_ID
+from app.core.metrics import metrics
+
+
+class _CacheEntry:
+    """Cached value with freshness deadlines"""
+
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache with per-tr_id TTL and stale-while-revalidate
+
+    Fresh entries are returned directly. Entries past their TTL but inside the
+    stale window are returned immediately while a background refresh runs.
+    Cached reads never touch the rate limiter.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl_by_tr_id: Optional[Dict[str, tuple]] = None,
+    ):
+        """
+        Args:
+            max_entries: Maximum number of cached responses
+            ttl_by_tr_id: {tr_id: (ttl_seconds, stale_seconds)}; tr_ids not
+                listed are not cached
+        """
+        self.max_entries = max_entries
+        self.ttl_by_tr_id = dict(CACHE_TTL_BY_TR_ID if ttl_by_tr_id is None else ttl_by_tr_id)
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def is_cacheable(self, tr_id: Optional[str]) -> bool:
+        """Check whether responses for a tr_id are cached"""
+        return tr_id is not None and tr_id in self.ttl_by_tr_id
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a fresh value (no stale reads, no stats)"""
+        entry = self._entries.get(key)
+        if entry is None or entry.fresh_until < time.monotonic():
+            return None
+        return entry.value
+
+    def set(self, key: Hashable, tr_id: str, value: Any) -> None:
+        """Store value using the tr_id's TTL"""
+        ttl, stale = self.ttl_by_tr_id[tr_id]
+        now = time.monotonic()
+        self._entries[key] = _CacheEntry(value, now + ttl, now + ttl + stale)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        tr_id: str,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Return cached value or fetch it
+
+        Args:
+            key: Request identity
+            tr_id: Transaction ID (selects TTL)
+            fetch: Coroutine function fetching the value upstream
+
+        Returns:
+            Cached or freshly fetched value
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if now < entry.fresh_until:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+
+            if now < entry.stale_until:
+                self._stale_hits += 1
+                self._entries.move_to_end(key)
+                self._revalidate(key, tr_id, fetch)
+                return entry.value
+
+            del self._entries[key]
+
+        self._misses += 1
+        value = await fetch()
+        self.set(key, tr_id, value)
+        return value
+
+    def _revalidate(self, key: Hashable, tr_id: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        """Refresh an entry in the background (once per key)"""
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                self.set(key, tr_id, await fetch())
+            except Exception as e:
+                logger.debug(f"Background cache refresh failed ({tr_id}): {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.ensure_future(refresh())
+
+    def invalidate(self, tr_id: Optional[str] = None) -> int:
+        """
+        Drop cached responses
+
+        Args:
+            tr_id: Only drop entries for this tr_id (default: everything)
+
+        Returns:
+            Number of entries removed
+        """
+        if tr_id is None:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+        # Request keys are (method, endpoint, tr_id, params)
+        keys = [k for k in self._entries if isinstance(k, tuple) and len(k) > 2 and k[2] == tr_id]
+        for k in keys:
+            del self._entries[k]
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with size, hit/miss and eviction counters
+        """
+        lookups = self._hits + self._stale_hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "stale_hits": self._stale_hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_ratio": round((self._hits + self._stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Process-wide response cache
+_cache_instance: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache singleton"""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = ResponseCache()
+        metrics.register_collector("response_cache", _cache_instance.get_stats)
+    return _cache_instance
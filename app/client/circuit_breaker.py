@@ -0,0 +1,236 @@
+"""
+Circuit breakers for Kiwoom REST and WebSocket endpoints
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, Callable, List
+
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.core.constants import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RECOVERY_TIMEOUT,
+    CIRCUIT_HALF_OPEN_MAX_CALLS,
+)
+from app.shared.exceptions import CircuitOpenException
+
+# Circuit states
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+StateListener = Callable[[str, str, str], None]
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker for one endpoint
+
+    - closed: calls pass; consecutive failures are counted
+    - open: calls fail fast until `recovery_timeout` elapses
+    - half-open: up to `half_open_max_calls` probes run; if all of them succeed
+      the circuit closes, any failure re-opens it
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout: float = CIRCUIT_RECOVERY_TIMEOUT,
+        half_open_max_calls: int = CIRCUIT_HALF_OPEN_MAX_CALLS,
+        on_state_change: Optional[StateListener] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._on_state_change = on_state_change
+
+        self._state = STATE_CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        self._lock = threading.Lock()
+
+        self._rejected = 0
+        self._failures = 0
+        self._successes = 0
+
+    @property
+    def state(self) -> str:
+        """Current state (open transitions to half-open lazily)"""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _set_state(self, new_state: str) -> None:
+        """Transition state (lock held)"""
+        old_state = self._state
+        if old_state == new_state:
+            return
+        self._state = new_state
+        if new_state == STATE_OPEN:
+            self._opened_at = time.monotonic()
+        if new_state == STATE_HALF_OPEN:
+            self._half_open_in_flight = 0
+            self._half_open_successes = 0
+        if new_state == STATE_CLOSED:
+            self._consecutive_failures = 0
+
+        log = logger.warning if new_state == STATE_OPEN else logger.info
+        log(f"Circuit '{self.name}': {old_state} -> {new_state}")
+        if self._on_state_change:
+            self._on_state_change(self.name, old_state, new_state)
+
+    def _maybe_half_open(self) -> None:
+        """Move from open to half-open once the recovery timeout elapsed"""
+        if (
+            self._state == STATE_OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._set_state(STATE_HALF_OPEN)
+
+    def before_call(self) -> None:
+        """
+        Admit a call or fail fast
+
+        Raises:
+            CircuitOpenException: If the circuit is open or probes are exhausted
+        """
+        with self._lock:
+            self._maybe_half_open()
+
+            if self._state == STATE_OPEN:
+                self._rejected += 1
+                retry_in = self.recovery_timeout - (time.monotonic() - self._opened_at)
+                raise CircuitOpenException(
+                    f"Circuit '{self.name}' is open (retry in {max(retry_in, 0):.1f}s)"
+                )
+
+            if self._state == STATE_HALF_OPEN:
+                if self._half_open_in_flight >= self.half_open_max_calls:
+                    self._rejected += 1
+                    raise CircuitOpenException(f"Circuit '{self.name}' is half-open (probing)")
+                self._half_open_in_flight += 1
+
+    def record_success(self) -> None:
+        """Record a healthy response"""
+        with self._lock:
+            self._successes += 1
+            if self._state == STATE_HALF_OPEN:
+                self._half_open_in_flight = max(self._half_open_in_flight - 1, 0)
+                self._half_open_successes += 1
+                if self._half_open_successes >= self.half_open_max_calls:
+                    self._set_state(STATE_CLOSED)
+            else:
+                self._consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        """Record a failure (timeout, network error, 5xx)"""
+        with self._lock:
+            self._failures += 1
+            if self._state == STATE_HALF_OPEN:
+                self._half_open_in_flight = max(self._half_open_in_flight - 1, 0)
+                self._set_state(STATE_OPEN)
+                return
+
+            self._consecutive_failures += 1
+            if self._state == STATE_CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._set_state(STATE_OPEN)
+
+    def release(self) -> None:
+        """Finish a call without judging endpoint health (e.g. throttled)"""
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                self._half_open_in_flight = max(self._half_open_in_flight - 1, 0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get breaker statistics
+
+        Returns:
+            Dictionary with state and counters
+        """
+        state = self.state
+        return {
+            "name": self.name,
+            "state": state,
+            "is_open": state == STATE_OPEN,
+            "consecutive_failures": self._consecutive_failures,
+            "successes": self._successes,
+            "failures": self._failures,
+            "rejected": self._rejected,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers keyed by endpoint/tr_id, with state change history"""
+
+    def __init__(self, history_size: int = 100):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._listeners: List[StateListener] = []
+        self._history: deque = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        """Get (or create) breaker for a key"""
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(name)
+                if breaker is None:
+                    breaker = CircuitBreaker(name, on_state_change=self._notify)
+                    self._breakers[name] = breaker
+        return breaker
+
+    def add_listener(self, listener: StateListener) -> None:
+        """
+        Register callback for state changes
+
+        Args:
+            listener: Called as listener(name, old_state, new_state)
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, name: str, old_state: str, new_state: str) -> None:
+        """Record transition and notify listeners"""
+        self._history.append({
+            "name": name,
+            "from": old_state,
+            "to": new_state,
+            "at": datetime.now().isoformat(),
+        })
+        for listener in self._listeners:
+            try:
+                listener(name, old_state, new_state)
+            except Exception as e:
+                logger.error(f"Circuit state listener failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get all breaker states and recent transitions
+
+        Returns:
+            Dictionary with per-breaker stats and transition history
+        """
+        return {
+            "breakers": {name: b.get_stats() for name, b in list(self._breakers.items())},
+            "transitions": list(self._history),
+        }
+
+
+# Process-wide registry shared by REST and WebSocket clients
+_registry_instance: Optional[CircuitBreakerRegistry] = None
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Process-wide circuit breaker registry singleton"""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = CircuitBreakerRegistry()
+        metrics.register_collector("circuit", _registry_instance.get_stats)
+    return _registry_instance
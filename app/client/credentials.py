@@ -0,0 +1,245 @@
+"""
+App key credential pool that shards Kiwoom API traffic across keys
+"""
+
+import hashlib
+import time
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.core.constants import CREDENTIAL_THROTTLE_COOLDOWN
+from app.core.metrics import metrics
+from app.core.security import TokenManager, token_manager
+from .rate_limiter import RateLimiter, get_rate_limiter
+
+settings = get_settings()
+
+
+def parse_app_keys(value: Optional[str]) -> List[Tuple[str, str]]:
+    """
+    Parse KIWOOM_APP_KEYS setting
+
+    Args:
+        value: Comma separated "appkey:secret" pairs
+
+    Returns:
+        List of (app_key, app_secret)
+
+    Raises:
+        ValueError: On malformed entries
+    """
+    pairs = []
+    for entry in (value or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        app_key, sep, app_secret = entry.partition(":")
+        if not sep or not app_key.strip() or not app_secret.strip():
+            raise ValueError("KIWOOM_APP_KEYS entries must be 'appkey:secret'")
+        pairs.append((app_key.strip(), app_secret.strip()))
+    return pairs
+
+
+class Credential:
+    """One app key with its own token, rate limiter and health state"""
+
+    def __init__(
+        self,
+        app_key: str,
+        app_secret: str,
+        tokens: TokenManager,
+        rate_limiter: RateLimiter,
+    ):
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.tokens = tokens
+        self.rate_limiter = rate_limiter
+        self.name = rate_limiter.name
+
+        self.in_flight = 0
+        self.throttled_until = 0.0
+        self._requests = 0
+        self._throttled = 0
+
+    def is_throttled(self, now: Optional[float] = None) -> bool:
+        """Whether the key is cooling down after a 429"""
+        return (now or time.monotonic()) < self.throttled_until
+
+    def load(self) -> float:
+        """Requests routed to the key (queued or in flight) relative to its rate"""
+        return self.in_flight / self.rate_limiter.per_second
+
+    def begin(self) -> None:
+        """Mark a request routed to this key"""
+        self.in_flight += 1
+        self._requests += 1
+
+    def finish(self, status_code: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        """
+        Report a request outcome
+
+        Args:
+            status_code: HTTP status (None on network error or cancellation)
+            retry_after: Retry-After seconds from a 429 response
+        """
+        self.in_flight = max(self.in_flight - 1, 0)
+        if status_code == 429:
+            self._throttled += 1
+            cooldown = retry_after if retry_after is not None else CREDENTIAL_THROTTLE_COOLDOWN
+            self.throttled_until = max(self.throttled_until, time.monotonic() + cooldown)
+            logger.warning(f"App key {self.name} throttled for {cooldown:.1f}s")
+
+    def auth_headers(self, access_token: str) -> Dict[str, str]:
+        """Authentication headers for this key"""
+        return {
+            "authorization": f"Bearer {access_token}",
+            "appkey": self.app_key,
+            "appsecret": self.app_secret,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get key statistics
+
+        Returns:
+            Dictionary with load, health and counters
+        """
+        now = time.monotonic()
+        return {
+            "name": self.name,
+            "has_token": self.tokens.is_token_valid(),
+            "in_flight": self.in_flight,
+            "load": round(self.load(), 3),
+            "throttled": self.is_throttled(now),
+            "throttled_for_seconds": round(max(self.throttled_until - now, 0.0), 3),
+            "requests": self._requests,
+            "throttled_count": self._throttled,
+            "rate_limit": self.rate_limiter.get_stats(),
+        }
+
+
+class CredentialPool:
+    """
+    Pool of app keys
+
+    Requests go to the least loaded key that is not cooling down after a 429,
+    so total throughput grows with the number of keys.
+    """
+
+    def __init__(self, credentials: Iterable[Credential]):
+        self.credentials = list(credentials)
+        if not self.credentials:
+            raise ValueError("Credential pool needs at least one app key")
+
+    @property
+    def primary(self) -> Credential:
+        """First key (also used for WebSocket login)"""
+        return self.credentials[0]
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    def select(self, exclude: Iterable[Credential] = ()) -> Credential:
+        """
+        Pick the key for the next request
+
+        Args:
+            exclude: Keys to avoid (e.g. already throttled for this request)
+
+        Returns:
+            Least loaded healthy key, or the one recovering soonest if all
+            keys are throttled or excluded
+        """
+        if len(self.credentials) == 1:
+            return self.primary
+
+        now = time.monotonic()
+        excluded = set(map(id, exclude))
+        healthy = [
+            c for c in self.credentials
+            if id(c) not in excluded and not c.is_throttled(now)
+        ]
+        if healthy:
+            return min(healthy, key=lambda c: (c.load(), -c.rate_limiter.remaining()["per_second"]))
+        return min(self.credentials, key=lambda c: (c.throttled_until, c.load()))
+
+    def has_available(self, exclude: Iterable[Credential] = ()) -> bool:
+        """Whether a healthy key outside `exclude` exists"""
+        now = time.monotonic()
+        excluded = set(map(id, exclude))
+        return any(
+            id(c) not in excluded and not c.is_throttled(now) for c in self.credentials
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get per-key statistics
+
+        Returns:
+            Dictionary keyed by key name
+        """
+        return {
+            "keys": len(self.credentials),
+            "healthy": sum(1 for c in self.credentials if not c.is_throttled()),
+            "credentials": {c.name: c.get_stats() for c in self.credentials},
+        }
+
+
+def _credential_name(app_key: str) -> str:
+    """
+    Short, non-secret key label
+
+    Used for the token file suffix, rate limiter and metrics, so it must be
+    unique per key and must not reveal any part of it.
+    """
+    return f"key_{hashlib.sha256(app_key.encode()).hexdigest()[:8]}"
+
+
+def build_credential_pool() -> CredentialPool:
+    """
+    Build pool from settings
+
+    KIWOOM_APP_KEY/KIWOOM_APP_SECRET is the primary key and keeps the
+    process-wide token manager and rate limiter; keys from KIWOOM_APP_KEYS get
+    their own token file and limiter.
+    """
+    credentials = [
+        Credential(
+            settings.KIWOOM_APP_KEY,
+            settings.KIWOOM_APP_SECRET,
+            tokens=token_manager,
+            rate_limiter=get_rate_limiter(),
+        )
+    ]
+    seen = {settings.KIWOOM_APP_KEY}
+    for app_key, app_secret in parse_app_keys(settings.KIWOOM_APP_KEYS):
+        if app_key in seen:
+            continue
+        seen.add(app_key)
+        name = _credential_name(app_key)
+        credentials.append(
+            Credential(
+                app_key,
+                app_secret,
+                tokens=TokenManager(f"{settings.KIWOOM_TOKEN_FILE}.{name}"),
+                rate_limiter=RateLimiter(name=name),
+            )
+        )
+
+    if len(credentials) > 1:
+        logger.info(f"Credential pool: {len(credentials)} app keys")
+    return CredentialPool(credentials)
+
+
+# Process-wide pool shared by every REST client
+_pool_instance: Optional[CredentialPool] = None
+
+
+def get_credential_pool() -> CredentialPool:
+    """Process-wide credential pool singleton"""
+    global _pool_instance
+    if _pool_instance is None:
+        _pool_instance = build_credential_pool()
+        metrics.register_collector("credentials", _pool_instance.get_stats)
+    return _pool_instance
@@ -0,0 +1,190 @@
+"""
+Bounded handler queues for WebSocket messages
+
+The receive loop only decodes frames and enqueues them; worker tasks run the
+handlers. Each queue is bounded and has an overflow policy:
+
+- block: the receive loop waits for space (no message is lost)
+- drop_oldest: the oldest queued message is discarded
+- conflate: messages with the same key replace the queued one in place
+  (e.g. only the latest tick per stock matters); a new key on a full queue
+  drops the oldest
+"""
+
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.logging import logger
+from app.core.metrics import metrics
+
+POLICY_BLOCK = "block"
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_CONFLATE = "conflate"
+POLICIES = (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_CONFLATE)
+
+Handler = Callable[[Any], Awaitable[Any]]
+KeyFunc = Callable[[Any], Any]
+
+_queue_wait = metrics.histogram(
+    "ws_queue_wait_seconds", "Time a WebSocket message waited for a handler", ("queue",)
+)
+_handler_time = metrics.histogram(
+    "ws_handler_seconds", "WebSocket handler run time", ("trnm",)
+)
+_overflow = metrics.counter(
+    "ws_queue_overflow_total", "WebSocket messages dropped or conflated", ("queue", "action")
+)
+
+
+class DispatchQueue:
+    """
+    Bounded queue with its own worker tasks
+
+    Example:
+        queue = DispatchQueue("REAL:0B", handle_tick, policy=POLICY_CONFLATE,
+                              key=lambda item: item["item"])
+        await queue.put(item)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        maxsize: int,
+        policy: str = POLICY_BLOCK,
+        key: Optional[KeyFunc] = None,
+        workers: int = 1,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        if policy == POLICY_CONFLATE and key is None:
+            raise ValueError("Conflating queue needs a key function")
+        self.name = name
+        self.handler = handler
+        self.maxsize = max(maxsize, 1)
+        self.policy = policy
+        self.key = key
+        self.workers = max(workers, 1)
+
+        # key -> (enqueued_at, message); plain queues use a running number as key
+        self._items: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._counter = itertools.count()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._active = 0
+
+        self._processed = 0
+        self._dropped = 0
+        self._conflated = 0
+        self._errors = 0
+        self._max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def put(self, message: Any) -> None:
+        """Enqueue a message, applying the overflow policy when full"""
+        self._ensure_workers()
+
+        if self.policy == POLICY_CONFLATE:
+            item_key = self.key(message)
+            queued = self._items.get(item_key)
+            if queued is not None:
+                # Keep position and original enqueue time, replace payload
+                self._items[item_key] = (queued[0], message)
+                self._conflated += 1
+                _overflow.inc(self.name, "conflated")
+                return
+        else:
+            item_key = next(self._counter)
+
+        while len(self._items) >= self.maxsize:
+            if self.policy == POLICY_BLOCK:
+                self._space.clear()
+                await self._space.wait()
+                continue
+            self._items.popitem(last=False)
+            self._dropped += 1
+            _overflow.inc(self.name, "dropped")
+
+        self._items[item_key] = (time.perf_counter(), message)
+        self._max_depth = max(self._max_depth, len(self._items))
+        self._ready.set()
+
+    def _ensure_workers(self) -> None:
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.ensure_future(self._worker()))
+
+    async def _worker(self) -> None:
+        wait_time = _queue_wait.labels(self.name)
+        handler_time = _handler_time.labels(self.name)
+        while True:
+            while not self._items:
+                self._ready.clear()
+                await self._ready.wait()
+
+            _, (enqueued_at, message) = self._items.popitem(last=False)
+            self._space.set()
+            started = time.perf_counter()
+            wait_time.observe(started - enqueued_at)
+
+            self._active += 1
+            try:
+                await self.handler(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._errors += 1
+                logger.error(f"WebSocket handler error ({self.name}): {e}")
+            finally:
+                self._active -= 1
+                self._processed += 1
+                handler_time.observe(time.perf_counter() - started)
+
+    async def drain(self, poll_interval: float = 0.01) -> None:
+        """Wait until every queued message has been handled"""
+        while self._items or self._active:
+            await asyncio.sleep(poll_interval)
+
+    def cancel(self) -> None:
+        """Cancel workers without waiting (queued messages are discarded)"""
+        for task in self._tasks:
+            task.cancel()
+        self._items.clear()
+        self._space.set()
+
+    async def close(self) -> None:
+        """Stop workers (queued messages are discarded)"""
+        tasks = self._tasks
+        self.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics
+
+        Returns:
+            Dictionary with depth, policy and counters
+        """
+        return {
+            "depth": len(self._items),
+            "max_depth": self._max_depth,
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+            "workers": self.workers,
+            "active": self._active,
+            "processed": self._processed,
+            "dropped": self._dropped,
+            "conflated": self._conflated,
+            "errors": self._errors,
+        }
@@ -0,0 +1,293 @@
+"""
+FID dictionary and generated decoders for Kiwoom payloads
+
+WebSocket rows and REAL push values are dicts keyed by FID strings ('9001',
+'302', '10', ...) holding zero-padded, signed numeric strings ('000075000',
+'-00000100'). Decoders are generated once from a FID list: one turns a row
+into a `__slots__` record, the other turns a whole page into columns (arrays
+for numeric fields).
+
+Example:
+    row = decode_condition_row({'9001': 'A005930', '302': '삼성전자', '10': '000075000'})
+    row.stock_code, row.current_price  # ('005930', 75000)
+
+    columns = decode_condition_page(page["data"])
+    columns["current_price"]  # array('q', [75000, ...])
+"""
+
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+
+def parse_code(value: Optional[str]) -> str:
+    """Stock code without whitespace and the 'A' prefix ('A005930' -> '005930')"""
+    return value.strip().lstrip("A") if value else ""
+
+
+def parse_str(value: Optional[str]) -> str:
+    """Trimmed text"""
+    return value.strip() if value else ""
+
+
+def parse_int(value: Optional[str]) -> Optional[int]:
+    """Signed zero-padded integer ('-00000100' -> -100)"""
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def parse_price(value: Optional[str]) -> Optional[int]:
+    """Price without the direction sign ('-000075000' -> 75000)"""
+    number = parse_int(value)
+    return abs(number) if number is not None else None
+
+
+def parse_rate(value: Optional[str]) -> Optional[float]:
+    """
+    Percentage
+
+    CNSRREQ rows send the rate in thousandths of a percent ('-00000130' ->
+    -0.13), rounded to two decimals; decimal strings ('+0.12', as in
+    realtime pushes) are also accepted.
+    """
+    if not value:
+        return None
+    try:
+        if "." in value:
+            return parse_decimal(value)
+        return round(int(value) / 1000, 2)
+    except ValueError:
+        return None
+
+
+def parse_decimal(value: Optional[str]) -> Optional[float]:
+    """Signed decimal ('+0.12' -> 0.12)"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class Kind:
+    """
+    Value kind of a FID
+
+    Attributes:
+        parser: Tolerant parser (missing or malformed -> None / "")
+        fast: Expression template for well-formed values; generated decoders
+            try it first and fall back to the parser when it raises
+        typecode: array typecode for columnar decode (None: list)
+        missing: Column value for missing numbers
+    """
+
+    __slots__ = ("parser", "fast", "typecode", "missing")
+
+    def __init__(
+        self,
+        parser: Callable[[Optional[str]], Any],
+        fast: str,
+        typecode: Optional[str] = None,
+        missing: Any = None,
+    ):
+        self.parser = parser
+        self.fast = fast
+        self.typecode = typecode
+        self.missing = missing
+
+
+KINDS: Dict[str, Kind] = {
+    "code": Kind(parse_code, "{v}.strip().lstrip('A')"),
+    "str": Kind(parse_str, "{v}.strip()"),
+    "int": Kind(parse_int, "int({v})", "q", 0),
+    "price": Kind(parse_price, "abs(int({v}))", "q", 0),
+    "rate": Kind(parse_rate, "round(int({v}) / 1000, 2)", "d", 0.0),
+    "decimal": Kind(parse_decimal, "float({v})", "d", 0.0),
+}
+
+# Raised by fast expressions on missing keys or malformed values
+_FALLBACK_ERRORS = (KeyError, TypeError, ValueError, AttributeError)
+
+
+class FID:
+    """One field: FID key, attribute name and value kind"""
+
+    __slots__ = ("key", "name", "kind", "description")
+
+    def __init__(self, key: str, name: str, kind: str, description: str = ""):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown FID kind: {kind}")
+        self.key = key
+        self.name = name
+        self.kind = kind
+        self.description = description
+
+
+# FID dictionary (fields used by this application)
+FIDS: Dict[str, FID] = {
+    fid.key: fid
+    for fid in (
+        FID("9001", "stock_code", "code", "종목코드"),
+        FID("302", "stock_name", "str", "종목명"),
+        FID("10", "current_price", "price", "현재가"),
+        FID("25", "change_sign", "str", "전일대비구분"),
+        FID("11", "change", "int", "전일대비"),
+        FID("12", "change_rate", "rate", "등락율"),
+        FID("13", "volume", "int", "누적거래량"),
+        FID("15", "trade_volume", "price", "거래량 (체결)"),
+        FID("16", "open_price", "price", "시가"),
+        FID("17", "high_price", "price", "고가"),
+        FID("18", "low_price", "price", "저가"),
+        FID("20", "trade_time", "str", "체결시간"),
+        FID("27", "ask_price", "price", "최우선매도호가"),
+        FID("28", "bid_price", "price", "최우선매수호가"),
+        FID("41", "ask_price_1", "price", "매도호가1"),
+        FID("51", "bid_price_1", "price", "매수호가1"),
+        FID("841", "condition_seq", "str", "조건식 일련번호"),
+        FID("843", "event", "str", "편입/이탈 (I/D)"),
+    )
+}
+
+
+class Schema:
+    """
+    Record type and decoders generated from a FID list
+
+    Args:
+        name: Record class name
+        keys: FID keys, in record order
+        kinds: Per-key kind overrides for payloads that encode a FID
+            differently (e.g. {"12": "decimal"} for realtime pushes)
+
+    Attributes:
+        record: `__slots__` class with one attribute per FID
+        decode_row: row dict -> record
+        decode_page: list of row dicts -> {name: column}
+    """
+
+    def __init__(self, name: str, keys: Sequence[str], kinds: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.fields: List[FID] = [FIDS[key] for key in keys]
+        if kinds:
+            self.fields = [
+                FID(fid.key, fid.name, kinds[fid.key], fid.description) if fid.key in kinds else fid
+                for fid in self.fields
+            ]
+        self.names = tuple(fid.name for fid in self.fields)
+        self.record = self._build_record()
+        self.decode_row: Callable[[Dict[str, str]], Any] = self._build_row_decoder()
+        self.decode_page: Callable[[Iterable[Dict[str, str]]], Dict[str, Any]] = (
+            self._build_page_decoder()
+        )
+
+    def _build_record(self) -> type:
+        names = self.names
+
+        # def __init__(self, stock_code, ...): self.stock_code = stock_code; ...
+        args = ", ".join(names)
+        body = "".join(f"    self.{attr} = {attr}\n" for attr in names) or "    pass\n"
+        scope: Dict[str, Any] = {}
+        exec(f"def __init__(self, {args}):\n{body}", scope)
+
+        def to_dict(self) -> Dict[str, Any]:
+            """Plain dictionary"""
+            return {attr: getattr(self, attr) for attr in names}
+
+        def __repr__(self) -> str:
+            fields = ", ".join(f"{attr}={getattr(self, attr)!r}" for attr in names)
+            return f"{type(self).__name__}({fields})"
+
+        namespace = {
+            "__slots__": names,
+            "__init__": scope["__init__"],
+            "to_dict": to_dict,
+            "__repr__": __repr__,
+        }
+        return type(self.name, (), namespace)
+
+    def _scope(self) -> Dict[str, Any]:
+        scope: Dict[str, Any] = {f"_{name}": kind.parser for name, kind in KINDS.items()}
+        scope.update(_Record=self.record, _array=array, _Errors=_FALLBACK_ERRORS)
+        return scope
+
+    def _compile(self, source: str, name: str) -> Callable:
+        scope = self._scope()
+        exec(source, scope)
+        return scope[name]
+
+    def _build_row_decoder(self) -> Callable[[Dict[str, str]], Any]:
+        # def decode_row(row):
+        #     try:
+        #         return _Record(row['9001'].strip().lstrip('A'), abs(int(row['10'])), ...)
+        #     except _Errors:
+        #         g = row.get
+        #         return _Record(_code(g('9001')), _price(g('10')), ...)
+        fast = ", ".join(
+            KINDS[fid.kind].fast.format(v=f"row[{fid.key!r}]") for fid in self.fields
+        )
+        safe = ", ".join(f"_{fid.kind}(g({fid.key!r}))" for fid in self.fields)
+        source = (
+            "def decode_row(row):\n"
+            "    try:\n"
+            f"        return _Record({fast})\n"
+            "    except _Errors:\n"
+            "        g = row.get\n"
+            f"        return _Record({safe})\n"
+        )
+        decode_row = self._compile(source, "decode_row")
+        decode_row.__doc__ = f"Decode one row into {self.name}"
+        return decode_row
+
+    def _build_page_decoder(self) -> Callable[[Iterable[Dict[str, str]]], Dict[str, Any]]:
+        # One column per FID, decoded with the fast expression unless some row
+        # is missing or malformed; numeric columns are arrays (missing -> 0)
+        lines = ["def decode_page(rows):", "    rows = list(rows)"]
+        for index, fid in enumerate(self.fields):
+            kind = KINDS[fid.kind]
+            fast = kind.fast.format(v=f"r[{fid.key!r}]")
+            safe = f"_{fid.kind}(r.get({fid.key!r}))"
+            if kind.typecode is not None:
+                safe = f"{safe} or {kind.missing!r}"
+            lines += [
+                "    try:",
+                f"        c{index} = [{fast} for r in rows]",
+                "    except _Errors:",
+                f"        c{index} = [{safe} for r in rows]",
+            ]
+            if kind.typecode is not None:
+                lines.append(f"    c{index} = _array({kind.typecode!r}, c{index})")
+        items = ", ".join(f"{fid.name!r}: c{index}" for index, fid in enumerate(self.fields))
+        lines.append(f"    return {{{items}}}")
+        decode_page = self._compile("\n".join(lines) + "\n", "decode_page")
+        decode_page.__doc__ = f"Decode rows into {self.name} columns"
+        return decode_page
+
+
+# CNSRREQ result row
+CONDITION_ROW = Schema(
+    "ConditionRow",
+    ("9001", "302", "10", "25", "11", "12", "13", "16", "17", "18"),
+)
+ConditionRow = CONDITION_ROW.record
+decode_condition_row = CONDITION_ROW.decode_row
+decode_condition_page = CONDITION_ROW.decode_page
+
+# REAL 02 condition push (the stock code may only be in the item's "item")
+CONDITION_PUSH = Schema("ConditionPush", ("841", "9001", "843"))
+decode_condition_push = CONDITION_PUSH.decode_row
+
+# REAL 0B trade push (rate as a decimal string)
+TRADE_PUSH = Schema(
+    "TradePush",
+    ("20", "10", "11", "12", "13", "15", "27", "28"),
+    kinds={"12": "decimal"},
+)
+decode_trade_push = TRADE_PUSH.decode_row
+
+# REAL 0D order book push (best quotes only)
+ORDERBOOK_PUSH = Schema("OrderbookPush", ("41", "51"))
+decode_orderbook_push = ORDERBOOK_PUSH.decode_row
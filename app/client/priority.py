@@ -0,0 +1,242 @@
+"""
+Priority-aware request scheduling in front of the rate limiter
+"""
+
+import asyncio
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, Deque, Tuple
+
+from app.core.constants import (
+    LANE_INTERACTIVE,
+    PRIORITY_LANE_WEIGHTS,
+    PRIORITY_MAX_WAIT,
+)
+from app.core.metrics import metrics
+from .rate_limiter import RateLimiter, get_rate_limiter
+
+_current_lane: ContextVar[str] = ContextVar("kiwoom_request_lane", default=LANE_INTERACTIVE)
+
+
+def get_current_lane() -> str:
+    """Lane of the current task (defaults to interactive)"""
+    return _current_lane.get()
+
+
+@contextmanager
+def request_priority(lane: str):
+    """
+    Run API calls inside the block in the given lane
+
+    Example:
+        with request_priority("monitoring"):
+            await service.execute_condition_search(...)
+    """
+    if lane not in PRIORITY_LANE_WEIGHTS:
+        raise ValueError(f"Unknown request lane: {lane}")
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+class _LaneStats:
+    """Per-lane queue metrics"""
+
+    __slots__ = ("enqueued", "served", "cancelled", "promoted", "total_wait", "max_wait")
+
+    def __init__(self):
+        self.enqueued = 0
+        self.served = 0
+        self.cancelled = 0
+        self.promoted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class PriorityRequestScheduler:
+    """
+    Weighted fair queue in front of a RateLimiter
+
+    Each lane gets rate budget in proportion to its weight (stride scheduling)
+    while it has waiters; idle lanes do not bank credit. A lane that has had a
+    waiter for `max_wait` seconds without being served goes next regardless of
+    weights, so low priority lanes cannot starve.
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        weights: Optional[Dict[str, int]] = None,
+        max_wait: float = PRIORITY_MAX_WAIT,
+    ):
+        self.limiter = limiter
+        self.weights = dict(weights or PRIORITY_LANE_WEIGHTS)
+        self.max_wait = max_wait
+
+        self._queues: Dict[str, Deque[Tuple[asyncio.Future, float]]] = {
+            lane: deque() for lane in self.weights
+        }
+        self._pass: Dict[str, float] = {lane: 0.0 for lane in self.weights}
+        self._virtual_time = 0.0
+        self._last_served: Dict[str, float] = {lane: 0.0 for lane in self.weights}
+        self._limiter_busy = False
+        self._stats: Dict[str, _LaneStats] = {lane: _LaneStats() for lane in self.weights}
+
+    async def acquire(self, lane: Optional[str] = None) -> Tuple[float, float]:
+        """
+        Wait for a turn in the lane and take one rate limit token
+
+        Only the request holding the turn waits on the limiter, so the two
+        waits can be told apart: queue wait is time spent behind other
+        requests, limiter wait is time spent waiting for rate budget.
+
+        Args:
+            lane: Request lane (default: lane of the current context)
+
+        Returns:
+            (queue wait seconds, limiter wait seconds)
+        """
+        lane = lane or get_current_lane()
+        if lane not in self._queues:
+            raise ValueError(f"Unknown request lane: {lane}")
+        stats = self._stats[lane]
+        stats.enqueued += 1
+
+        # Fast path: nobody is waiting and budget is available
+        if not self._limiter_busy and not self._has_waiters() and self.limiter.try_acquire() == 0:
+            stats.served += 1
+            return 0.0, 0.0
+
+        queue = self._queues[lane]
+        if not queue:
+            # Lane becomes active: start at current virtual time (no banked credit)
+            self._pass[lane] = max(self._pass[lane], self._virtual_time)
+
+        enqueued_at = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        queue.append((future, enqueued_at))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            if future.done() and not future.cancelled():
+                # Turn was granted but the caller went away: pass it on
+                self._release()
+            raise
+
+        queue_wait = time.monotonic() - enqueued_at
+        try:
+            limiter_wait = await self.limiter.acquire()
+        finally:
+            self._release()
+
+        stats.served += 1
+        stats.total_wait += queue_wait + limiter_wait
+        stats.max_wait = max(stats.max_wait, queue_wait + limiter_wait)
+        return queue_wait, limiter_wait
+
+    def _has_waiters(self) -> bool:
+        return any(self._queues.values())
+
+    def _purge_cancelled(self, queue: Deque[Tuple[asyncio.Future, float]]) -> None:
+        while queue and queue[0][0].done():
+            queue.popleft()
+
+    def _next_lane(self, now: float) -> Optional[str]:
+        """Pick lane to serve next"""
+        starving_lane = None
+        oldest = now - self.max_wait
+        best_lane = None
+        best_pass = None
+
+        for lane, queue in self._queues.items():
+            self._purge_cancelled(queue)
+            if not queue:
+                continue
+            # A lane starves if it has waited max_wait without being served
+            waiting_since = max(queue[0][1], self._last_served[lane])
+            if waiting_since <= oldest:
+                oldest = waiting_since
+                starving_lane = lane
+            if best_pass is None or self._pass[lane] < best_pass:
+                best_lane, best_pass = lane, self._pass[lane]
+
+        if starving_lane is not None and starving_lane != best_lane:
+            self._stats[starving_lane].promoted += 1
+            return starving_lane
+        return best_lane
+
+    def _dispatch(self) -> None:
+        """Hand the limiter turn to the next waiter"""
+        if self._limiter_busy:
+            return
+
+        lane = self._next_lane(time.monotonic())
+        if lane is None:
+            return
+
+        future, _ = self._queues[lane].popleft()
+        future.set_result(None)
+        self._limiter_busy = True
+        self._last_served[lane] = time.monotonic()
+        self._virtual_time = self._pass[lane]
+        self._pass[lane] += 1.0 / self.weights[lane]
+
+    def _release(self) -> None:
+        """Finish the current turn"""
+        self._limiter_busy = False
+        self._dispatch()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get per-lane queue metrics
+
+        Returns:
+            Dictionary keyed by lane with depth and wait statistics
+        """
+        lanes = {}
+        for lane, stats in self._stats.items():
+            queue = self._queues[lane]
+            lanes[lane] = {
+                "weight": self.weights[lane],
+                "depth": sum(1 for f, _ in queue if not f.done()),
+                "enqueued": stats.enqueued,
+                "served": stats.served,
+                "cancelled": stats.cancelled,
+                "promoted": stats.promoted,
+                "avg_wait_seconds": round(stats.total_wait / stats.served, 4) if stats.served else 0.0,
+                "max_wait_seconds": round(stats.max_wait, 4),
+            }
+        return {"limiter": self.limiter.name, "lanes": lanes}
+
+
+# One scheduler per rate limiter
+_schedulers: "weakref.WeakKeyDictionary[RateLimiter, PriorityRequestScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_request_scheduler(limiter: Optional[RateLimiter] = None) -> PriorityRequestScheduler:
+    """
+    Get the priority scheduler guarding a rate limiter
+
+    Args:
+        limiter: Rate limiter (default: process-wide limiter)
+
+    Returns:
+        Scheduler shared by every client using that limiter
+    """
+    limiter = limiter or get_rate_limiter()
+    scheduler = _schedulers.get(limiter)
+    if scheduler is None:
+        scheduler = PriorityRequestScheduler(limiter)
+        _schedulers[limiter] = scheduler
+        metrics.register_collector(f"request_queue_{limiter.name}", scheduler.get_stats)
+    return scheduler
@@ -0,0 +1,150 @@
+"""
+Last-value cache for realtime quotes
+
+Realtime pushes (REAL 0B trade, 0D order book) overwrite one compact record
+per stock, so any part of the app can read the current quote in O(1)
+without an API call.
+"""
+
+import time
+from typing import Optional, Dict, Any, Iterator
+
+from app.core.metrics import metrics
+from .fid import parse_code, decode_trade_push, decode_orderbook_push
+
+# REAL push types
+REAL_TYPE_TRADE = "0B"  # 주식체결
+REAL_TYPE_ORDERBOOK = "0D"  # 주식호가잔량
+
+
+class Quote:
+    """Latest quote of one stock"""
+
+    __slots__ = (
+        "stock_code",
+        "price",
+        "change",
+        "change_rate",
+        "volume",
+        "trade_volume",
+        "ask",
+        "bid",
+        "trade_time",
+        "updated_at",
+    )
+
+    def __init__(self, stock_code: str):
+        self.stock_code = stock_code
+        self.price: Optional[int] = None
+        self.change: Optional[int] = None
+        self.change_rate: Optional[float] = None
+        self.volume: Optional[int] = None
+        self.trade_volume: Optional[int] = None
+        self.ask: Optional[int] = None
+        self.bid: Optional[int] = None
+        self.trade_time: Optional[str] = None
+        self.updated_at = 0.0
+
+    def age(self) -> float:
+        """Seconds since the last update"""
+        return time.monotonic() - self.updated_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary (API responses)"""
+        data = {name: getattr(self, name) for name in self.__slots__ if name != "updated_at"}
+        data["age_seconds"] = round(self.age(), 3)
+        return data
+
+
+class QuoteCache:
+    """Stock code -> latest Quote"""
+
+    def __init__(self):
+        self._quotes: Dict[str, Quote] = {}
+        self._updates = 0
+
+    def get(self, stock_code: str) -> Optional[Quote]:
+        """Latest quote (None if never received)"""
+        return self._quotes.get(stock_code)
+
+    def __contains__(self, stock_code: str) -> bool:
+        return stock_code in self._quotes
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    def __iter__(self) -> Iterator[Quote]:
+        return iter(list(self._quotes.values()))
+
+    def _quote(self, stock_code: str) -> Quote:
+        quote = self._quotes.get(stock_code)
+        if quote is None:
+            quote = self._quotes[stock_code] = Quote(stock_code)
+        return quote
+
+    def apply(self, item: Dict[str, Any]) -> Optional[Quote]:
+        """
+        Apply one REAL data item
+
+        Args:
+            item: {'type': '0B', 'item': '005930', 'values': {...}}
+
+        Returns:
+            Updated quote (None for unsupported types)
+        """
+        real_type = item.get("type")
+        if real_type not in (REAL_TYPE_TRADE, REAL_TYPE_ORDERBOOK):
+            return None
+        code = parse_code(item.get("item"))
+        if not code:
+            return None
+        values = item.get("values") or {}
+        quote = self._quote(code)
+
+        if real_type == REAL_TYPE_TRADE:
+            trade = decode_trade_push(values)
+            quote.price = trade.current_price
+            quote.change = trade.change
+            quote.change_rate = trade.change_rate
+            quote.volume = trade.volume
+            quote.trade_volume = trade.trade_volume
+            quote.trade_time = trade.trade_time or None
+            ask = trade.ask_price
+            bid = trade.bid_price
+        else:
+            orderbook = decode_orderbook_push(values)
+            ask = orderbook.ask_price_1
+            bid = orderbook.bid_price_1
+
+        if ask is not None:
+            quote.ask = ask
+        if bid is not None:
+            quote.bid = bid
+        quote.updated_at = time.monotonic()
+        self._updates += 1
+        return quote
+
+    def discard(self, stock_code: str) -> None:
+        """Drop a stock (after unsubscribing)"""
+        self._quotes.pop(stock_code, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with size and update count
+        """
+        return {"stocks": len(self._quotes), "updates": self._updates}
+
+
+_cache_instance: Optional[QuoteCache] = None
+
+
+def get_quote_cache() -> QuoteCache:
+    """Process-wide quote cache singleton"""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = QuoteCache()
+        metrics.register_collector("quote_cache", _cache_instance.get_stats)
+    return _cache_instance
@@ -0,0 +1,175 @@
+"""
+Token-bucket rate limiter shared by all Kiwoom API clients
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional, Dict, Any
+
+from app.core.logging import logger
+from app.core.constants import RATE_LIMIT_PER_SECOND, RATE_LIMIT_PER_MINUTE
+from app.core.metrics import metrics
+
+
+class TokenBucket:
+    """Token bucket that refills continuously and allows bursts up to capacity"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """Add tokens accrued since the last update"""
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+            self._updated_at = now
+
+    def available(self, now: float) -> float:
+        """Tokens currently available"""
+        self._refill(now)
+        return self._tokens
+
+    def wait_time(self, tokens: float, now: float) -> float:
+        """Seconds until `tokens` become available (0 if available now)"""
+        self._refill(now)
+        deficit = tokens - self._tokens
+        if deficit <= 0:
+            return 0.0
+        return deficit / self.refill_per_second
+
+    def consume(self, tokens: float) -> None:
+        """Remove tokens (caller must have checked availability)"""
+        self._tokens -= tokens
+
+
+class RateLimiter:
+    """
+    Dual-window rate limiter (per-second and per-minute token buckets)
+
+    A request is admitted only when both buckets hold enough tokens, so short
+    bursts up to the per-second capacity are allowed while the per-minute quota
+    is still respected.
+    """
+
+    def __init__(
+        self,
+        per_second: int = RATE_LIMIT_PER_SECOND,
+        per_minute: int = RATE_LIMIT_PER_MINUTE,
+        name: str = "default",
+    ):
+        self.name = name
+        self.per_second = per_second
+        self.per_minute = per_minute
+        self._second_bucket = TokenBucket(per_second, per_second)
+        self._minute_bucket = TokenBucket(per_minute, per_minute / 60.0)
+        self._lock = threading.Lock()
+        self._acquired_count = 0
+        self._throttled_count = 0
+        self._total_wait = 0.0
+
+    def try_acquire(self, tokens: int = 1) -> float:
+        """
+        Take tokens if both windows allow it
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds to wait before retrying
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                self._second_bucket.wait_time(tokens, now),
+                self._minute_bucket.wait_time(tokens, now),
+            )
+            if wait > 0:
+                return wait
+
+            self._second_bucket.consume(tokens)
+            self._minute_bucket.consume(tokens)
+            self._acquired_count += tokens
+            return 0.0
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """
+        Wait until tokens are available and take them
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                break
+            if waited == 0.0:
+                self._throttled_count += 1
+            logger.debug(f"Rate limiting ({self.name}): waiting {wait:.3f}s")
+            await asyncio.sleep(wait)
+            waited += wait
+
+        self._total_wait += waited
+        return waited
+
+    def remaining(self) -> Dict[str, float]:
+        """
+        Get budget left in each window
+
+        Returns:
+            Dictionary with tokens available per window
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "per_second": self._second_bucket.available(now),
+                "per_minute": self._minute_bucket.available(now),
+            }
+
+    def time_until_available(self, tokens: int = 1) -> float:
+        """Seconds until `tokens` could be acquired without waiting"""
+        with self._lock:
+            now = time.monotonic()
+            return max(
+                self._second_bucket.wait_time(tokens, now),
+                self._minute_bucket.wait_time(tokens, now),
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter statistics
+
+        Returns:
+            Dictionary with limits, remaining budget and counters
+        """
+        remaining = self.remaining()
+        return {
+            "name": self.name,
+            "limit_per_second": self.per_second,
+            "limit_per_minute": self.per_minute,
+            "remaining_per_second": round(remaining["per_second"], 2),
+            "remaining_per_minute": round(remaining["per_minute"], 2),
+            "acquired": self._acquired_count,
+            "throttled": self._throttled_count,
+            "total_wait_seconds": round(self._total_wait, 3),
+        }
+
+
+# Process-wide limiter shared by every client instance
+_rate_limiter_instance: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide rate limiter singleton"""
+    global _rate_limiter_instance
+    if _rate_limiter_instance is None:
+        _rate_limiter_instance = RateLimiter()
+        metrics.register_collector("rate_limiter", _rate_limiter_instance.get_stats)
+    return _rate_limiter_instance
@@ -2,7 +2,8 @@
 Kiwoom REST API Client
 """
 
-from typing import Optional, Dict, Any
+import asyncio
+from typing import Optional, Dict, Any, Iterable, Tuple
 from datetime import datetime, timedelta
 
 from app.core.config import get_settings
@@ -12,9 +13,14 @@ from app.core.constants import (
     TR_ID_CONDITION_LIST,
     TR_ID_CONDITION_SEARCH,
     TR_ID_STOCK_PRICE,
+    RATE_LIMIT_PER_SECOND,
 )
 from app.shared.exceptions import AuthenticationException
 from .base import BaseAPIClient
+from .credentials import Credential, CredentialPool, get_credential_pool
+from .rate_limiter import RateLimiter
+from .token_provider import get_token_provider
+from .retry import RetryPolicy
 
 settings = get_settings()
 
@@ -22,14 +28,38 @@ settings = get_settings()
 class KiwoomRestClient(BaseAPIClient):
     """Kiwoom REST API Client"""
     
-    def __init__(self):
-        super().__init__(base_url=settings.KIWOOM_BASE_URL)
-        self.app_key = settings.KIWOOM_APP_KEY
-        self.app_secret = settings.KIWOOM_APP_SECRET
+    retry_policies = {
+        "/oauth2/token": RetryPolicy(max_attempts=2),
+        # Condition searches are heavy; fail sooner instead of piling up
+        TR_ID_CONDITION_SEARCH: RetryPolicy(max_attempts=2, max_delay=2.0),
+    }
+    
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        credentials: Optional[CredentialPool] = None,
+    ):
+        super().__init__(base_url=settings.KIWOOM_BASE_URL, rate_limiter=rate_limiter)
+        if credentials is None and rate_limiter is not None:
+            # Explicit limiter: single key paced by that limiter
+            credentials = CredentialPool([
+                Credential(
+                    settings.KIWOOM_APP_KEY,
+                    settings.KIWOOM_APP_SECRET,
+                    tokens=token_manager,
+                    rate_limiter=rate_limiter,
+                )
+            ])
+        self._credentials = credentials or get_credential_pool()
+        self.app_key = self._credentials.primary.app_key
+        self.app_secret = self._credentials.primary.app_secret
     
     def _get_auth_headers(self, tr_id: str) -> Dict[str, str]:
         """
-        Get authentication headers
+        Get request headers
+        
+        Authorization and app key headers are added per attempt by the
+        credential pool (see _route_request).
         
         Args:
             tr_id: Transaction ID
@@ -37,37 +67,75 @@ class KiwoomRestClient(BaseAPIClient):
         Returns:
             Headers dictionary
         """
-        access_token = token_manager.get_token()
-        if not access_token:
-            raise AuthenticationException("No valid access token")
-        
         return {
-            "authorization": f"Bearer {access_token}",
-            "appkey": self.app_key,
-            "appsecret": self.app_secret,
             "tr_id": tr_id,
             "custtype": "P",  # 개인
         }
     
-    async def get_access_token(self) -> str:
+    async def _route_request(
+        self,
+        endpoint: str,
+        headers: Optional[Dict[str, str]],
+        exclude: Tuple[Any, ...],
+    ) -> Tuple[Optional[Dict[str, str]], RateLimiter, Optional[Credential]]:
+        """Send TR requests through the least loaded healthy app key"""
+        if not headers or "tr_id" not in headers:
+            return await super()._route_request(endpoint, headers, exclude)
+        
+        credential = self._credentials.select(exclude)
+        # Count the request before awaiting so concurrent callers spread out
+        credential.begin()
+        try:
+            access_token = await get_token_provider(credential).get_token()
+        except BaseException:
+            credential.finish()
+            raise
+        return {**headers, **credential.auth_headers(access_token)}, credential.rate_limiter, credential
+    
+    def _route_finished(
+        self,
+        route: Optional[Credential],
+        status_code: Optional[int],
+        retry_after: Optional[float],
+    ) -> bool:
+        """Update key health; fail over on 429 while another key is healthy"""
+        if route is None:
+            return False
+        route.finish(status_code, retry_after)
+        return status_code == 429 and self._credentials.has_available(exclude=(route,))
+    
+    def get_credential_stats(self) -> Dict[str, Any]:
+        """
+        Get app key pool statistics
+        
+        Returns:
+            Per-key load, health and rate limit budget
+        """
+        return self._credentials.get_stats()
+    
+    async def get_access_token(self, credential: Optional[Credential] = None) -> str:
         """
         Get OAuth access token
 
+        Args:
+            credential: App key to issue the token for (default: primary key)
+
         Returns:
             Access token
 
         Raises:
             AuthenticationException: On authentication failure
         """
-        logger.info("Requesting access token...")
+        credential = credential or self._credentials.primary
+        logger.info(f"Requesting access token ({credential.name})...")
 
         try:
             response = await self.post(
                 "/oauth2/token",
                 json={
                     "grant_type": "client_credentials",
-                    "appkey": self.app_key,
-                    "secretkey": self.app_secret,  # Fixed: Changed from 'appsecret' to 'secretkey'
+                    "appkey": credential.app_key,
+                    "secretkey": credential.app_secret,  # Fixed: Changed from 'appsecret' to 'secretkey'
                 }
             )
 
@@ -102,7 +170,7 @@ class KiwoomRestClient(BaseAPIClient):
                 expires_in = 86400  # Default 24 hours
             
             # Store token
-            token_manager.set_token(access_token, expires_in)
+            credential.tokens.set_token(access_token, expires_in)
             
             logger.info(
                 f"Access token acquired: "
@@ -118,9 +186,8 @@ class KiwoomRestClient(BaseAPIClient):
             raise AuthenticationException(f"Token acquisition failed: {e}")
     
     async def ensure_authenticated(self):
-        """Ensure valid access token exists"""
-        if not token_manager.is_token_valid():
-            await self.get_access_token()
+        """Ensure the primary key has a valid access token"""
+        await get_token_provider(self._credentials.primary).get_token()
     
     async def get_condition_list(self) -> Dict[str, Any]:
         """
@@ -209,3 +276,59 @@ class KiwoomRestClient(BaseAPIClient):
         )
 
         return response
+    
+    async def get_stock_prices(
+        self,
+        stock_codes: Iterable[str],
+        market_code: str = "J",
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get current prices for many stocks concurrently
+        
+        Requests fan out up to `max_concurrency` at a time; the shared rate
+        limiter still paces them, so the whole batch completes as fast as the
+        rate budget allows. Duplicate codes are requested once.
+        
+        Args:
+            stock_codes: 6-digit stock codes
+            market_code: Market code (J: KOSPI, Q: KOSDAQ)
+            max_concurrency: Maximum in-flight requests (default: per-second limit
+                of all app keys combined)
+        
+        Returns:
+            {'prices': {code: price data}, 'errors': {code: error message}}
+        """
+        codes = list(dict.fromkeys(stock_codes))
+        prices: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+        
+        if not codes:
+            return {"prices": prices, "errors": errors}
+        
+        # Authenticate once instead of racing per ticker
+        await self.ensure_authenticated()
+        
+        logger.info(f"Fetching stock prices for {len(codes)} codes...")
+        
+        semaphore = asyncio.Semaphore(
+            max_concurrency or RATE_LIMIT_PER_SECOND * len(self._credentials)
+        )
+        
+        async def fetch(code: str):
+            async with semaphore:
+                try:
+                    prices[code] = await self.get_stock_price(code, market_code)
+                except Exception as e:
+                    logger.warning(f"Failed to fetch stock price for {code}: {e}")
+                    errors[code] = str(e)
+        
+        await asyncio.gather(*(fetch(code) for code in codes))
+        
+        logger.info(f"Fetched {len(prices)}/{len(codes)} stock prices ({len(errors)} failed)")
+        
+        # Keep request order regardless of completion order
+        return {
+            "prices": {code: prices[code] for code in codes if code in prices},
+            "errors": {code: errors[code] for code in codes if code in errors},
+        }
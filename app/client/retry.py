@@ -0,0 +1,192 @@
+"""
+Retry policy, backoff and retry budget for Kiwoom API clients
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Iterable
+
+from app.core.constants import (
+    RETRY_MAX_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    RETRY_MAX_RETRY_AFTER,
+    RETRY_BUDGET_RATIO,
+    RETRY_BUDGET_MIN_PER_SECOND,
+)
+from app.core.metrics import metrics
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """Per-endpoint retry policy (exponential backoff with full jitter)"""
+
+    def __init__(
+        self,
+        max_attempts: int = RETRY_MAX_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+        max_retry_after: float = RETRY_MAX_RETRY_AFTER,
+        retry_on_status: Iterable[int] = RETRYABLE_STATUS_CODES,
+        retry_on_network_errors: bool = True,
+    ):
+        """
+        Args:
+            max_attempts: Total attempts including the first one
+            base_delay: Backoff base in seconds
+            max_delay: Upper bound of a single backoff
+            max_retry_after: Longest server-requested Retry-After we will wait
+            retry_on_status: HTTP status codes that may be retried
+            retry_on_network_errors: Retry transport errors (timeouts, resets)
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_on_status = frozenset(retry_on_status)
+        self.retry_on_network_errors = retry_on_network_errors
+
+    def should_retry_status(self, status_code: int) -> bool:
+        """Check whether a response status is retryable"""
+        return status_code in self.retry_on_status
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Delay before the next attempt
+
+        Args:
+            attempt: Number of the attempt that just failed (1-based)
+            retry_after: Server-provided Retry-After in seconds
+
+        Returns:
+            Seconds to sleep, or None if Retry-After exceeds what we accept
+        """
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            return retry_after
+
+        # Full jitter: uniform(0, min(cap, base * 2^n))
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+# Never retry (e.g. non-idempotent order endpoints)
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header
+
+    Args:
+        value: Header value (delta-seconds or HTTP-date)
+
+    Returns:
+        Seconds to wait, or None if absent/invalid
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of request traffic
+
+    Every original request deposits `ratio` tokens and every retry withdraws
+    one, with a small time-based floor so low-traffic periods can still retry.
+    During a broker brownout retries therefore stay bounded at roughly
+    `ratio` of normal traffic instead of multiplying it.
+    """
+
+    def __init__(
+        self,
+        ratio: float = RETRY_BUDGET_RATIO,
+        min_per_second: float = RETRY_BUDGET_MIN_PER_SECOND,
+        max_balance: float = 10.0,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max_balance
+        self._balance = max_balance
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._retries = 0
+        self._rejected = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._balance = min(
+            self.max_balance,
+            self._balance + (now - self._updated_at) * self.min_per_second,
+        )
+        self._updated_at = now
+
+    def record_request(self) -> None:
+        """Deposit budget for an original (non-retry) request"""
+        with self._lock:
+            self._refill()
+            self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Withdraw budget for a retry
+
+        Returns:
+            True if the retry is allowed
+        """
+        with self._lock:
+            self._refill()
+            if self._balance >= 1.0:
+                self._balance -= 1.0
+                self._retries += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get retry budget statistics
+
+        Returns:
+            Dictionary with balance and retry counters
+        """
+        with self._lock:
+            self._refill()
+            return {
+                "balance": round(self._balance, 2),
+                "ratio": self.ratio,
+                "retries": self._retries,
+                "rejected": self._rejected,
+            }
+
+
+# Process-wide retry budget shared by every client instance
+_retry_budget_instance: Optional[RetryBudget] = None
+
+
+def get_retry_budget() -> RetryBudget:
+    """Process-wide retry budget singleton"""
+    global _retry_budget_instance
+    if _retry_budget_instance is None:
+        _retry_budget_instance = RetryBudget()
+        metrics.register_collector("retry_budget", _retry_budget_instance.get_stats)
+    return _retry_budget_instance
@@ -0,0 +1,81 @@
+"""
+Single-flight coalescing of identical in-flight requests
+"""
+
+import asyncio
+from typing import Optional, Dict, Any, Callable, Awaitable, Hashable
+
+from app.core.metrics import metrics
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution
+
+    The first caller (leader) starts the call; callers arriving while it is
+    in flight await the same result. The shared call runs as its own task, so
+    a cancelled caller does not cancel the call for the others.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._calls = 0
+        self._shared = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `func` once for all concurrent callers with the same key
+
+        Args:
+            key: Request identity
+            func: Coroutine function performing the call
+
+        Returns:
+            Result of the (possibly shared) call
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self._shared += 1
+            return await asyncio.shield(future)
+
+        self._calls += 1
+        future = asyncio.ensure_future(func())
+        self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        """Remove completed call"""
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            # Mark exception as retrieved even if every caller went away
+            future.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics
+
+        Returns:
+            Dictionary with executed calls, shared hits and in-flight count
+        """
+        total = self._calls + self._shared
+        return {
+            "calls": self._calls,
+            "shared_hits": self._shared,
+            "in_flight": len(self._in_flight),
+            "hit_ratio": round(self._shared / total, 4) if total else 0.0,
+        }
+
+
+# Process-wide instance so coalescing works across client instances
+_singleflight_instance: Optional[SingleFlight] = None
+
+
+def get_singleflight() -> SingleFlight:
+    """Process-wide single-flight group"""
+    global _singleflight_instance
+    if _singleflight_instance is None:
+        _singleflight_instance = SingleFlight()
+        metrics.register_collector("singleflight", _singleflight_instance.get_stats)
+    return _singleflight_instance
@@ -0,0 +1,252 @@
+"""
+Proactive access token rotation with single-flight refresh
+"""
+
+import asyncio
+import time
+import weakref
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Callable, Awaitable
+
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.core.constants import TOKEN_REFRESH_RETRY_DELAY, TOKEN_REFRESH_LOCK_TIMEOUT
+from app.core.locks import InterProcessLock
+from app.core.metrics import metrics
+from app.shared.exceptions import AuthenticationException
+from .credentials import Credential, get_credential_pool
+
+settings = get_settings()
+
+TokenIssuer = Callable[[Credential], Awaitable[str]]
+
+_refresh_time = metrics.histogram("token_refresh_seconds", "Access token refresh latency", ("key",))
+_refreshes = metrics.counter("token_refresh_total", "Access token refreshes", ("key", "result"))
+
+
+class TokenProvider:
+    """
+    Serves one app key's access token and rotates it before expiry
+
+    The current token keeps being served until its replacement arrives;
+    refreshes start `refresh_margin` before expiry and concurrent refreshes
+    share one /oauth2/token request.
+    """
+
+    def __init__(
+        self,
+        credential: Credential,
+        issuer: Optional[TokenIssuer] = None,
+        refresh_margin: Optional[float] = None,
+        retry_delay: float = TOKEN_REFRESH_RETRY_DELAY,
+    ):
+        self.credential = credential
+        self._issuer = issuer
+        self.refresh_margin = (
+            refresh_margin if refresh_margin is not None else settings.KIWOOM_TOKEN_REFRESH_MARGIN
+        )
+        self.retry_delay = retry_delay
+
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._retry_at = 0.0
+        self._refreshes = 0
+        self._failures = 0
+        self._last_error: Optional[str] = None
+        self._last_refresh_seconds = 0.0
+
+    def _refresh_due(self, expires_at: datetime) -> bool:
+        return datetime.now() >= expires_at - timedelta(seconds=self.refresh_margin)
+
+    async def get_token(self) -> str:
+        """
+        Get a usable access token
+
+        Returns immediately while the current token is unexpired, starting a
+        background refresh once it is inside the refresh margin. Waits only
+        when there is no usable token at all.
+
+        Returns:
+            Access token
+
+        Raises:
+            AuthenticationException: If no token could be obtained
+        """
+        access_token, expires_at = self.credential.tokens.peek()
+        if access_token:
+            if self._refresh_due(expires_at) and time.monotonic() >= self._retry_at:
+                self._start_refresh()
+            return access_token
+        return await self.refresh()
+
+    async def refresh(self) -> str:
+        """
+        Fetch a new token, joining a refresh already in flight
+
+        Returns:
+            New access token
+        """
+        task = self._start_refresh()
+        # Shield: a cancelled caller must not cancel the shared refresh
+        return await asyncio.shield(task)
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._do_refresh())
+            self._refresh_task.add_done_callback(_consume_exception)
+        return self._refresh_task
+
+    async def _do_refresh(self) -> str:
+        started = time.perf_counter()
+        tokens = self.credential.tokens
+        generation = tokens.generation
+        try:
+            # One process fetches; the others wait and pick up its token
+            async with InterProcessLock(tokens.refresh_lock_file, timeout=TOKEN_REFRESH_LOCK_TIMEOUT):
+                tokens.sync(force=True)
+                access_token, expires_at = tokens.peek()
+                if access_token and tokens.generation != generation and not self._refresh_due(expires_at):
+                    self._retry_at = 0.0
+                    self._last_error = None
+                    _refreshes.inc(self.credential.name, "shared")
+                    logger.info(f"Token rotated by another process ({self.credential.name})")
+                    return access_token
+                access_token = await self._issue()
+        except Exception as e:
+            self._failures += 1
+            self._last_error = str(e)
+            # Keep serving the current token; try again after a pause
+            self._retry_at = time.monotonic() + self.retry_delay
+            _refreshes.inc(self.credential.name, "failure")
+            logger.error(f"Token refresh failed ({self.credential.name}): {e}")
+            raise
+        finally:
+            self._last_refresh_seconds = time.perf_counter() - started
+            _refresh_time.labels(self.credential.name).observe(self._last_refresh_seconds)
+
+        self._refreshes += 1
+        self._retry_at = 0.0
+        self._last_error = None
+        _refreshes.inc(self.credential.name, "success")
+        return access_token
+
+    async def _issue(self) -> str:
+        if self._issuer is None:
+            # Lazy import: the REST client depends on this module
+            from .rest_client import KiwoomRestClient
+
+            self._issuer = KiwoomRestClient().get_access_token
+        return await self._issuer(self.credential)
+
+    def seconds_until_refresh(self) -> Optional[float]:
+        """Seconds until a refresh is due (None without a token)"""
+        _, expires_at = self.credential.tokens.peek()
+        if expires_at is None:
+            return None
+        due = expires_at - timedelta(seconds=self.refresh_margin)
+        return max((due - datetime.now()).total_seconds(), 0.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get refresh statistics
+
+        Returns:
+            Dictionary with expiry, refresh counters and last error
+        """
+        _, expires_at = self.credential.tokens.peek()
+        return {
+            "has_token": expires_at is not None,
+            "expires_in_seconds": (
+                round((expires_at - datetime.now()).total_seconds()) if expires_at else 0
+            ),
+            "refreshing": self._refresh_task is not None and not self._refresh_task.done(),
+            "refreshes": self._refreshes,
+            "failures": self._failures,
+            "last_refresh_seconds": round(self._last_refresh_seconds, 4),
+            "last_error": self._last_error,
+        }
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    """Mark exception as retrieved for background refreshes nobody awaited"""
+    if not task.cancelled():
+        task.exception()
+
+
+# One provider per app key
+_providers: "weakref.WeakKeyDictionary[Credential, TokenProvider]" = weakref.WeakKeyDictionary()
+
+
+def get_token_provider(credential: Optional[Credential] = None) -> TokenProvider:
+    """
+    Get the token provider for an app key
+
+    Args:
+        credential: App key (default: primary key of the process-wide pool)
+
+    Returns:
+        Provider shared by every client using that key
+    """
+    credential = credential or get_credential_pool().primary
+    provider = _providers.get(credential)
+    if provider is None:
+        provider = TokenProvider(credential)
+        _providers[credential] = provider
+    return provider
+
+
+def _collect_stats() -> Dict[str, Any]:
+    return {c.name: p.get_stats() for c, p in list(_providers.items())}
+
+
+metrics.register_collector("token_providers", _collect_stats)
+
+
+async def run_token_refresher() -> None:
+    """
+    Refresh every pooled key's token ahead of expiry (background task)
+
+    Sleeps until the earliest refresh is due. Keys without a token are left
+    alone; they get one on first use.
+    """
+    providers = [get_token_provider(c) for c in get_credential_pool().credentials]
+    logger.info(f"Token refresher started ({len(providers)} keys)")
+
+    while True:
+        next_wake = settings.KIWOOM_TOKEN_REFRESH_MARGIN
+        for provider in providers:
+            due_in = provider.seconds_until_refresh()
+            if due_in is None:
+                continue
+            if due_in > 0:
+                next_wake = min(next_wake, due_in)
+                continue
+            try:
+                await provider.refresh()
+            except AuthenticationException:
+                next_wake = min(next_wake, provider.retry_delay)
+            except Exception as e:
+                logger.error(f"Token refresher error ({provider.credential.name}): {e}")
+                next_wake = min(next_wake, provider.retry_delay)
+        await asyncio.sleep(max(next_wake, 1.0))
+
+
+_refresher_task: Optional[asyncio.Task] = None
+
+
+def start_token_refresher() -> None:
+    """Start background token rotation (application startup)"""
+    global _refresher_task
+    if _refresher_task is None or _refresher_task.done():
+        _refresher_task = asyncio.ensure_future(run_token_refresher())
+
+
+async def stop_token_refresher() -> None:
+    """Stop background token rotation (application shutdown)"""
+    global _refresher_task
+    if _refresher_task is not None:
+        _refresher_task.cancel()
+        try:
+            await _refresher_task
+        except asyncio.CancelledError:
+            pass
+        _refresher_task = None
@@ -0,0 +1,169 @@
+"""
+Shared HTTP transport (connection pool) for Kiwoom API clients
+"""
+
+import asyncio
+from typing import Optional, Dict, Any
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.core.metrics import metrics
+
+settings = get_settings()
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package is installed"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HTTPTransport:
+    """
+    Long-lived pooled httpx client shared by every BaseAPIClient
+
+    Owned by the FastAPI lifespan / scheduler process; clients only borrow it.
+    Connection reuse is tracked through httpcore trace events so new TCP/TLS
+    handshakes on the hot path are visible in the stats.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.base_url = base_url or settings.KIWOOM_BASE_URL
+        self.max_connections = (
+            settings.KIWOOM_HTTP_MAX_CONNECTIONS if max_connections is None else max_connections
+        )
+        self.max_keepalive_connections = (
+            settings.KIWOOM_HTTP_MAX_KEEPALIVE_CONNECTIONS
+            if max_keepalive_connections is None else max_keepalive_connections
+        )
+        self.keepalive_expiry = (
+            settings.KIWOOM_HTTP_KEEPALIVE_EXPIRY if keepalive_expiry is None else keepalive_expiry
+        )
+        self.timeout = settings.KIWOOM_HTTP_TIMEOUT if timeout is None else timeout
+
+        http2 = settings.KIWOOM_HTTP2 if http2 is None else http2
+        if http2 and not _http2_available():
+            logger.warning("HTTP/2 requested but 'h2' is not installed, falling back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Connection reuse counters
+        self._requests = 0
+        self._connections_opened = 0
+        self._tls_handshakes = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Underlying httpx client (created on first use)"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # An AsyncClient is bound to the loop it was created on
+            self._client = self._create_client()
+            self._loop = loop
+        return self._client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create pooled httpx client"""
+        logger.info(
+            f"Creating HTTP transport: max_connections={self.max_connections}, "
+            f"keepalive={self.max_keepalive_connections}/{self.keepalive_expiry}s, "
+            f"http2={self.http2}"
+        )
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            http2=self.http2,
+            follow_redirects=True,
+        )
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """httpcore trace hook used to count handshakes"""
+        if event_name == "connection.connect_tcp.complete":
+            self._connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self._tls_handshakes += 1
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send request through the shared pool
+
+        Args:
+            method: HTTP method
+            url: Absolute URL or path relative to base_url
+            **kwargs: Passed through to httpx.AsyncClient.request
+
+        Returns:
+            httpx Response
+        """
+        self._requests += 1
+        extensions = kwargs.pop("extensions", None) or {}
+        extensions.setdefault("trace", self._trace)
+        return await self.client.request(method, url, extensions=extensions, **kwargs)
+
+    async def close(self) -> None:
+        """Close all pooled connections"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("HTTP transport closed")
+        self._client = None
+        self._loop = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get connection reuse statistics
+
+        Returns:
+            Dictionary with request and handshake counters
+        """
+        reused = max(self._requests - self._connections_opened, 0)
+        return {
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "requests": self._requests,
+            "connections_opened": self._connections_opened,
+            "tls_handshakes": self._tls_handshakes,
+            "reused_requests": reused,
+            "reuse_ratio": round(reused / self._requests, 4) if self._requests else 0.0,
+        }
+
+
+# Process-wide transport
+_transport_instance: Optional[HTTPTransport] = None
+
+
+def get_http_transport() -> HTTPTransport:
+    """Process-wide HTTP transport singleton"""
+    global _transport_instance
+    if _transport_instance is None:
+        _transport_instance = HTTPTransport()
+        metrics.register_collector("http_transport", _transport_instance.get_stats)
+    return _transport_instance
+
+
+async def close_http_transport() -> None:
+    """Close the process-wide HTTP transport (application shutdown)"""
+    global _transport_instance
+    if _transport_instance is not None:
+        await _transport_instance.close()
+        _transport_instance = None
@@ -3,8 +3,10 @@ Kiwoom WebSocket Client for Real-time Data
 """
 
 import asyncio
-import json
-from typing import Optional, Dict, Any, Callable
+import random
+import time
+from collections import defaultdict, deque
+from typing import Optional, Dict, Any, Callable, AsyncIterator, Deque, Iterable, Set, Tuple
 from datetime import datetime
 
 import websockets
@@ -12,57 +14,216 @@ from websockets.client import WebSocketClientProtocol
 
 from app.core.config import get_settings
 from app.core.logging import logger
-from app.core.security import token_manager
+from app.core import codec
+from app.core.constants import (
+    WS_LOGIN_TIMEOUT,
+    WS_RECONNECT_BASE_DELAY,
+    WS_RECONNECT_MAX_DELAY,
+    WS_HANDLER_QUEUE_SIZE,
+    WS_HANDLER_WORKERS,
+    WS_REALTIME_BATCH_SIZE,
+)
+from app.core.metrics import metrics, SIZE_BUCKETS
 from app.shared.exceptions import AuthenticationException, APIException
+from .circuit_breaker import get_circuit_breakers
+from .dispatch import DispatchQueue, KeyFunc, POLICY_BLOCK, POLICY_CONFLATE
+from .quote_cache import REAL_TYPE_TRADE, REAL_TYPE_ORDERBOOK, get_quote_cache
+from .token_provider import get_token_provider
 
 settings = get_settings()
 
+# trnm 별 WebSocket 메트릭
+_messages = metrics.counter("ws_messages_total", "WebSocket messages received", ("trnm",))
+_message_bytes = metrics.histogram(
+    "ws_message_bytes", "WebSocket message size", ("trnm",), buckets=SIZE_BUCKETS
+)
+_decode_time = metrics.histogram("ws_decode_seconds", "WebSocket message decode time", ("trnm",))
+_round_trip = metrics.histogram(
+    "ws_round_trip_seconds", "WebSocket request/response time", ("trnm",)
+)
+_requests = metrics.counter(
+    "ws_requests_total", "WebSocket requests by outcome", ("trnm", "result")
+)
+_connects = metrics.counter("ws_connects_total", "WebSocket connect attempts", ("result",))
+_gap_time = metrics.histogram(
+    "ws_gap_seconds", "Time from disconnect until the session was restored"
+)
+
+# 응답 대기 키: (trnm, 상관 키). CNSRREQ 는 seq, 그 외는 ""
+PendingKey = Tuple[str, str]
+
+
+def correlation_key(message: Dict[str, Any]) -> PendingKey:
+    """
+    요청/응답 매칭 키
+    
+    응답의 seq 는 공백이 붙어 올 수 있어('2  ') 정리해서 비교한다.
+    같은 키의 요청은 서버가 보낸 순서(FIFO)대로 응답과 짝지어진다.
+    """
+    trnm = message.get("trnm", "")
+    if trnm == "CNSRREQ":
+        return trnm, str(message.get("seq", "")).strip()
+    return trnm, ""
+
 
 class KiwoomWebSocketClient:
     """키움증권 WebSocket 클라이언트"""
     
     def __init__(self):
         # WebSocket URL: wss://api.kiwoom.com:10000/api/dostk/websocket
-        base_url = settings.KIWOOM_BASE_URL.replace("https://", "wss://")
-        self.uri = f"{base_url}:10000/api/dostk/websocket"
+        if settings.KIWOOM_WEBSOCKET_URI:
+            self.uri = settings.KIWOOM_WEBSOCKET_URI
+        else:
+            base_url = settings.KIWOOM_BASE_URL.replace("https://", "wss://")
+            self.uri = f"{base_url}:10000/api/dostk/websocket"
         
         self.websocket: Optional[WebSocketClientProtocol] = None
         self.connected = False
         self.keep_running = True
-        self._message_handlers: Dict[str, Callable] = {}
+        # 핸들러 큐: trnm 또는 'REAL:{type}' -> 큐 (수신 루프는 넣기만 하고 워커가 처리)
+        self._queues: Dict[str, DispatchQueue] = {}
+        # 실시간 시세 등록 상태: grp_no -> (타입, 종목코드 집합)
+        self._realtime_groups: Dict[str, Tuple[Tuple[str, ...], Set[str]]] = {}
+        self._receiving = False
+        self._receive_task: Optional[asyncio.Task] = None
+        # 요청/응답 멀티플렉서: 키별 응답 대기 Future (FIFO)
+        self._pending: Dict[PendingKey, Deque[asyncio.Future]] = defaultdict(deque)
+        
+        # 재연결 시 다시 보낼 실시간 등록 메시지 (키 -> 메시지)
+        self._subscriptions: Dict[str, Dict[str, Any]] = {}
+        self._connect_lock = asyncio.Lock()
+        self._connecting_task: Optional[asyncio.Task] = None
+        self._supervisor_task: Optional[asyncio.Task] = None
+        self._login_rejected = False
+        self._disconnected_at: Optional[float] = None
+        self._reconnects = 0
+        self._last_gap_seconds = 0.0
         
     async def connect(self) -> bool:
         """
         WebSocket 서버에 연결
         
+        LOGIN 응답까지 확인한 뒤 등록된 실시간 구독을 다시 전송한다.
+        
         Returns:
             연결 성공 여부
         """
-        try:
-            logger.info(f"Connecting to WebSocket server: {self.uri}")
-            self.websocket = await websockets.connect(self.uri)
-            self.connected = True
-            logger.info("WebSocket connected successfully")
-            
-            # 로그인 패킷 전송
-            access_token = token_manager.get_token()
-            if not access_token:
-                raise AuthenticationException("No valid access token for WebSocket login")
-            
-            login_packet = {
-                "trnm": "LOGIN",
-                "token": access_token
-            }
-            
-            logger.info("Sending LOGIN packet to WebSocket server")
-            await self.send_message(login_packet)
+        async with self._connect_lock:
+            if self.connected:
+                return True
+            self._connecting_task = asyncio.current_task()
+            try:
+                # 로그인 토큰 (만료 임박 시 갱신, 직전 로그인이 거부됐으면 재발급)
+                provider = get_token_provider()
+                if self._login_rejected:
+                    access_token = await provider.refresh()
+                else:
+                    access_token = await provider.get_token()
+                
+                logger.info(f"Connecting to WebSocket server: {self.uri}")
+                self.websocket = await websockets.connect(self.uri)
+                self.connected = True
+                logger.info("WebSocket connected successfully")
+                
+                logger.info("Sending LOGIN packet to WebSocket server")
+                response = await self.request(
+                    {"trnm": "LOGIN", "token": access_token},
+                    timeout=WS_LOGIN_TIMEOUT
+                )
+                if response.get("return_code") != 0:
+                    self._login_rejected = True
+                    error_msg = response.get("return_msg", "Unknown error")
+                    raise AuthenticationException(f"WebSocket login failed: {error_msg}")
+                self._login_rejected = False
+                
+                await self._replay_subscriptions()
+                
+            except Exception as e:
+                logger.error(f"WebSocket connection error: {e}")
+                _connects.inc("failure")
+                await self._close_socket()
+                return False
+            finally:
+                self._connecting_task = None
             
+            _connects.inc("success")
+            if self._disconnected_at is not None:
+                self._reconnects += 1
+                self._last_gap_seconds = time.monotonic() - self._disconnected_at
+                self._disconnected_at = None
+                _gap_time.observe(self._last_gap_seconds)
+                logger.info(
+                    f"WebSocket session restored after {self._last_gap_seconds:.1f}s "
+                    f"({len(self._subscriptions)} subscriptions replayed)"
+                )
             return True
+    
+    async def _ensure_connected(self) -> None:
+        # connect() 자신이 보내는 LOGIN/재등록 메시지는 다시 connect 하지 않음
+        if not self.connected and asyncio.current_task() is not self._connecting_task:
+            await self.connect()
+    
+    async def _close_socket(self) -> None:
+        self.connected = False
+        if self.websocket is not None:
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
+    
+    def add_subscription(self, key: str, message: Dict[str, Any]) -> None:
+        """
+        재연결 시 다시 보낼 실시간 등록 메시지 저장
+        
+        Args:
+            key: 구독 식별 키 (예: 'condition:4')
+            message: 등록 메시지 (예: CNSRREQ search_type=1, REG)
+        """
+        self._subscriptions[key] = message
+    
+    def remove_subscription(self, key: str) -> Optional[Dict[str, Any]]:
+        """구독 해제 (재연결 시 더 이상 전송하지 않음)"""
+        return self._subscriptions.pop(key, None)
+    
+    @property
+    def subscriptions(self) -> Dict[str, Dict[str, Any]]:
+        """등록된 실시간 구독 (키 -> 메시지)"""
+        return dict(self._subscriptions)
+    
+    async def _replay_subscriptions(self) -> None:
+        for message in list(self._subscriptions.values()):
+            await self.send_message(message)
+        if self._subscriptions:
+            logger.info(f"Replayed {len(self._subscriptions)} realtime subscriptions")
+    
+    async def run_session(self) -> None:
+        """
+        연결 유지 (감독 루프)
+        
+        연결이 끊기면 지수 백오프(지터 포함)로 재연결하고, 새 토큰으로
+        LOGIN 후 실시간 구독을 다시 등록한다. disconnect() 호출 시 종료.
+        """
+        attempt = 0
+        while self.keep_running:
+            if not await self.connect():
+                delay = min(WS_RECONNECT_BASE_DELAY * 2 ** attempt, WS_RECONNECT_MAX_DELAY)
+                delay *= random.uniform(0.5, 1.0)
+                attempt += 1
+                logger.warning(f"WebSocket reconnect attempt {attempt} failed, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            attempt = 0
             
-        except Exception as e:
-            logger.error(f"WebSocket connection error: {e}")
-            self.connected = False
-            return False
+            # 연결이 끊길 때까지 수신
+            self._ensure_receiving()
+            if self._receive_task is not None:
+                await asyncio.shield(self._receive_task)
+    
+    def start(self) -> None:
+        """감독 루프를 백그라운드로 시작"""
+        self.keep_running = True
+        if self._supervisor_task is None or self._supervisor_task.done():
+            self._supervisor_task = asyncio.ensure_future(self.run_session())
     
     async def send_message(self, message: Dict[str, Any]) -> None:
         """
@@ -71,33 +232,73 @@ class KiwoomWebSocketClient:
         Args:
             message: 전송할 메시지 (dict)
         """
-        if not self.connected:
-            await self.connect()
+        await self._ensure_connected()
         
         if self.connected and self.websocket:
-            message_str = json.dumps(message, ensure_ascii=False)
+            message_str = codec.dumps(message)
             await self.websocket.send(message_str)
             logger.debug(f"WebSocket message sent: {message.get('trnm')}")
     
     async def receive_messages(self) -> None:
         """서버로부터 메시지 수신 (메인 루프)"""
+        if self._receiving:
+            # 이미 수신 루프가 돌고 있으면 (recv 는 한 곳에서만 호출 가능) 그 종료를 기다림
+            if self._receive_task is not None:
+                await asyncio.shield(self._receive_task)
+            return
+        self._receiving = True
+        await self._run_receive_loop()
+    
+    def _ensure_receiving(self) -> None:
+        """수신 루프가 없으면 백그라운드로 시작"""
+        if not self._receiving:
+            self._receiving = True
+            self._receive_task = asyncio.ensure_future(self._run_receive_loop())
+    
+    async def _run_receive_loop(self) -> None:
+        try:
+            await self._receive_loop()
+        finally:
+            self._receiving = False
+            if self.keep_running and self._disconnected_at is None:
+                self._disconnected_at = time.monotonic()
+            self._fail_pending(APIException("WebSocket connection closed"))
+    
+    async def _receive_loop(self) -> None:
         while self.keep_running and self.websocket:
             try:
                 # 메시지 수신
                 response_str = await self.websocket.recv()
-                response = json.loads(response_str)
+                started = time.perf_counter()
+                try:
+                    response = codec.loads(response_str)
+                except codec.JSONDecodeError as e:
+                    _messages.inc("invalid")
+                    logger.error(f"Failed to parse WebSocket message: {e}")
+                    continue
                 
                 trnm = response.get("trnm")
+                _decode_time.labels(trnm).observe(time.perf_counter() - started)
+                _message_bytes.labels(trnm).observe(len(response_str))
+                _messages.inc(trnm)
                 
-                # LOGIN 응답 처리
+                # 실시간 푸시: data 항목별로 타입 큐에 전달
+                if trnm == "REAL" and "REAL" not in self._queues:
+                    for item in response.get("data") or []:
+                        queue = self._queues.get(f"REAL:{item.get('type')}")
+                        if queue is not None:
+                            await queue.put(item)
+                    continue
+                
+                # LOGIN 응답 처리 (실패 시 connect 에서 연결 종료)
                 if trnm == "LOGIN":
                     return_code = response.get("return_code")
                     if return_code != 0:
                         error_msg = response.get("return_msg", "Unknown error")
                         logger.error(f"WebSocket login failed: {error_msg}")
-                        await self.disconnect()
                     else:
                         logger.info("WebSocket login successful")
+                    self._resolve_pending(response)
                 
                 # PING 응답 처리 (에코백)
                 elif trnm == "PING":
@@ -107,45 +308,363 @@ class KiwoomWebSocketClient:
                 # 일반 메시지 처리
                 else:
                     logger.info(f"WebSocket response received: {trnm}")
-                    logger.debug(f"Response data: {response}")
+                    logger.debug("Response data: %s", response)
+                    
+                    # 대기 중인 요청에 응답 전달, 아무도 기다리지 않는 메시지
+                    # (실시간 푸시, 재연결 후 재등록 응답 등)는 등록된 핸들러로
+                    if self._resolve_pending(response):
+                        continue
                     
-                    # 등록된 핸들러 호출
-                    if trnm in self._message_handlers:
-                        handler = self._message_handlers[trnm]
-                        await handler(response)
+                    queue = self._queues.get(trnm)
+                    if queue is not None:
+                        await queue.put(response)
                 
             except websockets.ConnectionClosed:
                 logger.warning("WebSocket connection closed by server")
                 self.connected = False
                 break
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse WebSocket message: {e}")
             except Exception as e:
                 logger.error(f"Error in WebSocket receive loop: {e}")
     
     async def disconnect(self) -> None:
-        """WebSocket 연결 종료"""
+        """WebSocket 연결 종료 (감독 루프도 중지)"""
         self.keep_running = False
         if self.connected and self.websocket:
             await self.websocket.close()
             self.connected = False
             logger.info("WebSocket disconnected")
+        if self._supervisor_task is not None:
+            self._supervisor_task.cancel()
+            try:
+                await self._supervisor_task
+            except asyncio.CancelledError:
+                pass
+            self._supervisor_task = None
+        for queue in self._queues.values():
+            await queue.close()
+    
+    def _resolve_pending(self, response: Dict[str, Any]) -> bool:
+        """응답을 가장 먼저 대기한 요청에 전달 (취소/타임아웃된 요청은 건너뜀)"""
+        key = correlation_key(response)
+        waiters = self._pending.get(key)
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(response)
+                if not waiters:
+                    del self._pending[key]
+                return True
+        self._pending.pop(key, None)
+        return False
+    
+    def _fail_pending(self, error: Exception) -> None:
+        """연결 종료 시 대기 중인 모든 요청 실패 처리"""
+        pending, self._pending = self._pending, defaultdict(deque)
+        for waiters in pending.values():
+            for future in waiters:
+                if not future.done():
+                    future.set_exception(error)
     
-    def register_handler(self, trnm: str, handler: Callable) -> None:
+    def _discard_pending(self, key: PendingKey, future: asyncio.Future) -> None:
+        waiters = self._pending.get(key)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(future)
+        except ValueError:
+            pass
+        if not waiters:
+            del self._pending[key]
+    
+    async def request(self, message: Dict[str, Any], timeout: float) -> Dict[str, Any]:
         """
-        메시지 타입별 핸들러 등록
+        요청 전송 후 짝이 되는 응답 대기
+        
+        같은 연결에서 여러 요청을 동시에 보낼 수 있다. 응답은 trnm + 상관 키
+        (correlation_key)로 대기 중인 요청과 매칭된다.
+        
+        Args:
+            message: 요청 메시지 (trnm 필수)
+            timeout: 응답 대기 시간 (초)
+        
+        Returns:
+            응답 메시지
+        
+        Raises:
+            asyncio.TimeoutError: 시간 내 응답이 없는 경우
+            APIException: 응답 전에 연결이 끊긴 경우
+        """
+        await self._ensure_connected()
+        if not self.connected:
+            raise APIException("WebSocket not connected")
+        self._ensure_receiving()
+        
+        key = correlation_key(message)
+        future = asyncio.get_running_loop().create_future()
+        # 전송 전에 등록 (응답이 send 반환보다 먼저 올 수 있음)
+        self._pending[key].append(future)
+        
+        trnm = key[0]
+        started = time.perf_counter()
+        try:
+            await self.send_message(message)
+            response = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            _requests.inc(trnm, "timeout")
+            raise
+        except asyncio.CancelledError:
+            _requests.inc(trnm, "cancelled")
+            raise
+        except Exception:
+            _requests.inc(trnm, "error")
+            raise
+        finally:
+            self._discard_pending(key, future)
+        
+        _round_trip.labels(trnm).observe(time.perf_counter() - started)
+        _requests.inc(trnm, "ok")
+        return response
+    
+    def in_flight(self) -> int:
+        """응답 대기 중인 요청 수"""
+        return sum(
+            1 for waiters in self._pending.values() for future in waiters if not future.done()
+        )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        연결/요청 상태
+        
+        Returns:
+            연결 여부, 수신 루프 실행 여부, trnm 별 대기 요청 수
+        """
+        in_flight: Dict[str, int] = defaultdict(int)
+        for (trnm, _), waiters in list(self._pending.items()):
+            in_flight[trnm] += sum(1 for future in waiters if not future.done())
+        return {
+            "connected": self.connected,
+            "receiving": self._receiving,
+            "in_flight": sum(in_flight.values()),
+            "in_flight_by_trnm": dict(in_flight),
+            "subscriptions": len(self._subscriptions),
+            "realtime_codes": {
+                grp_no: len(codes) for grp_no, (_, codes) in self._realtime_groups.items()
+            },
+            "queues": {name: queue.get_stats() for name, queue in self._queues.items()},
+            "reconnects": self._reconnects,
+            "last_gap_seconds": round(self._last_gap_seconds, 3),
+            "disconnected_for_seconds": (
+                round(time.monotonic() - self._disconnected_at, 3)
+                if self._disconnected_at is not None else 0.0
+            ),
+        }
+    
+    def register_realtime_handler(
+        self,
+        real_type: str,
+        handler: Callable,
+        policy: str = POLICY_BLOCK,
+        key: Optional[KeyFunc] = None,
+        maxsize: int = WS_HANDLER_QUEUE_SIZE,
+        workers: int = WS_HANDLER_WORKERS
+    ) -> None:
+        """
+        실시간(REAL) 푸시 타입별 핸들러 등록
+        
+        Args:
+            real_type: data[].type 값 (예: '02' 조건검색)
+            handler: 핸들러 함수 (async function, data 항목 하나를 받음)
+            policy, key, maxsize, workers: register_handler 참고
+        """
+        self._set_queue(f"REAL:{real_type}", handler, policy, key, maxsize, workers)
+    
+    def register_handler(
+        self,
+        trnm: str,
+        handler: Callable,
+        policy: str = POLICY_BLOCK,
+        key: Optional[KeyFunc] = None,
+        maxsize: int = WS_HANDLER_QUEUE_SIZE,
+        workers: int = WS_HANDLER_WORKERS
+    ) -> None:
+        """
+        메시지 타입별 핸들러 등록 (요청의 응답이 아닌 메시지만 전달됨)
+        
+        핸들러는 수신 루프가 아닌 워커 태스크에서 실행되므로 느린 핸들러가
+        recv/PING 응답을 막지 않는다.
         
         Args:
             trnm: 트랜잭션 이름 (예: 'CNSRLST')
             handler: 핸들러 함수 (async function)
+            policy: 큐가 가득 찼을 때 정책 (block / drop_oldest / conflate)
+            key: conflate 정책의 메시지 키 함수 (예: 종목코드)
+            maxsize: 큐 최대 길이
+            workers: 워커 태스크 수 (1이면 순서 보장)
         """
-        self._message_handlers[trnm] = handler
-        logger.debug(f"Handler registered for {trnm}")
+        self._set_queue(trnm, handler, policy, key, maxsize, workers)
+    
+    def _set_queue(
+        self,
+        name: str,
+        handler: Callable,
+        policy: str,
+        key: Optional[KeyFunc],
+        maxsize: int,
+        workers: int
+    ) -> None:
+        previous = self._queues.get(name)
+        if previous is not None:
+            # 기존 워커는 남은 메시지를 처리하지 않고 종료
+            previous.cancel()
+        self._queues[name] = DispatchQueue(
+            name, handler, maxsize=maxsize, policy=policy, key=key, workers=workers
+        )
+        logger.debug(f"Handler registered for {name} ({policy})")
     
-    async def get_condition_list(self) -> Dict[str, Any]:
+    async def set_realtime_codes(
+        self,
+        codes: Iterable[str],
+        types: Iterable[str] = (REAL_TYPE_TRADE,),
+        grp_no: str = "1"
+    ) -> Dict[str, int]:
+        """
+        실시간 시세 등록 종목 집합 지정
+        
+        현재 등록된 집합과 비교해 추가된 종목만 REG, 빠진 종목만 REMOVE 하며
+        WS_REALTIME_BATCH_SIZE 종목씩 묶어 전송한다. 수신한 체결/호가는
+        get_quote_cache() 에 종목별 최신값으로 저장된다.
+        
+        Args:
+            codes: 종목코드 목록 (전체 집합)
+            types: 실시간 타입 (0B: 주식체결, 0D: 주식호가잔량)
+            grp_no: 그룹번호 (그룹별로 따로 관리)
+        
+        Returns:
+            {'added': 추가 종목 수, 'removed': 해제 종목 수}
+        
+        Raises:
+            APIException: 등록/해제 실패
+        """
+        self._ensure_quote_handlers()
+        types = tuple(types)
+        wanted = {str(code).strip().lstrip("A") for code in codes if str(code).strip()}
+        current_types, current = self._realtime_groups.get(grp_no, (types, set()))
+        previous = current
+        
+        if current and current_types != types:
+            # 타입이 바뀌면 기존 등록을 모두 해제 후 다시 등록
+            await self._send_realtime("REMOVE", sorted(current), current_types, grp_no)
+            current = set()
+        
+        added = sorted(wanted - current)
+        removed = sorted(current - wanted)
+        await self._send_realtime("REMOVE", removed, current_types, grp_no)
+        await self._send_realtime("REG", added, types, grp_no)
+        
+        if wanted:
+            self._realtime_groups[grp_no] = (types, wanted)
+        else:
+            self._realtime_groups.pop(grp_no, None)
+        self._update_realtime_subscriptions(grp_no)
+        
+        # 다른 그룹에서 쓰지 않는 종목은 캐시에서 제거
+        still_used = set().union(*(group_codes for _, group_codes in self._realtime_groups.values()))
+        cache = get_quote_cache()
+        for code in previous - wanted:
+            if code not in still_used:
+                cache.discard(code)
+        
+        if added or removed:
+            logger.info(
+                f"Realtime quotes (group {grp_no}): +{len(added)} -{len(removed)}, "
+                f"{len(wanted)} registered"
+            )
+        return {"added": len(added), "removed": len(removed)}
+    
+    async def register_realtime(
+        self,
+        codes: Iterable[str],
+        types: Iterable[str] = (REAL_TYPE_TRADE,),
+        grp_no: str = "1"
+    ) -> Dict[str, int]:
+        """실시간 시세 종목 추가 (기존 등록 유지)"""
+        _, current = self._realtime_groups.get(grp_no, ((), set()))
+        return await self.set_realtime_codes(current | set(codes), types, grp_no)
+    
+    async def remove_realtime(self, codes: Iterable[str], grp_no: str = "1") -> Dict[str, int]:
+        """실시간 시세 종목 해제"""
+        types, current = self._realtime_groups.get(grp_no, ((REAL_TYPE_TRADE,), set()))
+        return await self.set_realtime_codes(current - set(codes), types, grp_no)
+    
+    def get_realtime_codes(self, grp_no: str = "1") -> Set[str]:
+        """그룹에 등록된 실시간 시세 종목"""
+        return set(self._realtime_groups.get(grp_no, ((), set()))[1])
+    
+    def _realtime_packets(
+        self,
+        trnm: str,
+        codes: list,
+        types: Tuple[str, ...],
+        grp_no: str
+    ) -> list:
+        packets = []
+        for start in range(0, len(codes), WS_REALTIME_BATCH_SIZE):
+            packet = {
+                "trnm": trnm,
+                "grp_no": grp_no,
+                "data": [{"item": codes[start:start + WS_REALTIME_BATCH_SIZE], "type": list(types)}],
+            }
+            if trnm == "REG":
+                packet["refresh"] = "1"  # 기존 등록 유지
+            packets.append(packet)
+        return packets
+    
+    async def _send_realtime(
+        self,
+        trnm: str,
+        codes: list,
+        types: Tuple[str, ...],
+        grp_no: str
+    ) -> None:
+        for packet in self._realtime_packets(trnm, codes, types, grp_no):
+            response = await self.request(packet, timeout=WS_LOGIN_TIMEOUT)
+            if response.get("return_code") != 0:
+                error_msg = response.get("return_msg", "Unknown error")
+                raise APIException(f"Realtime {trnm} failed: {error_msg}")
+    
+    def _update_realtime_subscriptions(self, grp_no: str) -> None:
+        # 재연결 시 그룹 전체를 다시 등록하도록 구독 목록 갱신
+        prefix = f"realtime:{grp_no}:"
+        for key in [key for key in self._subscriptions if key.startswith(prefix)]:
+            del self._subscriptions[key]
+        group = self._realtime_groups.get(grp_no)
+        if group is None:
+            return
+        types, codes = group
+        for index, packet in enumerate(self._realtime_packets("REG", sorted(codes), types, grp_no)):
+            self._subscriptions[f"{prefix}{index}"] = packet
+    
+    def _ensure_quote_handlers(self) -> None:
+        # 종목별 최신값만 의미 있으므로 밀리면 같은 종목끼리 합침
+        for real_type in (REAL_TYPE_TRADE, REAL_TYPE_ORDERBOOK):
+            if f"REAL:{real_type}" not in self._queues:
+                self.register_realtime_handler(
+                    real_type,
+                    self._apply_quote,
+                    policy=POLICY_CONFLATE,
+                    key=lambda item: item.get("item")
+                )
+    
+    async def _apply_quote(self, item: Dict[str, Any]) -> None:
+        get_quote_cache().apply(item)
+    
+    async def get_condition_list(self, timeout: float = 10.0) -> Dict[str, Any]:
         """
         조건검색 목록 조회
         
+        Args:
+            timeout: 응답 대기 시간 (초)
+        
         Returns:
             조건검색 목록 응답
             {
@@ -155,34 +674,30 @@ class KiwoomWebSocketClient:
                 'data': [['0', '조건1'], ['1', '조건2'], ...]
             }
         """
-        # 응답을 저장할 변수
-        response_data = {}
-        response_event = asyncio.Event()
-        
-        # 응답 핸들러
-        async def handle_response(response: Dict[str, Any]):
-            nonlocal response_data
-            response_data = response
-            response_event.set()
-        
-        # 핸들러 등록
-        self.register_handler("CNSRLST", handle_response)
-        
         # 연결 확인
         if not self.connected:
             await self.connect()
         
-        # 조건검색 목록 요청
-        request = {"trnm": "CNSRLST"}
-        await self.send_message(request)
-        logger.info("Condition list request sent")
+        # 장애 시 즉시 실패 (서킷 브레이커)
+        breaker = get_circuit_breakers().get("ws:CNSRLST")
+        breaker.before_call()
         
-        # 응답 대기 (타임아웃 10초)
         try:
-            await asyncio.wait_for(response_event.wait(), timeout=10.0)
+            # 조건검색 목록 요청
+            logger.info("Sending condition list request")
+            response_data = await self.request({"trnm": "CNSRLST"}, timeout=timeout)
         except asyncio.TimeoutError:
+            breaker.record_failure()
             logger.error("Timeout waiting for condition list response")
             raise APIException("Condition list request timeout")
+        except APIException:
+            # 응답 전에 연결 종료
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success()
         
         # 응답 검증
         return_code = response_data.get("return_code")
@@ -198,7 +713,8 @@ class KiwoomWebSocketClient:
         search_type: str = "0",
         stex_tp: str = "K",
         cont_yn: str = "N",
-        next_key: str = ""
+        next_key: str = "",
+        timeout: float = 30.0
     ) -> Dict[str, Any]:
         """
         조건검색 실행 (일반)
@@ -209,6 +725,7 @@ class KiwoomWebSocketClient:
             stex_tp: 거래소구분 (K: 코스피/코스닥, 기본값 "K")
             cont_yn: 연속조회여부 (Y/N) 기본값 "N"
             next_key: 연속조회키 (연속조회시 사용) 기본값 ""
+            timeout: 응답 대기 시간 (초, 검색 시간 고려해 기본 30초)
         
         Returns:
             조건검색 결과
@@ -231,41 +748,38 @@ class KiwoomWebSocketClient:
                 ]
             }
         """
-        # 응답을 저장할 변수
-        response_data = {}
-        response_event = asyncio.Event()
-        
-        # 응답 핸들러
-        async def handle_response(response: Dict[str, Any]):
-            nonlocal response_data
-            response_data = response
-            response_event.set()
-        
-        # 핸들러 등록
-        self.register_handler("CNSRREQ", handle_response)
-        
         # 연결 확인
         if not self.connected:
             await self.connect()
         
-        # 조건검색 실행 요청
-        request = {
-            "trnm": "CNSRREQ",
-            "seq": seq,
-            "search_type": search_type,
-            "stex_tp": stex_tp,
-            "cont_yn": cont_yn,
-            "next_key": next_key
-        }
-        await self.send_message(request)
-        logger.info(f"Condition search request sent: seq={seq}, type={search_type}")
+        # 장애 시 즉시 실패 (서킷 브레이커)
+        breaker = get_circuit_breakers().get("ws:CNSRREQ")
+        breaker.before_call()
         
-        # 응답 대기 (타임아웃 30초 - 검색 시간 고려)
         try:
-            await asyncio.wait_for(response_event.wait(), timeout=30.0)
+            # 조건검색 실행 요청
+            request = {
+                "trnm": "CNSRREQ",
+                "seq": seq,
+                "search_type": search_type,
+                "stex_tp": stex_tp,
+                "cont_yn": cont_yn,
+                "next_key": next_key
+            }
+            logger.info(f"Sending condition search request: seq={seq}, type={search_type}")
+            
+            response_data = await self.request(request, timeout=timeout)
         except asyncio.TimeoutError:
+            breaker.record_failure()
             logger.error("Timeout waiting for condition search response")
             raise APIException("Condition search request timeout")
+        except APIException:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_success()
         
         # 응답 검증
         return_code = response_data.get("return_code")
@@ -275,10 +789,73 @@ class KiwoomWebSocketClient:
         
         return response_data
     
+    async def iter_condition_results(
+        self,
+        seq: str,
+        search_type: str = "0",
+        stex_tp: str = "K",
+        prefetch: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        조건검색 결과를 연속조회(cont_yn/next_key) 페이지 단위로 스트리밍
+        
+        Args:
+            seq: 조건검색식 일련번호
+            search_type: 조회타입 (0: 전체, 1: 추가, 2: 삭제)
+            stex_tp: 거래소구분
+            prefetch: 현재 페이지를 넘겨주기 전에 다음 페이지 요청을 미리 전송
+        
+        Yields:
+            페이지별 CNSRREQ 응답 (search_condition 반환값과 동일한 형식)
+        
+        Example:
+            async for page in client.iter_condition_results("4"):
+                for row in page.get("data") or []:
+                    ...
+        """
+        if not self.connected:
+            await self.connect()
+        self._ensure_receiving()
+        
+        def fetch(next_key: str) -> asyncio.Task:
+            return asyncio.ensure_future(self.search_condition(
+                seq=seq,
+                search_type=search_type,
+                stex_tp=stex_tp,
+                cont_yn="Y" if next_key else "N",
+                next_key=next_key
+            ))
+        
+        pending: Optional[asyncio.Task] = fetch("")
+        pages = 0
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+                pages += 1
+                
+                next_key = str(page.get("next_key") or "").strip()
+                has_next = page.get("cont_yn") == "Y" and bool(next_key)
+                if has_next and prefetch:
+                    pending = fetch(next_key)
+                
+                yield page
+                
+                if has_next and pending is None:
+                    pending = fetch(next_key)
+        finally:
+            # 소비자가 중간에 멈춘 경우 미리 보낸 요청 정리
+            if pending is not None:
+                if pending.done():
+                    if not pending.cancelled():
+                        pending.exception()
+                else:
+                    pending.cancel()
+            logger.info(f"Condition search stream finished: seq={seq}, pages={pages}")
+    
     async def run(self) -> None:
-        """WebSocket 클라이언트 실행 (백그라운드)"""
-        await self.connect()
-        await self.receive_messages()
+        """WebSocket 클라이언트 실행 (끊기면 자동 재연결)"""
+        await self.run_session()
 
 
 # 싱글톤 인스턴스 (필요 시 사용)
@@ -290,4 +867,5 @@ def get_websocket_client() -> KiwoomWebSocketClient:
     global _ws_client_instance
     if _ws_client_instance is None:
         _ws_client_instance = KiwoomWebSocketClient()
+        metrics.register_collector("websocket", _ws_client_instance.get_stats)
     return _ws_client_instance
@@ -0,0 +1,74 @@
+"""
+JSON codec for REST/WebSocket hot paths
+
+Uses orjson when installed (pip install orjson), then ujson, and falls back
+to the standard library otherwise. Non-ASCII text (stock names) is always
+emitted as-is, matching json.dumps(..., ensure_ascii=False).
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional dependency
+    _orjson = None
+
+try:
+    import ujson as _ujson
+except ImportError:  # pragma: no cover - optional dependency
+    _ujson = None
+
+# All backends raise a ValueError subclass on malformed input
+JSONDecodeError = ValueError
+
+
+def _stdlib_loads(data: Union[str, bytes]) -> Any:
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _stdlib_dumps_bytes(obj: Any) -> bytes:
+    return _stdlib_dumps(obj).encode("utf-8")
+
+
+if _orjson is not None:
+    JSON_BACKEND = "orjson"
+
+    _ORJSON_OPTIONS = _orjson.OPT_NON_STR_KEYS
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Decode JSON text or bytes"""
+        return _orjson.loads(data)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Encode object to UTF-8 JSON bytes"""
+        return _orjson.dumps(obj, option=_ORJSON_OPTIONS)
+
+    def dumps(obj: Any) -> str:
+        """Encode object to JSON text"""
+        return _orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+
+elif _ujson is not None:
+    JSON_BACKEND = "ujson"
+
+    def loads(data: Union[str, bytes]) -> Any:
+        """Decode JSON text or bytes"""
+        return _ujson.loads(data)
+
+    def dumps(obj: Any) -> str:
+        """Encode object to JSON text"""
+        return _ujson.dumps(obj, ensure_ascii=False)
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Encode object to UTF-8 JSON bytes"""
+        return _ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+else:
+    JSON_BACKEND = "json"
+    loads = _stdlib_loads
+    dumps = _stdlib_dumps
+    dumps_bytes = _stdlib_dumps_bytes
@@ -24,7 +24,18 @@ class Settings(BaseSettings):
     KIWOOM_APP_KEY: str
     KIWOOM_APP_SECRET: str
     KIWOOM_BASE_URL: str = "https://api.kiwoom.com"  # Fixed: Real trading URL (no port)
+    KIWOOM_APP_KEYS: Optional[str] = None  # Extra app keys for the pool: "key1:secret1,key2:secret2"
     KIWOOM_WEBSOCKET_URL: str = "wss://openapi.kiwoom.com/ws"
+    KIWOOM_WEBSOCKET_URI: Optional[str] = None  # Full condition-search WebSocket URI override (e.g. mock server)
+    KIWOOM_TOKEN_FILE: str = "data/.token"
+    KIWOOM_TOKEN_REFRESH_MARGIN: int = 600  # seconds before expiry to rotate the token
+    
+    # Kiwoom HTTP transport (shared connection pool)
+    KIWOOM_HTTP_TIMEOUT: float = 30.0  # seconds
+    KIWOOM_HTTP_MAX_CONNECTIONS: int = 20
+    KIWOOM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    KIWOOM_HTTP_KEEPALIVE_EXPIRY: float = 60.0  # seconds
+    KIWOOM_HTTP2: bool = False  # Requires 'h2' package (pip install httpx[http2])
     
     # Database
     DATABASE_URL: str = "sqlite:///./data/kiwoom.db"
@@ -38,6 +49,10 @@ class Settings(BaseSettings):
     # Scheduler
     SCHEDULER_ENABLED: bool = True
     CONDITION_CHECK_INTERVAL: int = 30  # seconds
+    REALTIME_CONDITIONS_ENABLED: bool = True  # WebSocket pushes; polling only reconciles
+    CONDITION_RECONCILE_INTERVAL: int = 300  # seconds between REST reconciliations while realtime is live
+    CONDITION_RESULT_STORAGE: str = "full"  # full: every row of every run, delta: keyframes + changes
+    CONDITION_KEYFRAME_INTERVAL: int = 20  # delta storage: full snapshot every N runs
     
     # Notification
     SLACK_WEBHOOK_URL: Optional[str] = None
@@ -49,6 +64,15 @@ class Settings(BaseSettings):
     EMAIL_FROM: Optional[str] = None
     EMAIL_TO: Optional[str] = None
     
+    @field_validator('CONDITION_RESULT_STORAGE')
+    @classmethod
+    def validate_result_storage(cls, v):
+        """Validate condition result storage mode"""
+        v = v.lower()
+        if v not in ("full", "delta"):
+            raise ValueError("CONDITION_RESULT_STORAGE must be 'full' or 'delta'")
+        return v
+    
     @field_validator('EMAIL_SMTP_PORT', mode='before')
     @classmethod
     def validate_email_port(cls, v):
@@ -19,6 +19,55 @@ RATE_LIMIT_PER_SECOND = 20
 RATE_LIMIT_PER_MINUTE = 1000
 MIN_REQUEST_INTERVAL = 0.05  # 50ms
 
+# API Retry
+RETRY_MAX_ATTEMPTS = 3  # Including the first attempt
+RETRY_BASE_DELAY = 0.2  # seconds (exponential backoff base)
+RETRY_MAX_DELAY = 5.0  # seconds (single backoff cap)
+RETRY_MAX_RETRY_AFTER = 30.0  # seconds (longest Retry-After we wait for)
+RETRY_BUDGET_RATIO = 0.1  # Retries allowed as a fraction of requests
+RETRY_BUDGET_MIN_PER_SECOND = 1.0  # Retry floor when traffic is low
+
+# Circuit Breaker
+CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failures before opening
+CIRCUIT_RECOVERY_TIMEOUT = 30.0  # seconds open before probing
+CIRCUIT_HALF_OPEN_MAX_CALLS = 2  # Probe requests while half-open
+
+# Credential Pool
+CREDENTIAL_THROTTLE_COOLDOWN = 1.0  # seconds a key is avoided after a 429 without Retry-After
+
+# Token Rotation
+TOKEN_REFRESH_RETRY_DELAY = 30.0  # seconds between attempts after a failed refresh
+TOKEN_REFRESH_LOCK_TIMEOUT = 60.0  # seconds to wait for another process's refresh
+TOKEN_SYNC_INTERVAL = 1.0  # seconds between token file change checks (other processes)
+
+# WebSocket Session
+WS_LOGIN_TIMEOUT = 10.0  # seconds to wait for the LOGIN response
+WS_RECONNECT_BASE_DELAY = 1.0  # seconds (exponential backoff base)
+WS_RECONNECT_MAX_DELAY = 60.0  # seconds (backoff cap)
+WS_HANDLER_QUEUE_SIZE = 10000  # messages queued per handler before the overflow policy applies
+WS_HANDLER_WORKERS = 1  # worker tasks per handler queue (1 keeps messages in order)
+WS_REALTIME_BATCH_SIZE = 100  # stock codes per REG/REMOVE packet
+
+# Request Priority Lanes
+LANE_INTERACTIVE = "interactive"  # User-facing API calls
+LANE_TRADING = "trading"  # Order-related calls
+LANE_MONITORING = "monitoring"  # Scheduled condition scans
+LANE_BULK = "bulk"  # Bulk/history downloads
+PRIORITY_LANE_WEIGHTS = {
+    LANE_TRADING: 8,
+    LANE_INTERACTIVE: 4,
+    LANE_MONITORING: 2,
+    LANE_BULK: 1,
+}
+PRIORITY_MAX_WAIT = 5.0  # seconds queued before a request is served regardless of lane
+
+# Response Cache: {tr_id: (ttl seconds, stale-while-revalidate seconds)}
+CACHE_MAX_ENTRIES = 5000
+CACHE_TTL_BY_TR_ID = {
+    TR_ID_STOCK_PRICE: (0.5, 2.0),
+    TR_ID_CONDITION_LIST: (300.0, 600.0),
+}
+
 # Market Hours (KST)
 MARKET_OPEN_HOUR = 9
 MARKET_OPEN_MINUTE = 0
@@ -0,0 +1,129 @@
+"""
+Inter-process file locks
+
+Advisory locks on a lock file (fcntl.flock on Unix, msvcrt.locking on
+Windows) shared by API workers and the standalone scheduler process.
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+if os.name == "nt":  # pragma: no cover - Windows only
+    import msvcrt
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class InterProcessLock:
+    """
+    Exclusive lock held through a lock file
+
+    Excludes other processes as well as other threads/coroutines of this
+    process (each acquisition opens its own file descriptor). Not reentrant:
+    create one instance per acquisition.
+
+    Example:
+        with InterProcessLock("data/.token.lock"):
+            ...
+
+        async with InterProcessLock("data/.token.refresh.lock"):
+            ...  # waits without blocking the event loop
+    """
+
+    def __init__(self, path: Union[str, Path], timeout: Optional[float] = None, poll_interval: float = 0.05):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+
+    def _open(self) -> int:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    def _try_acquire(self) -> bool:
+        fd = self._open()
+        if _try_lock(fd):
+            self._fd = fd
+            return True
+        os.close(fd)
+        return False
+
+    def acquire(self) -> None:
+        """
+        Block until the lock is held
+
+        Raises:
+            TimeoutError: If not acquired within `timeout`
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self._try_acquire():
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out waiting for lock {self.path}")
+            time.sleep(self.poll_interval)
+
+    async def acquire_async(self) -> None:
+        """
+        Wait for the lock without blocking the event loop
+
+        Raises:
+            TimeoutError: If not acquired within `timeout`
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self._try_acquire():
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out waiting for lock {self.path}")
+            await asyncio.sleep(self.poll_interval)
+
+    def release(self) -> None:
+        """Release the lock"""
+        if self._fd is None:
+            return
+        try:
+            _unlock(self._fd)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    @property
+    def locked(self) -> bool:
+        """Whether this instance holds the lock"""
+        return self._fd is not None
+
+    def __enter__(self) -> "InterProcessLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    async def __aenter__(self) -> "InterProcessLock":
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
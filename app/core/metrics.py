@@ -0,0 +1,245 @@
+"""
+Lightweight in-process metrics (counters and fixed-bucket histograms)
+
+Designed for hot paths: an observation is a bisect plus two integer updates,
+with no locks or allocations. Metrics are readable in-process via
+`metrics.snapshot()` and exported in Prometheus text format at /metrics.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds (100us .. 60s)
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# Payload size buckets in bytes (64B .. 4MB)
+SIZE_BUCKETS = tuple(64 * 4 ** i for i in range(9))
+
+
+class _HistogramChild:
+    """Histogram for one label combination"""
+
+    __slots__ = ("_bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record a value"""
+        self.counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate quantile (upper bound of the bucket containing it)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return self._bounds[i] if i < len(self._bounds) else self._bounds[-1]
+        return self._bounds[-1]
+
+    def summary(self) -> Dict[str, float]:
+        """Count, sum, mean and estimated percentiles"""
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Histogram:
+    """Histogram family with labels"""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._children: Dict[Tuple[str, ...], _HistogramChild] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> _HistogramChild:
+        """Get child for label values (cache it on hot paths)"""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, _HistogramChild(self.buckets))
+        return child
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record a value for the given label values"""
+        self.labels(*label_values).observe(value)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [
+            {"labels": dict(zip(self.label_names, key)), **child.summary()}
+            for key, child in list(self._children.items())
+        ]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for key, child in list(self._children.items()):
+            base = _format_labels(self.label_names, key)
+            cumulative = 0
+            for bound, count in zip(self.buckets, child.counts):
+                cumulative += count
+                le = _format_labels(self.label_names + ("le",), key + (repr(bound),))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            inf = _format_labels(self.label_names + ("le",), key + ("+Inf",))
+            lines.append(f"{self.name}_bucket{inf} {child.count}")
+            lines.append(f"{self.name}_sum{base} {child.sum}")
+            lines.append(f"{self.name}_count{base} {child.count}")
+        return lines
+
+
+class Counter:
+    """Counter family with labels"""
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """Increase counter for the given label values"""
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [
+            {"labels": dict(zip(self.label_names, key)), "value": value}
+            for key, value in list(self._values.items())
+        ]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for key, value in list(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {value}")
+        return lines
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            n, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for n, v in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _flatten(prefix: str, value: Any, out: Dict[str, float]) -> None:
+    """Flatten nested stats dicts into numeric gauges"""
+    if isinstance(value, bool):
+        out[prefix] = float(value)
+    elif isinstance(value, (int, float)):
+        out[prefix] = float(value)
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            _flatten(f"{prefix}_{k}", v, out)
+
+
+class MetricsRegistry:
+    """Registry of metric families and stats collectors"""
+
+    def __init__(self, namespace: str = "kiwoom"):
+        self.namespace = namespace
+        self._metrics: Dict[str, Any] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Get or create histogram family"""
+        full_name = f"{self.namespace}_{name}"
+        metric = self._metrics.get(full_name)
+        if metric is None:
+            metric = self._metrics.setdefault(
+                full_name, Histogram(full_name, description, label_names, buckets)
+            )
+        return metric
+
+    def counter(self, name: str, description: str, label_names: Sequence[str] = ()) -> Counter:
+        """Get or create counter family"""
+        full_name = f"{self.namespace}_{name}"
+        metric = self._metrics.get(full_name)
+        if metric is None:
+            metric = self._metrics.setdefault(full_name, Counter(full_name, description, label_names))
+        return metric
+
+    def register_collector(self, name: str, collector: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Register a stats provider exported as gauges
+
+        Args:
+            name: Gauge name prefix
+            collector: Returns a (nested) dict of numeric stats
+        """
+        self._collectors[name] = collector
+
+    def _collect(self) -> Dict[str, Any]:
+        results = {}
+        for name, collector in list(self._collectors.items()):
+            try:
+                results[name] = collector()
+            except Exception as e:
+                results[name] = {"error": str(e)}
+        return results
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get all metrics as a dictionary
+
+        Returns:
+            {'metrics': {name: [...]}, 'collectors': {name: stats}}
+        """
+        return {
+            "metrics": {name: m.snapshot() for name, m in list(self._metrics.items())},
+            "collectors": self._collect(),
+        }
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+
+        for name, stats in self._collect().items():
+            gauges: Dict[str, float] = {}
+            _flatten(f"{self.namespace}_{name}", stats, gauges)
+            for gauge_name, value in gauges.items():
+                gauge_name = "".join(c if c.isalnum() or c == "_" else "_" for c in gauge_name)
+                lines.append(f"# TYPE {gauge_name} gauge")
+                lines.append(f"{gauge_name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
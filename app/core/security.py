@@ -4,56 +4,114 @@ Security and authentication utilities
 
 import json
 import os
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 from datetime import datetime, timedelta
 from threading import Lock
 
+from app.core.config import get_settings
+from app.core.constants import TOKEN_SYNC_INTERVAL
+from app.core.locks import InterProcessLock
 from app.core.logging import logger
 
 
 class TokenManager:
-    """Manage OAuth tokens for Kiwoom API with file persistence"""
+    """
+    Manage OAuth tokens for Kiwoom API with file persistence
+    
+    The token file is shared by every process (API workers, scheduler).
+    Writes happen under an inter-process lock and bump a generation number;
+    other processes notice the new file by its mtime, checked at most once
+    per TOKEN_SYNC_INTERVAL, so the hot path is served from memory.
+    """
     
     TOKEN_FILE = Path("data/.token")
     TOKEN_FILE_LOCK = Lock()
     
-    def __init__(self):
+    def __init__(self, token_file: Optional[str] = None):
+        if token_file:
+            self.TOKEN_FILE = Path(token_file)
         self._access_token: Optional[str] = None
         self._token_expires_at: Optional[datetime] = None
+        self._generation = 0
+        self._file_mtime: Optional[int] = None
+        self._next_sync = 0.0
+        self._reloads = 0
         self._load_token_from_file()
     
+    @property
+    def lock_file(self) -> Path:
+        """Inter-process lock guarding token file writes"""
+        return Path(f"{self.TOKEN_FILE}.lock")
+    
+    @property
+    def refresh_lock_file(self) -> Path:
+        """Inter-process lock held while a process fetches a new token"""
+        return Path(f"{self.TOKEN_FILE}.refresh.lock")
+    
+    @property
+    def generation(self) -> int:
+        """Number of the token version held in memory"""
+        return self._generation
+    
     def _ensure_data_dir(self) -> None:
         """Ensure data directory exists"""
         self.TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
     
+    def _stat_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.TOKEN_FILE).st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _read_file(self) -> Optional[dict]:
+        """Read token file (writes are atomic renames, so no lock needed)"""
+        try:
+            with open(self.TOKEN_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+    
     def _load_token_from_file(self) -> None:
         """Load token from file if exists and valid"""
-        if not self.TOKEN_FILE.exists():
+        self._file_mtime = self._stat_mtime()
+        if self._file_mtime is None:
             return
         
         should_delete = False
         
         try:
             with self.TOKEN_FILE_LOCK:
-                with open(self.TOKEN_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = self._read_file()
+                if data is None:
+                    return
                 
                 access_token = data.get('access_token')
                 expires_at_str = data.get('expires_at')
+                generation = int(data.get('generation', 0))
                 
                 if not access_token or not expires_at_str:
                     logger.warning("Invalid token file format")
                     should_delete = True
+                elif generation < self._generation:
+                    # Older than what we hold (e.g. restored backup)
+                    return
                 else:
                     # Parse expiration time
                     expires_at = datetime.fromisoformat(expires_at_str)
                     
-                    # Check if token is still valid (with 5min buffer)
-                    if datetime.now() < expires_at - timedelta(minutes=5):
+                    # Keep any unexpired token; callers apply their own margins
+                    if datetime.now() < expires_at:
+                        if access_token != self._access_token:
+                            self._reloads += 1
+                            logger.info(
+                                f"Loaded valid token from file "
+                                f"(generation {generation}, expires at {expires_at})"
+                            )
                         self._access_token = access_token
                         self._token_expires_at = expires_at
-                        logger.info(f"Loaded valid token from file (expires at {expires_at})")
+                        self._generation = generation
                     else:
                         logger.info("Token in file has expired")
                         should_delete = True
@@ -67,7 +125,25 @@ class TokenManager:
         
         # Delete token file outside of lock to avoid file handle conflicts
         if should_delete:
-            self._delete_token_file()
+            self._delete_token_file(only_if_mtime=self._file_mtime)
+    
+    def sync(self, force: bool = False) -> None:
+        """
+        Pick up a token written by another process
+        
+        Only stats the file, and only once per TOKEN_SYNC_INTERVAL unless
+        forced; the file is read when its mtime changed.
+        
+        Args:
+            force: Check the file now
+        """
+        now = time.monotonic()
+        if not force and now < self._next_sync:
+            return
+        self._next_sync = now + TOKEN_SYNC_INTERVAL
+        
+        if self._stat_mtime() != self._file_mtime:
+            self._load_token_from_file()
     
     def _save_token_to_file(self) -> None:
         """Save token to file"""
@@ -77,36 +153,58 @@ class TokenManager:
         try:
             self._ensure_data_dir()
             
-            data = {
-                'access_token': self._access_token,
-                'expires_at': self._token_expires_at.isoformat(),
-                'created_at': datetime.now().isoformat(),
-            }
-            
-            with self.TOKEN_FILE_LOCK:
+            with self.TOKEN_FILE_LOCK, InterProcessLock(self.lock_file):
+                # Next generation after whatever any process wrote last
+                try:
+                    current = self._read_file() or {}
+                except json.JSONDecodeError:
+                    current = {}
+                self._generation = max(int(current.get('generation', 0)), self._generation) + 1
+                
+                data = {
+                    'access_token': self._access_token,
+                    'expires_at': self._token_expires_at.isoformat(),
+                    'created_at': datetime.now().isoformat(),
+                    'generation': self._generation,
+                    'pid': os.getpid(),
+                }
+                
                 # Write to temporary file first
-                temp_file = self.TOKEN_FILE.with_suffix('.tmp')
+                temp_file = Path(f"{self.TOKEN_FILE}.{os.getpid()}.tmp")
                 with open(temp_file, 'w', encoding='utf-8') as f:
                     json.dump(data, f, indent=2)
                 
-                # Atomic rename
-                temp_file.replace(self.TOKEN_FILE)
-                
                 # Set file permissions (readable only by owner)
                 if os.name != 'nt':  # Unix-like systems
-                    os.chmod(self.TOKEN_FILE, 0o600)
+                    os.chmod(temp_file, 0o600)
+                
+                # Atomic rename
+                temp_file.replace(self.TOKEN_FILE)
+                self._file_mtime = self._stat_mtime()
             
-            logger.info(f"Token saved to file (expires at {self._token_expires_at})")
+            logger.info(
+                f"Token saved to file (generation {self._generation}, "
+                f"expires at {self._token_expires_at})"
+            )
         
         except Exception as e:
             logger.error(f"Failed to save token to file: {e}")
     
-    def _delete_token_file(self) -> None:
-        """Delete token file"""
+    def _delete_token_file(self, only_if_mtime: Optional[int] = None) -> None:
+        """
+        Delete token file
+        
+        Args:
+            only_if_mtime: Skip if the file changed since it was read (another
+                process may have just written a fresh token)
+        """
         try:
             if self.TOKEN_FILE.exists():
-                with self.TOKEN_FILE_LOCK:
-                    self.TOKEN_FILE.unlink()
+                with self.TOKEN_FILE_LOCK, InterProcessLock(self.lock_file):
+                    if only_if_mtime is not None and self._stat_mtime() != only_if_mtime:
+                        return
+                    self.TOKEN_FILE.unlink(missing_ok=True)
+                self._file_mtime = None
                 logger.debug("Token file deleted")
         except Exception as e:
             logger.error(f"Failed to delete token file: {e}")
@@ -134,20 +232,40 @@ class TokenManager:
         Returns:
             Access token or None if invalid/expired
         """
-        # Try to load from file if not in memory
-        if not self._access_token:
-            self._load_token_from_file()
+        # Pick up tokens rotated by other processes
+        self.sync()
         
         if self._access_token and self._token_expires_at:
+            now = datetime.now()
             # Check validity with 5min buffer
-            if datetime.now() < self._token_expires_at - timedelta(minutes=5):
+            if now < self._token_expires_at - timedelta(minutes=5):
                 return self._access_token
-            else:
+            if now >= self._token_expires_at:
                 logger.info("Token expired, clearing...")
-                self.clear_token()
+                self._access_token = None
+                self._token_expires_at = None
+                # Keep the file if another process replaced it since we read it
+                self._delete_token_file(only_if_mtime=self._file_mtime)
         
         return None
     
+    def peek(self) -> Tuple[Optional[str], Optional[datetime]]:
+        """
+        Get current token and its expiry without the validity buffer
+        
+        Unlike get_token(), a token close to expiry is still returned so it
+        can be served while a replacement is fetched.
+        
+        Returns:
+            (access token, expires_at), or (None, None) if missing or expired
+        """
+        self.sync()
+        
+        if self._access_token and self._token_expires_at:
+            if datetime.now() < self._token_expires_at:
+                return self._access_token, self._token_expires_at
+        return None, None
+    
     def is_token_valid(self) -> bool:
         """
         Check if current token is valid
@@ -187,8 +305,10 @@ class TokenManager:
             'expires_at': self._token_expires_at.isoformat(),
             'remaining_seconds': remaining_seconds if is_valid else 0,
             'token_preview': f"{self._access_token[:20]}..." if self._access_token else None,
+            'generation': self._generation,
+            'reloads': self._reloads,
         }
 
 
 # Global token manager instance
-token_manager = TokenManager()
+token_manager = TokenManager(get_settings().KIWOOM_TOKEN_FILE)
@@ -4,14 +4,20 @@ FastAPI Main Application
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import get_settings
 from app.core.logging import logger
 from app.core.database import init_db
+from app.core.metrics import metrics
+from app.client.transport import get_http_transport, close_http_transport
+from app.client.token_provider import start_token_refresher, stop_token_refresher
+from app.modules.condition.membership import get_membership_store
 from app.shared.exceptions import KiwoomException
 from app.shared.exceptions.handlers import kiwoom_exception_handler, general_exception_handler
 from app.shared.middleware.logging import LoggingMiddleware
+from app.shared.responses import FastJSONResponse
 from app.api.v1.router import api_router
 
 settings = get_settings()
@@ -33,10 +39,21 @@ async def lifespan(app: FastAPI):
         logger.error(f"Database initialization failed: {e}")
         raise
     
+    # Current condition membership (entry/exit detection)
+    get_membership_store().warm()
+    
+    # Shared HTTP connection pool for Kiwoom API clients
+    get_http_transport()
+    
+    # Rotate access tokens before they expire
+    start_token_refresher()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Kiwoom Trading Platform...")
+    await stop_token_refresher()
+    await close_http_transport()
 
 
 # Create FastAPI app
@@ -47,6 +64,7 @@ app = FastAPI(
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Add CORS middleware
@@ -86,6 +104,21 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def get_metrics(format: str = "prometheus"):
+    """
+    Kiwoom API latency/size histograms and client stats
+    
+    Prometheus text format by default, `?format=json` for a JSON snapshot.
+    """
+    if format == "json":
+        return metrics.snapshot()
+    return PlainTextResponse(
+        metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     
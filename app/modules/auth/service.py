@@ -2,12 +2,12 @@
 Authentication service
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional
 
 from app.core.logging import logger
 from app.core.security import token_manager
-from app.client.rest_client import KiwoomRestClient
+from app.client.token_provider import get_token_provider
 from .schemas import TokenResponse, TokenStatus
 
 
@@ -15,7 +15,20 @@ class AuthService:
     """Authentication service"""
     
     def __init__(self):
-        self.client = KiwoomRestClient()
+        # Primary app key (also used for WebSocket login)
+        self.token_provider = get_token_provider()
+    
+    def _token_response(self, access_token: str) -> TokenResponse:
+        """Build response with the stored expiry"""
+        _, expires_at = self.token_provider.credential.tokens.peek()
+        expires_at = expires_at or datetime.now()
+        
+        return TokenResponse(
+            access_token=access_token,
+            token_type="Bearer",
+            expires_in=max(int((expires_at - datetime.now()).total_seconds()), 0),
+            expires_at=expires_at,
+        )
     
     async def get_token(self) -> TokenResponse:
         """
@@ -26,18 +39,9 @@ class AuthService:
         """
         logger.info("Getting access token...")
         
-        async with self.client:
-            access_token = await self.client.get_access_token()
-        
-        # Get token details from token manager
-        expires_at = datetime.now() + timedelta(seconds=86400)  # Default 24 hours
+        access_token = await self.token_provider.get_token()
         
-        return TokenResponse(
-            access_token=access_token,
-            token_type="Bearer",
-            expires_in=86400,
-            expires_at=expires_at,
-        )
+        return self._token_response(access_token)
     
     async def get_token_status(self) -> TokenStatus:
         """
@@ -46,30 +50,29 @@ class AuthService:
         Returns:
             TokenStatus with validity information
         """
-        is_valid = token_manager.is_token_valid()
+        access_token, expires_at = token_manager.peek()
         
-        if not is_valid:
+        if not access_token:
             return TokenStatus(is_valid=False)
         
-        # Calculate remaining time
-        # Note: This is a simplified version. In production, you'd store expires_at
         return TokenStatus(
             is_valid=True,
-            expires_at=datetime.now() + timedelta(hours=24),
-            remaining_seconds=86400,
+            expires_at=expires_at,
+            remaining_seconds=int((expires_at - datetime.now()).total_seconds()),
         )
     
     async def refresh_token(self) -> TokenResponse:
         """
         Refresh access token
         
+        The current token stays in use until the new one is stored, so
+        requests in flight during the refresh are not affected.
+        
         Returns:
             New TokenResponse
         """
         logger.info("Refreshing access token...")
         
-        # Clear old token
-        token_manager.clear_token()
+        access_token = await self.token_provider.refresh()
         
-        # Get new token
-        return await self.get_token()
+        return self._token_response(access_token)
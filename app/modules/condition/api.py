@@ -2,17 +2,21 @@
 Condition search API endpoints
 """
 
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core import codec
+from app.core.database import get_db, SessionLocal
 from app.core.logging import logger
 from .service import ConditionService
 from .schemas import (
     ConditionResponse,
     ConditionSearchRequest,
     ConditionSearchResponse,
+    ConditionMembersResponse,
 )
 
 router = APIRouter(prefix="/conditions", tags=["Condition Search"])
@@ -83,3 +87,62 @@ async def execute_condition_search(
     except Exception as e:
         logger.error(f"Condition search failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/search/stream")
+async def stream_condition_search(request: ConditionSearchRequest):
+    """
+    Execute condition search and stream results as NDJSON
+    
+    Follows continuation pages and writes one JSON object per line as each
+    page arrives: `{"type": "result", ...}` per stock, then a final
+    `{"type": "summary", ...}` (or `{"type": "error", ...}`).
+    
+    Args:
+        request: Search request with user_id and seq
+    
+    Returns:
+        application/x-ndjson stream
+    """
+    async def ndjson():
+        # Own session: the stream outlives the request-scoped get_db dependency
+        db = SessionLocal()
+        try:
+            service = ConditionService(db)
+            async for event in service.stream_condition_search(
+                user_id=request.user_id,
+                seq=request.seq
+            ):
+                yield codec.dumps_bytes(event) + b"\n"
+        finally:
+            db.close()
+    
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.get("/{seq}/members", response_model=ConditionMembersResponse)
+async def get_condition_members(
+    seq: str,
+    at: Optional[datetime] = None,
+    service: ConditionService = Depends(get_condition_service)
+):
+    """
+    Get the stocks that matched a condition at a point in time
+    
+    Args:
+        seq: Condition sequence number
+        at: Point in time, ISO 8601 (default: now)
+    
+    Returns:
+        Result of the last search at or before `at`
+    """
+    try:
+        members = service.get_members_at(seq, at)
+    except Exception as e:
+        logger.error(f"Failed to get condition members: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if members is None:
+        raise HTTPException(status_code=404, detail=f"Condition not found: {seq}")
+    
+    return members
@@ -0,0 +1,393 @@
+"""
+Delta-encoded condition result storage
+
+Instead of a full copy of every matching stock per run (search_results),
+each run stores one snapshot row plus:
+
+- keyframe runs (every CONDITION_KEYFRAME_INTERVAL runs): every member with
+  all values
+- other runs: only stocks that are new or whose price/rate/volume changed,
+  with just the changed fields
+
+Entries and exits are the membership events written by MembershipStore, and
+stock names are stored once in stock_names. ConditionRepository
+.reconstruct_results rebuilds the full result for any point in time.
+"""
+
+from datetime import datetime
+from typing import Optional, Dict, Any, AbstractSet, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.core.metrics import metrics
+from .models import ResultSnapshot, ResultDelta, MonitoringHistory
+from .repository import ConditionRepository
+
+settings = get_settings()
+
+# (current_price, change_rate, volume)
+Values = Tuple[Optional[int], Optional[float], Optional[int]]
+
+_rows_written = metrics.counter(
+    "condition_result_rows_total", "Delta-storage result rows", ("kind",)
+)
+
+
+def _values(result: Dict[str, Any]) -> Values:
+    return (result.get("current_price"), result.get("change_rate"), result.get("volume"))
+
+
+class _ConditionState:
+    """Values as reconstruction would return them after the last snapshot"""
+
+    __slots__ = ("last_snapshot_id", "runs_since_keyframe", "values")
+
+    def __init__(
+        self,
+        last_snapshot_id: Optional[int],
+        runs_since_keyframe: Optional[int],
+        values: Dict[str, Values],
+    ):
+        self.last_snapshot_id = last_snapshot_id
+        # None: no keyframe yet
+        self.runs_since_keyframe = runs_since_keyframe
+        self.values = values
+
+
+class ResultRun:
+    """
+    One search run being written (see DeltaResultStore.start_run)
+
+    Pages are added with add(); finish() closes the run. The snapshot row is
+    written with the first page, so no write transaction is open while the
+    first page is fetched, and it is marked as a keyframe only by a complete
+    finish(): pages are committed as they arrive, and a run that stops midway
+    must not leave a partial keyframe behind.
+    """
+
+    def __init__(
+        self,
+        store: "DeltaResultStore",
+        db: Session,
+        state: _ConditionState,
+        condition_id: int,
+        searched_at: datetime,
+        is_keyframe: bool,
+    ):
+        self.store = store
+        self.db = db
+        self.state = state
+        self.condition_id = condition_id
+        self.searched_at = searched_at
+        self.is_keyframe = is_keyframe
+        self.snapshot: Optional[ResultSnapshot] = None
+        # Plain copy: the snapshot instance expires on every commit
+        self.snapshot_id: Optional[int] = None
+        self._snapshot_committed = False
+        self.found: set = set()
+
+    def _open(self) -> None:
+        if self.snapshot is None:
+            self.snapshot = ResultSnapshot(
+                condition_id=self.condition_id,
+                searched_at=self.searched_at,
+                is_keyframe=False,
+            )
+            self.db.add(self.snapshot)
+            self.db.flush()
+            self.snapshot_id = self.snapshot.id
+
+    def add(
+        self,
+        results: List[dict],
+        previous_stock_codes: AbstractSet[str],
+        commit: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Store one page of results
+
+        Args:
+            results: Result data (stock_code, stock_name, current_price, ...)
+            previous_stock_codes: Current members (others are new entries)
+            commit: Commit now (False: caller commits, e.g. with finish())
+
+        Returns:
+            Rows as dictionaries (SearchResultResponse fields; id is None)
+        """
+        values = self.state.values
+        changes = []
+        names = {}
+        rows = []
+        for result in results:
+            stock_code = result["stock_code"]
+            current = _values(result)
+            previous = values.get(stock_code)
+
+            if self.is_keyframe or previous is None:
+                changes.append((stock_code, current))
+            elif current != previous:
+                # Only changed fields; a value that disappears keeps the last one
+                changed = tuple(
+                    new if new is not None and new != old else None
+                    for new, old in zip(current, previous)
+                )
+                if any(value is not None for value in changed):
+                    changes.append((stock_code, changed))
+
+            stock_name = result.get("stock_name")
+            if stock_name and self.store.stock_name(self.db, stock_code) != stock_name:
+                names[stock_code] = stock_name
+
+            rows.append({
+                "id": None,
+                "condition_id": self.condition_id,
+                "stock_code": stock_code,
+                "stock_name": stock_name or "",
+                "current_price": current[0],
+                "change_rate": current[1],
+                "volume": current[2],
+                "is_new_entry": stock_code not in previous_stock_codes,
+                "searched_at": self.searched_at,
+            })
+
+        try:
+            self._open()
+            if changes:
+                self.db.execute(
+                    ResultDelta.__table__.insert(),
+                    [self._delta(stock_code, change) for stock_code, change in changes],
+                )
+            if names:
+                ConditionRepository(self.db).save_stock_names(names)
+            if commit:
+                self.db.commit()
+                self._snapshot_committed = True
+        except Exception:
+            self.db.rollback()
+            if not self._snapshot_committed:
+                # Rolled back with this page; finish() writes it again
+                self.snapshot = self.snapshot_id = None
+            # Written state is unknown now; rebuild from the database next run
+            self.store.invalidate(self.condition_id)
+            raise
+
+        # Applied only once written, so a failed page leaves no trace
+        for stock_code, change in changes:
+            previous = values.get(stock_code)
+            if self.is_keyframe or previous is None:
+                values[stock_code] = change
+            else:
+                values[stock_code] = tuple(
+                    new if new is not None else old for new, old in zip(change, previous)
+                )
+        self.found.update(row["stock_code"] for row in rows)
+        if names:
+            self.store.remember_names(names)
+        _rows_written.inc("keyframe" if self.is_keyframe else "delta", amount=len(changes))
+        self.store.rows_skipped += len(results) - len(changes)
+        return rows
+
+    def _delta(self, stock_code: str, values: Values) -> Dict[str, Any]:
+        return {
+            "snapshot_id": self.snapshot_id,
+            "stock_code": stock_code,
+            "current_price": values[0],
+            "change_rate": values[1],
+            "volume": values[2],
+        }
+
+    def finish(
+        self,
+        complete: bool = True,
+        new_entry_count: Optional[int] = None,
+        record_history: bool = False,
+    ) -> None:
+        """
+        Close the run and commit
+
+        Args:
+            complete: False if the search failed midway; an incomplete
+                keyframe is stored as an ordinary delta run
+            new_entry_count: For the monitoring history row
+            record_history: Also write the monitoring history row
+        """
+        state = self.state
+        if not complete:
+            self.is_keyframe = False
+
+        try:
+            # A run without pages still gets its (empty) snapshot
+            self._open()
+            self.snapshot.result_count = len(self.found)
+            self.snapshot.is_keyframe = self.is_keyframe
+
+            if record_history:
+                self.db.add(MonitoringHistory(
+                    condition_id=self.condition_id,
+                    execution_time=self.searched_at,
+                    result_count=len(self.found),
+                    new_entry_count=new_entry_count or 0,
+                    status="success" if complete else "failed",
+                ))
+
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self.store.invalidate(self.condition_id)
+            raise
+
+        if complete:
+            # Exited stocks are written in full if they come back
+            for stock_code in list(state.values):
+                if stock_code not in self.found:
+                    del state.values[stock_code]
+
+        state.last_snapshot_id = self.snapshot_id
+        if self.is_keyframe:
+            state.runs_since_keyframe = 0
+            self.store.keyframes += 1
+        elif state.runs_since_keyframe is not None:
+            state.runs_since_keyframe += 1
+        self.store.runs += 1
+
+
+class DeltaResultStore:
+    """
+    Writer for delta-encoded condition results
+
+    Keeps, per condition, the values reconstruction would produce for the
+    last snapshot so unchanged stocks are skipped without reading the
+    database. If another process wrote a newer snapshot, the state is
+    rebuilt from the database first.
+
+    Example:
+        store = get_delta_store()
+        run = store.start_run(db, condition.id, searched_at)
+        rows = run.add(results_data, previous_stock_codes)
+        run.finish()
+    """
+
+    def __init__(self, keyframe_interval: Optional[int] = None):
+        self.keyframe_interval = max(keyframe_interval or settings.CONDITION_KEYFRAME_INTERVAL, 1)
+        self._states: Dict[int, _ConditionState] = {}
+        self._names: Optional[Dict[str, str]] = None
+        self.runs = 0
+        self.keyframes = 0
+        self.rows_skipped = 0
+
+    def start_run(
+        self,
+        db: Session,
+        condition_id: int,
+        searched_at: Optional[datetime] = None,
+    ) -> ResultRun:
+        """
+        Begin a run (keyframe every keyframe_interval runs)
+
+        Nothing is written until the first page is added.
+
+        Args:
+            db: Database session
+            condition_id: Condition ID
+            searched_at: Run time shared by all rows (default: now)
+        """
+        state = self._state(db, condition_id)
+        is_keyframe = (
+            state.runs_since_keyframe is None
+            or state.runs_since_keyframe + 1 >= self.keyframe_interval
+        )
+        if is_keyframe:
+            state.values = {}
+
+        return ResultRun(
+            self, db, state, condition_id, searched_at or datetime.now(), is_keyframe
+        )
+
+    def save_run(
+        self,
+        db: Session,
+        condition_id: int,
+        results: List[dict],
+        previous_stock_codes: AbstractSet[str],
+        searched_at: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Store a complete run with its monitoring history in one transaction
+
+        Returns:
+            Rows as dictionaries (SearchResultResponse fields; id is None)
+        """
+        run = self.start_run(db, condition_id, searched_at)
+        rows = run.add(results, previous_stock_codes, commit=False)
+        run.finish(
+            new_entry_count=sum(1 for row in rows if row["is_new_entry"]),
+            record_history=True,
+        )
+        return rows
+
+    def _state(self, db: Session, condition_id: int) -> _ConditionState:
+        repository = ConditionRepository(db)
+        latest = repository.get_latest_snapshot(condition_id)
+        latest_id = latest.id if latest is not None else None
+
+        state = self._states.get(condition_id)
+        if state is not None and state.last_snapshot_id == latest_id:
+            return state
+
+        # First run in this process, or another process wrote since
+        state = _ConditionState(latest_id, None, {})
+        keyframe = repository.get_latest_snapshot(condition_id, keyframe_only=True)
+        if latest is not None and keyframe is not None:
+            state.runs_since_keyframe = repository.count_snapshots_after(keyframe)
+            _, rows = repository.reconstruct_results(condition_id, latest.searched_at)
+            state.values = {row["stock_code"]: _values(row) for row in rows}
+            logger.debug(
+                f"Delta result state rebuilt for condition {condition_id} "
+                f"({len(state.values)} stocks)"
+            )
+        self._states[condition_id] = state
+        return state
+
+    def invalidate(self, condition_id: int) -> None:
+        """Drop cached state (rebuilt from the database on the next run)"""
+        self._states.pop(condition_id, None)
+
+    def stock_name(self, db: Session, stock_code: str) -> Optional[str]:
+        """Stored name of a stock"""
+        if self._names is None:
+            self._names = ConditionRepository(db).get_stock_names()
+        return self._names.get(stock_code)
+
+    def remember_names(self, names: Dict[str, str]) -> None:
+        """Record names committed to stock_names"""
+        if self._names is not None:
+            self._names.update(names)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics
+
+        Returns:
+            Dictionary with run/keyframe counts and skipped (unchanged) rows
+        """
+        return {
+            "conditions": len(self._states),
+            "runs": self.runs,
+            "keyframes": self.keyframes,
+            "rows_skipped": self.rows_skipped,
+            "keyframe_interval": self.keyframe_interval,
+        }
+
+
+_store_instance: Optional[DeltaResultStore] = None
+
+
+def get_delta_store() -> DeltaResultStore:
+    """Process-wide delta result store singleton"""
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = DeltaResultStore()
+        metrics.register_collector("condition_result_storage", _store_instance.get_stats)
+    return _store_instance
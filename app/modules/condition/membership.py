@@ -0,0 +1,333 @@
+"""
+In-memory condition membership
+
+Keeps the current set of stock codes per condition so each search run finds
+entries and exits with set differences over its own result, instead of
+loading the last hour of stored results. Only the changes are persisted
+(condition_membership_events); the store catches up on events written by
+other processes (API server and scheduler) before every diff. Every
+BASELINE_INTERVAL events a condition's members are checkpointed
+(condition_membership_baselines), so startup loads the baselines and replays
+only the events after them instead of the whole history.
+
+Search runs replace a condition's membership with their result (update());
+realtime pushes add or remove single codes (apply()). Listeners see every
+change made in this process, labelled with its source.
+"""
+
+from datetime import datetime
+from typing import Optional, Dict, Any, Callable, FrozenSet, Iterable, List
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.logging import logger
+from app.core.metrics import metrics
+from .repository import ConditionRepository
+
+EVENT_ENTRY = "I"
+EVENT_EXIT = "D"
+
+# Events applied to a condition before its baseline is rewritten
+BASELINE_INTERVAL = 500
+
+_changes = metrics.counter(
+    "condition_membership_changes_total", "Condition entries and exits", ("event",)
+)
+
+# listener(condition_id, diff, source)
+MembershipListener = Callable[[int, "MembershipDiff", str], None]
+
+
+class MembershipDiff:
+    """Result of applying one search result to a condition's membership"""
+
+    __slots__ = ("previous", "current", "entered", "exited")
+
+    def __init__(
+        self,
+        previous: FrozenSet[str],
+        current: FrozenSet[str],
+        entered: FrozenSet[str],
+        exited: FrozenSet[str],
+    ):
+        self.previous = previous
+        self.current = current
+        self.entered = entered
+        self.exited = exited
+
+
+class MembershipStore:
+    """
+    Condition ID -> current member stock codes
+
+    Membership sets are immutable snapshots, so callers may keep the set
+    returned by get() while the store moves on.
+
+    Example:
+        store = get_membership_store()
+        previous = store.get(db, condition.id)
+        ...
+        diff = store.update(db, condition.id, codes)
+    """
+
+    def __init__(self):
+        self._members: Dict[int, FrozenSet[str]] = {}
+        # Highest event ID applied per condition
+        self._last_event_id: Dict[int, int] = {}
+        # Events applied per condition since its stored baseline
+        self._since_baseline: Dict[int, int] = {}
+        self._listeners: List[MembershipListener] = []
+        self._warmed = False
+        self._entries = 0
+        self._exits = 0
+
+    def add_listener(self, listener: MembershipListener) -> None:
+        """
+        Register callback for membership changes
+
+        Args:
+            listener: Called as listener(condition_id, diff, source) after the
+                changes are persisted; only for changes made in this process
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: MembershipListener) -> None:
+        """Unregister a callback added with add_listener()"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def warm(self, db: Optional[Session] = None) -> None:
+        """Rebuild membership of every condition from its baseline and later events"""
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            repository = ConditionRepository(db)
+            members: Dict[int, set] = {}
+            last_event_id: Dict[int, int] = {}
+            for baseline in repository.get_membership_baselines():
+                members[baseline.condition_id] = set(filter(None, baseline.stock_codes.split(",")))
+                last_event_id[baseline.condition_id] = baseline.last_event_id
+
+            events = repository.get_membership_events_after_baselines()
+            since_baseline: Dict[int, int] = {}
+            for event in events:
+                codes = members.setdefault(event.condition_id, set())
+                if event.event == EVENT_ENTRY:
+                    codes.add(event.stock_code)
+                else:
+                    codes.discard(event.stock_code)
+                last_event_id[event.condition_id] = event.id
+                since_baseline[event.condition_id] = since_baseline.get(event.condition_id, 0) + 1
+
+            self._members = {
+                condition_id: frozenset(codes) for condition_id, codes in members.items()
+            }
+            self._last_event_id = last_event_id
+            self._since_baseline = since_baseline
+            self._warmed = True
+            logger.info(
+                f"Condition membership loaded ({len(self._members)} conditions, "
+                f"{len(events)} events after baselines)"
+            )
+
+            # Checkpoint long replays (e.g. history stored before baselines existed)
+            for condition_id, count in since_baseline.items():
+                if count >= BASELINE_INTERVAL:
+                    self._save_baseline(db, condition_id)
+        finally:
+            if own_session:
+                db.close()
+
+    def get(self, db: Session, condition_id: int) -> FrozenSet[str]:
+        """
+        Current member stock codes of a condition
+
+        Args:
+            db: Session used to catch up on events from other processes
+            condition_id: Condition ID
+
+        Returns:
+            Immutable set of stock codes
+        """
+        if not self._warmed:
+            self.warm(db)
+        self._catch_up(db, condition_id)
+        return self._members.get(condition_id, frozenset())
+
+    def peek(self, condition_id: int) -> FrozenSet[str]:
+        """Membership as last seen by this process (no database catch-up)"""
+        return self._members.get(condition_id, frozenset())
+
+    def update(
+        self,
+        db: Session,
+        condition_id: int,
+        stock_codes: Iterable[str],
+        complete: bool = True,
+        occurred_at: Optional[datetime] = None,
+        source: str = "search",
+    ) -> MembershipDiff:
+        """
+        Apply a search result and persist the changes
+
+        Args:
+            db: Database session
+            condition_id: Condition ID
+            stock_codes: Stock codes found by the search
+            complete: False for a partial result (e.g. a stream that failed
+                midway): entries are applied, exits are not
+            occurred_at: Event time (default: now)
+            source: Change label passed to listeners
+
+        Returns:
+            Previous/current membership with entered and exited codes
+        """
+        previous = self.get(db, condition_id)
+        found = frozenset(stock_codes)
+        entered = found - previous
+        exited = previous - found if complete else frozenset()
+        return self._commit(db, condition_id, previous, entered, exited, occurred_at, source)
+
+    def apply(
+        self,
+        db: Session,
+        condition_id: int,
+        entered: Iterable[str] = (),
+        exited: Iterable[str] = (),
+        occurred_at: Optional[datetime] = None,
+        source: str = "push",
+    ) -> MembershipDiff:
+        """
+        Apply individual entries/exits (e.g. realtime pushes) and persist them
+
+        Codes already in (entered) or absent from (exited) the membership are
+        ignored, so a repeated push is a no-op.
+
+        Args:
+            db: Database session
+            condition_id: Condition ID
+            entered: Stock codes that joined the condition
+            exited: Stock codes that left the condition
+            occurred_at: Event time (default: now)
+            source: Change label passed to listeners
+
+        Returns:
+            Previous/current membership with the codes actually changed
+        """
+        previous = self.get(db, condition_id)
+        entered = frozenset(entered) - previous
+        exited = frozenset(exited) & previous
+        return self._commit(db, condition_id, previous, entered, exited, occurred_at, source)
+
+    def _commit(
+        self,
+        db: Session,
+        condition_id: int,
+        previous: FrozenSet[str],
+        entered: FrozenSet[str],
+        exited: FrozenSet[str],
+        occurred_at: Optional[datetime],
+        source: str,
+    ) -> MembershipDiff:
+        if entered or exited:
+            ConditionRepository(db).save_membership_events(
+                condition_id, entered, exited, occurred_at
+            )
+            # Our own events are re-read (as no-ops) by the next catch-up;
+            # skipping past them could skip events other processes wrote
+            self._entries += len(entered)
+            self._exits += len(exited)
+            _changes.inc(EVENT_ENTRY, amount=len(entered))
+            _changes.inc(EVENT_EXIT, amount=len(exited))
+
+        current = (previous | entered) - exited
+        self._members[condition_id] = current
+        diff = MembershipDiff(previous, current, entered, exited)
+
+        if entered or exited:
+            for listener in self._listeners:
+                try:
+                    listener(condition_id, diff, source)
+                except Exception as e:
+                    logger.error(f"Membership listener failed: {e}")
+        return diff
+
+    def _catch_up(self, db: Session, condition_id: int) -> None:
+        # Indexed (condition_id, id) range scan; normally returns only our own last delta
+        after_id = self._last_event_id.get(condition_id, 0)
+        events = ConditionRepository(db).get_membership_events(condition_id, after_id)
+        if not events:
+            if condition_id not in self._members:
+                self._bootstrap(db, condition_id)
+            return
+
+        codes = set(self._members.get(condition_id, ()))
+        for event in events:
+            if event.event == EVENT_ENTRY:
+                codes.add(event.stock_code)
+            else:
+                codes.discard(event.stock_code)
+        self._members[condition_id] = frozenset(codes)
+        self._last_event_id[condition_id] = events[-1].id
+
+        count = self._since_baseline.get(condition_id, 0) + len(events)
+        self._since_baseline[condition_id] = count
+        if count >= BASELINE_INTERVAL:
+            self._save_baseline(db, condition_id)
+
+    def _save_baseline(self, db: Session, condition_id: int) -> None:
+        # Members are exactly the result of the events up to _last_event_id
+        # right after a catch-up/replay, never after our own unread writes
+        try:
+            ConditionRepository(db).save_membership_baseline(
+                condition_id,
+                self._members.get(condition_id, ()),
+                self._last_event_id[condition_id],
+            )
+            self._since_baseline[condition_id] = 0
+        except Exception as e:
+            # Another process may have created the row concurrently; retried
+            # after the next catch-up
+            db.rollback()
+            logger.warning(f"Condition {condition_id} membership baseline not saved: {e}")
+
+    def _bootstrap(self, db: Session, condition_id: int) -> None:
+        # No events yet (new condition or data stored before events existed):
+        # the latest stored result becomes the baseline
+        repository = ConditionRepository(db)
+        codes, searched_at = repository.get_latest_result_codes(condition_id)
+        self._members[condition_id] = frozenset(codes)
+        if codes:
+            repository.save_membership_events(condition_id, codes, (), searched_at)
+            logger.info(
+                f"Condition {condition_id} membership seeded from stored results "
+                f"({len(codes)} stocks)"
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics
+
+        Returns:
+            Dictionary with condition/member counts and change totals
+        """
+        return {
+            "conditions": len(self._members),
+            "members": sum(len(codes) for codes in self._members.values()),
+            "entries": self._entries,
+            "exits": self._exits,
+        }
+
+
+_store_instance: Optional[MembershipStore] = None
+
+
+def get_membership_store() -> MembershipStore:
+    """Process-wide membership store singleton"""
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = MembershipStore()
+        metrics.register_collector("condition_membership", _store_instance.get_stats)
+    return _store_instance
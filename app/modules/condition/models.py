@@ -3,7 +3,7 @@ Condition search models
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -25,12 +25,19 @@ class Condition(Base):
     # Relationships
     results = relationship("SearchResult", back_populates="condition")
     monitoring_history = relationship("MonitoringHistory", back_populates="condition")
+    membership_events = relationship("MembershipEvent", back_populates="condition")
+    membership_baseline = relationship("MembershipBaseline", back_populates="condition", uselist=False)
+    result_snapshots = relationship("ResultSnapshot", back_populates="condition")
 
 
 class SearchResult(Base):
     """Search result model"""
     
     __tablename__ = "search_results"
+    __table_args__ = (
+        # Point-in-time lookups: last run of a condition at or before a time
+        Index("ix_search_results_condition_id_searched_at", "condition_id", "searched_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     condition_id = Column(Integer, ForeignKey("conditions.id"), nullable=False)
@@ -50,6 +57,9 @@ class MonitoringHistory(Base):
     """Monitoring history model"""
     
     __tablename__ = "monitoring_history"
+    __table_args__ = (
+        Index("ix_monitoring_history_condition_id_execution_time", "condition_id", "execution_time"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     condition_id = Column(Integer, ForeignKey("conditions.id"), nullable=False)
@@ -61,3 +71,92 @@ class MonitoringHistory(Base):
     
     # Relationships
     condition = relationship("Condition", back_populates="monitoring_history")
+
+
+class MembershipEvent(Base):
+    """Condition membership change (stock entered or left the result set)"""
+    
+    __tablename__ = "condition_membership_events"
+    __table_args__ = (
+        Index("ix_membership_events_condition_id_id", "condition_id", "id"),
+        Index("ix_membership_events_condition_id_occurred_at", "condition_id", "occurred_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    condition_id = Column(Integer, ForeignKey("conditions.id"), nullable=False)
+    stock_code = Column(String(6), nullable=False)
+    event = Column(String(1), nullable=False)  # I: entry, D: exit
+    occurred_at = Column(DateTime, default=datetime.now, nullable=False)
+    
+    # Relationships
+    condition = relationship("Condition", back_populates="membership_events")
+
+
+class MembershipBaseline(Base):
+    """
+    Condition membership checkpoint
+    
+    Members after applying every event of the condition up to last_event_id;
+    startup replays only the events after it.
+    """
+    
+    __tablename__ = "condition_membership_baselines"
+    
+    condition_id = Column(Integer, ForeignKey("conditions.id"), primary_key=True)
+    stock_codes = Column(Text, nullable=False, default="")  # comma-separated
+    last_event_id = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    
+    # Relationships
+    condition = relationship("Condition", back_populates="membership_baseline")
+
+
+class StockName(Base):
+    """Stock name, stored once per code (delta-encoded results)"""
+    
+    __tablename__ = "stock_names"
+    
+    stock_code = Column(String(6), primary_key=True)
+    stock_name = Column(String(100), nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
+class ResultSnapshot(Base):
+    """One search run in delta-encoded result storage"""
+    
+    __tablename__ = "condition_result_snapshots"
+    __table_args__ = (
+        Index("ix_result_snapshots_condition_id_searched_at", "condition_id", "searched_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    condition_id = Column(Integer, ForeignKey("conditions.id"), nullable=False)
+    searched_at = Column(DateTime, default=datetime.now, nullable=False)
+    is_keyframe = Column(Boolean, default=False, nullable=False)
+    result_count = Column(Integer, default=0)
+    
+    # Relationships
+    condition = relationship("Condition", back_populates="result_snapshots")
+    deltas = relationship("ResultDelta", back_populates="snapshot")
+
+
+class ResultDelta(Base):
+    """
+    Stock values of a snapshot
+    
+    Keyframes hold every member with all values. Other snapshots hold only
+    new stocks (all values) and stocks whose values changed (changed fields
+    set, unchanged ones NULL).
+    """
+    
+    __tablename__ = "condition_result_deltas"
+    
+    id = Column(Integer, primary_key=True)
+    snapshot_id = Column(Integer, ForeignKey("condition_result_snapshots.id"), nullable=False, index=True)
+    stock_code = Column(String(6), nullable=False)
+    current_price = Column(Integer)
+    change_rate = Column(Float)
+    volume = Column(Integer)
+    
+    # Relationships
+    snapshot = relationship("ResultSnapshot", back_populates="deltas")
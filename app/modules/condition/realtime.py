@@ -0,0 +1,374 @@
+"""
+Realtime condition search engine
+
+Registers active conditions in Kiwoom realtime mode (CNSRREQ search_type "1")
+and applies insert/delete pushes (REAL type "02") to the shared condition
+membership (MembershipStore), so every push is persisted as an entry/exit
+event when it arrives. New entries are notified as soon as the push arrives;
+REST polling only reconciles what may have been missed.
+"""
+
+import asyncio
+import time
+from typing import Optional, Dict, Any, Callable, Iterable, List, Set
+
+from app.core.database import SessionLocal
+from app.core.logging import logger
+from app.core.metrics import metrics
+from app.client.websocket_client import KiwoomWebSocketClient, get_websocket_client
+from app.client.fid import parse_code, decode_condition_push, decode_condition_row
+from app.modules.notifications.service import NotificationService
+from .repository import ConditionRepository
+from .schemas import ConditionCreate
+from .membership import MembershipDiff, MembershipStore, get_membership_store
+
+# Kiwoom realtime condition push (FIDs 841/9001/843, see app.client.fid)
+REAL_TYPE_CONDITION = "02"
+EVENT_INSERT = "I"
+EVENT_DELETE = "D"
+
+# Membership change sources the engine announces (other searches, such as
+# polling while pushes are down, notify on their own)
+ANNOUNCED_SOURCES = ("push", "resubscribe", "reconcile")
+
+_events = metrics.counter(
+    "condition_events_total", "Condition membership changes", ("event", "source")
+)
+_event_time = metrics.histogram(
+    "condition_event_seconds", "Realtime condition push handling time"
+)
+
+# listener(seq, stock_code, event, source)
+ChangeListener = Callable[[str, str, str, str], Any]
+
+
+class RealtimeConditionEngine:
+    """
+    Keeps condition membership current from realtime pushes
+
+    Membership lives in the shared MembershipStore. Each change (push,
+    resubscribe snapshot after a reconnect, or REST reconciliation through
+    ConditionService with source "reconcile") is applied once: notifications
+    go out only for codes not already members.
+    """
+
+    def __init__(
+        self,
+        ws_client: Optional[KiwoomWebSocketClient] = None,
+        notification_service: Optional[NotificationService] = None,
+        membership: Optional[MembershipStore] = None,
+    ):
+        self.ws_client = ws_client or get_websocket_client()
+        self.notification_service = notification_service or NotificationService()
+        self.membership = membership or get_membership_store()
+
+        self._names: Dict[str, str] = {}
+        # seq <-> condition ID of registered conditions
+        self._condition_ids: Dict[str, int] = {}
+        self._seqs: Dict[int, str] = {}
+        # Conditions whose initial snapshot has been applied
+        self._registered: Set[str] = set()
+        self._stock_names: Dict[str, str] = {}
+        self._listeners: List[ChangeListener] = []
+        self._notify_tasks: Set[asyncio.Task] = set()
+        self._running = False
+        self._last_push_at: Optional[float] = None
+        self._last_reconcile_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether conditions are registered in realtime mode"""
+        return self._running
+
+    def is_live(self) -> bool:
+        """Whether pushes are currently being received"""
+        return self._running and self.ws_client.connected
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        """
+        Subscribe to membership changes
+
+        Args:
+            listener: Called as listener(seq, stock_code, event, source);
+                may be sync or async
+        """
+        self._listeners.append(listener)
+
+    def get_members(self, seq: str) -> Set[str]:
+        """Current stock codes of a condition"""
+        condition_id = self._condition_ids.get(str(seq).strip())
+        if condition_id is None:
+            return set()
+        db = SessionLocal()
+        try:
+            return set(self.membership.get(db, condition_id))
+        finally:
+            db.close()
+
+    async def start(self, conditions: Optional[Iterable[Any]] = None) -> None:
+        """
+        Register conditions in realtime mode
+
+        Args:
+            conditions: Objects with seq/name (default: active conditions in DB)
+        """
+        if conditions is None:
+            db = SessionLocal()
+            try:
+                conditions = ConditionRepository(db).get_all_conditions(active_only=True)
+            finally:
+                db.close()
+
+        self.ws_client.register_realtime_handler(REAL_TYPE_CONDITION, self._on_push)
+        # Unsolicited CNSRREQ responses are resubscribe snapshots after a reconnect
+        self.ws_client.register_handler("CNSRREQ", self._on_snapshot)
+        self.membership.add_listener(self._on_membership_change)
+        self.ws_client.start()
+        self._running = True
+
+        for condition in conditions:
+            try:
+                await self.subscribe(condition.seq, condition.name)
+            except Exception as e:
+                logger.error(f"Realtime registration failed for condition {condition.seq}: {e}")
+
+        logger.info(f"Realtime condition engine started ({len(self._registered)} conditions)")
+
+    async def stop(self) -> None:
+        """Unregister all conditions and wait for pending notifications"""
+        self._running = False
+        for seq in list(self._names):
+            await self.unsubscribe(seq)
+        self.membership.remove_listener(self._on_membership_change)
+        if self._notify_tasks:
+            await asyncio.gather(*self._notify_tasks, return_exceptions=True)
+        logger.info("Realtime condition engine stopped")
+
+    async def subscribe(self, seq: str, name: Optional[str] = None) -> Set[str]:
+        """
+        Register one condition in realtime mode
+
+        The initial result becomes the membership baseline: changes since the
+        last stored membership are persisted but not notified.
+
+        Args:
+            seq: Condition sequence number
+            name: Condition name for notifications
+
+        Returns:
+            Initial member stock codes
+        """
+        seq = str(seq).strip()
+        self._names[seq] = name or self._names.get(seq) or f"Condition {seq}"
+        self._resolve_condition(seq)
+        message = {"trnm": "CNSRREQ", "seq": seq, "search_type": "1", "stex_tp": "K"}
+
+        # Stored only after this registration is sent: a connect() made by
+        # search_condition itself would otherwise replay it and register twice.
+        # On failure it is still stored so the next reconnect retries it.
+        try:
+            response = await self.ws_client.search_condition(seq=seq, search_type="1")
+        finally:
+            self.ws_client.add_subscription(f"condition:{seq}", message)
+        members = self._codes_from_rows(response.get("data") or [])
+        self._update(seq, members, "subscribe")
+        self._registered.add(seq)
+        logger.info(f"Condition {seq} registered in realtime mode ({len(members)} members)")
+        return set(members)
+
+    async def unsubscribe(self, seq: str) -> None:
+        """Stop realtime pushes for a condition"""
+        seq = str(seq).strip()
+        self.ws_client.remove_subscription(f"condition:{seq}")
+        self._registered.discard(seq)
+        self._names.pop(seq, None)
+        condition_id = self._condition_ids.pop(seq, None)
+        self._seqs.pop(condition_id, None)
+        try:
+            await self.ws_client.send_message({"trnm": "CNSRCLR", "seq": seq})
+        except Exception as e:
+            logger.warning(f"Failed to clear realtime condition {seq}: {e}")
+
+    def reconcile(self, seq: str, stock_codes: Iterable[str], source: str = "reconcile") -> Dict[str, Set[str]]:
+        """
+        Align membership with a full result set
+
+        Used for resubscribe snapshots; entries that pushes missed are
+        applied (and notified) now. REST reconciliation already updated the
+        shared membership in ConditionService, so there this only records
+        the reconciliation time.
+
+        Args:
+            seq: Condition sequence number
+            stock_codes: Complete current result
+            source: Metric/listener label
+
+        Returns:
+            {"inserted": codes, "deleted": codes}
+        """
+        seq = str(seq).strip()
+        diff = self._update(seq, {parse_code(code) for code in stock_codes}, source)
+        if source == "reconcile":
+            self._last_reconcile_at = time.monotonic()
+        if diff.entered or diff.exited:
+            logger.info(
+                f"Condition {seq} reconciled ({source}): "
+                f"+{len(diff.entered)} -{len(diff.exited)}"
+            )
+        return {"inserted": set(diff.entered), "deleted": set(diff.exited)}
+
+    def remember_stock_names(self, names: Dict[str, str]) -> None:
+        """Cache stock names for notifications (pushes carry codes only)"""
+        self._stock_names.update(names)
+
+    async def _on_push(self, item: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        push = decode_condition_push(item.get("values") or {})
+        seq = push.condition_seq
+        code = push.stock_code or parse_code(item.get("item"))
+        event = push.event
+        if not seq or not code or event not in (EVENT_INSERT, EVENT_DELETE):
+            logger.warning(f"Ignoring malformed condition push: {item}")
+            return
+        self._last_push_at = time.monotonic()
+        condition_id = self._resolve_condition(seq)
+        db = SessionLocal()
+        try:
+            if event == EVENT_INSERT:
+                self.membership.apply(db, condition_id, entered=(code,), source="push")
+            else:
+                self.membership.apply(db, condition_id, exited=(code,), source="push")
+        finally:
+            db.close()
+        _event_time.observe(time.perf_counter() - started)
+
+    async def _on_snapshot(self, response: Dict[str, Any]) -> None:
+        seq = str(response.get("seq", "")).strip()
+        if seq not in self._names or response.get("return_code") != 0:
+            return
+        codes = self._codes_from_rows(response.get("data") or [])
+        if seq not in self._registered:
+            # Initial registration failed; this snapshot is the baseline
+            self._update(seq, codes, "subscribe")
+            self._registered.add(seq)
+            return
+        self.reconcile(seq, codes, source="resubscribe")
+
+    def _update(self, seq: str, stock_codes: Set[str], source: str) -> MembershipDiff:
+        condition_id = self._resolve_condition(seq)
+        db = SessionLocal()
+        try:
+            return self.membership.update(db, condition_id, stock_codes, source=source)
+        finally:
+            db.close()
+
+    def _resolve_condition(self, seq: str) -> int:
+        # Condition ID keys the shared membership; unknown seqs get a placeholder row
+        condition_id = self._condition_ids.get(seq)
+        if condition_id is not None:
+            return condition_id
+        db = SessionLocal()
+        try:
+            repository = ConditionRepository(db)
+            condition = repository.get_condition_by_seq(seq)
+            if condition is None:
+                condition = repository.create_condition(
+                    ConditionCreate(seq=seq, name=self._names.get(seq) or f"Condition {seq}")
+                )
+            condition_id = condition.id
+        finally:
+            db.close()
+        self._condition_ids[seq] = condition_id
+        self._seqs[condition_id] = seq
+        return condition_id
+
+    def _on_membership_change(self, condition_id: int, diff: MembershipDiff, source: str) -> None:
+        seq = self._seqs.get(condition_id)
+        if seq is None or source not in ANNOUNCED_SOURCES:
+            return
+        for code in diff.entered:
+            self._announce(seq, code, EVENT_INSERT, source)
+        for code in diff.exited:
+            self._announce(seq, code, EVENT_DELETE, source)
+
+    def _announce(self, seq: str, code: str, event: str, source: str) -> None:
+        if event == EVENT_INSERT:
+            self._schedule_notification(seq, code)
+        _events.inc(event, source)
+        for listener in self._listeners:
+            try:
+                result = listener(seq, code, event, source)
+                if asyncio.iscoroutine(result):
+                    self._track(asyncio.ensure_future(result))
+            except Exception as e:
+                logger.error(f"Condition listener failed: {e}")
+
+    def _schedule_notification(self, seq: str, code: str) -> None:
+        # Notify in the background so the receive loop is never held up
+        self._track(asyncio.ensure_future(self._notify_entry(seq, code)))
+
+    async def _notify_entry(self, seq: str, code: str) -> None:
+        # Name looked up when the task runs: REST reconciliation remembers
+        # names right after the search that announced the entry
+        await self.notification_service.send_new_entry_alert(
+            condition_name=self._names.get(seq, f"Condition {seq}"),
+            stock_code=code,
+            stock_name=self._stock_names.get(code, code),
+        )
+
+    def _track(self, task: asyncio.Task) -> None:
+        self._notify_tasks.add(task)
+        task.add_done_callback(self._notify_tasks.discard)
+
+    def _codes_from_rows(self, rows: Iterable[Dict[str, Any]]) -> Set[str]:
+        codes = set()
+        for row in rows:
+            record = decode_condition_row(row)
+            code = parse_code(row.get("jmcode")) or record.stock_code
+            if code:
+                codes.add(code)
+                if record.stock_name:
+                    self._stock_names[code] = record.stock_name
+        return codes
+
+    def seconds_since_reconcile(self) -> Optional[float]:
+        """Seconds since the last REST reconciliation (None if never)"""
+        if self._last_reconcile_at is None:
+            return None
+        return time.monotonic() - self._last_reconcile_at
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get engine statistics
+
+        Returns:
+            Dictionary with state, member counts and push recency
+        """
+        now = time.monotonic()
+        return {
+            "running": self._running,
+            "live": self.is_live(),
+            "conditions": {
+                seq: len(self.membership.peek(condition_id))
+                for seq, condition_id in self._condition_ids.items()
+            },
+            "seconds_since_push": (
+                round(now - self._last_push_at, 3) if self._last_push_at else None
+            ),
+            "seconds_since_reconcile": (
+                round(now - self._last_reconcile_at, 3) if self._last_reconcile_at else None
+            ),
+            "pending_notifications": len(self._notify_tasks),
+        }
+
+
+_engine_instance: Optional[RealtimeConditionEngine] = None
+
+
+def get_realtime_engine() -> RealtimeConditionEngine:
+    """Realtime condition engine singleton"""
+    global _engine_instance
+    if _engine_instance is None:
+        _engine_instance = RealtimeConditionEngine()
+        metrics.register_collector("realtime_conditions", _engine_instance.get_stats)
+    return _engine_instance
@@ -2,13 +2,22 @@
 Condition search repository
 """
 
-from typing import List, Optional
+from typing import List, Optional, Iterable, Tuple, AbstractSet, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 
 from app.core.logging import logger
-from .models import Condition, SearchResult, MonitoringHistory
+from .models import (
+    Condition,
+    SearchResult,
+    MonitoringHistory,
+    MembershipEvent,
+    MembershipBaseline,
+    StockName,
+    ResultSnapshot,
+    ResultDelta,
+)
 from .schemas import ConditionCreate
 
 
@@ -44,54 +53,388 @@ class ConditionRepository:
         self.db.refresh(condition)
         return condition
     
-    def get_previous_results(
+    def get_latest_result_codes(
+        self,
+        condition_id: int
+    ) -> Tuple[List[str], Optional[datetime]]:
+        """Stock codes of the most recent stored search and its time"""
+        searched_at, results = self._get_run_results(condition_id)
+        return sorted({result.stock_code for result in results}), searched_at
+    
+    def _get_run_results(
         self,
         condition_id: int,
-        since: Optional[datetime] = None
-    ) -> List[SearchResult]:
-        """Get previous search results"""
-        query = self.db.query(SearchResult).filter(
+        at: Optional[datetime] = None
+    ) -> Tuple[Optional[datetime], List[SearchResult]]:
+        """search_results rows of the last run at or before `at` (default: latest run)"""
+        latest_query = self.db.query(func.max(SearchResult.searched_at)).filter(
             SearchResult.condition_id == condition_id
         )
+        if at is not None:
+            latest_query = latest_query.filter(SearchResult.searched_at <= at)
+        latest = latest_query.scalar()
+        if latest is None:
+            return None, []
         
-        if since:
-            query = query.filter(SearchResult.searched_at >= since)
+        # Batched runs share one searched_at, but older rows of one run carry
+        # slightly different timestamps; a run starts after the previous
+        # run's history row
+        previous_run = self.db.query(func.max(MonitoringHistory.execution_time)).filter(
+            MonitoringHistory.condition_id == condition_id,
+            MonitoringHistory.execution_time < latest
+        ).scalar()
         
-        return query.all()
+        query = self.db.query(SearchResult).filter(
+            SearchResult.condition_id == condition_id,
+            SearchResult.searched_at <= latest
+        )
+        if previous_run is not None:
+            query = query.filter(SearchResult.searched_at > previous_run)
+        
+        return latest, query.order_by(SearchResult.id).all()
     
-    def save_search_results(
+    def get_members_at(
         self,
         condition_id: int,
-        results: List[dict],
-        previous_stock_codes: set
-    ) -> List[SearchResult]:
-        """Save search results"""
-        saved_results = []
-        
-        for result_data in results:
-            stock_code = result_data["stock_code"]
-            is_new_entry = stock_code not in previous_stock_codes
-            
-            result = SearchResult(
+        at: datetime
+    ) -> Tuple[Optional[datetime], List[Dict[str, Any]]]:
+        """
+        Stocks that matched a condition at a point in time
+        
+        Uses the last run at or before `at` from whichever storage holds
+        the later one (search_results, or delta snapshots rebuilt from the
+        last keyframe). Both are found with (condition_id, searched_at)
+        index seeks, not table scans.
+        
+        Args:
+            condition_id: Condition ID
+            at: Point in time
+        
+        Returns:
+            (time of that run or None if there is none, rows as dictionaries
+            with SearchResultResponse fields)
+        """
+        searched_at, results = self._get_run_results(condition_id, at)
+        
+        snapshot = self.get_latest_snapshot(condition_id, at)
+        if snapshot is not None and (searched_at is None or snapshot.searched_at > searched_at):
+            reconstructed = self.reconstruct_results(condition_id, at)
+            if reconstructed is not None:
+                searched_at, rows = reconstructed
+                return searched_at, [{"id": None, **row} for row in rows]
+        
+        # A run may list a stock twice (e.g. on two pages); keep the last row
+        rows = {}
+        for result in results:
+            rows[result.stock_code] = {
+                "id": result.id,
+                "condition_id": result.condition_id,
+                "stock_code": result.stock_code,
+                "stock_name": result.stock_name,
+                "current_price": result.current_price,
+                "change_rate": result.change_rate,
+                "volume": result.volume,
+                "is_new_entry": result.is_new_entry,
+                "searched_at": result.searched_at,
+            }
+        return searched_at, [rows[stock_code] for stock_code in sorted(rows)]
+    
+    def get_membership_events(
+        self,
+        condition_id: int,
+        after_id: int = 0
+    ) -> List[Any]:
+        """(id, condition_id, stock_code, event) rows of a condition newer than after_id"""
+        return self.db.query(
+            MembershipEvent.id,
+            MembershipEvent.condition_id,
+            MembershipEvent.stock_code,
+            MembershipEvent.event
+        ).filter(
+            MembershipEvent.condition_id == condition_id,
+            MembershipEvent.id > after_id
+        ).order_by(MembershipEvent.id).all()
+    
+    def get_membership_baselines(self) -> List[Any]:
+        """(condition_id, stock_codes, last_event_id) rows of every condition"""
+        return self.db.query(
+            MembershipBaseline.condition_id,
+            MembershipBaseline.stock_codes,
+            MembershipBaseline.last_event_id
+        ).all()
+    
+    def get_membership_events_after_baselines(self) -> List[Any]:
+        """
+        (id, condition_id, stock_code, event) rows not covered by a baseline
+        
+        Events of conditions without a baseline are all returned.
+        """
+        return self.db.query(
+            MembershipEvent.id,
+            MembershipEvent.condition_id,
+            MembershipEvent.stock_code,
+            MembershipEvent.event
+        ).outerjoin(
+            MembershipBaseline,
+            MembershipBaseline.condition_id == MembershipEvent.condition_id
+        ).filter(
+            MembershipEvent.id > func.coalesce(MembershipBaseline.last_event_id, 0)
+        ).order_by(MembershipEvent.id).all()
+    
+    def save_membership_baseline(
+        self,
+        condition_id: int,
+        stock_codes: Iterable[str],
+        last_event_id: int
+    ) -> None:
+        """Store a condition's members as of last_event_id (never moves backwards)"""
+        baseline = self.db.get(MembershipBaseline, condition_id)
+        if baseline is None:
+            baseline = MembershipBaseline(condition_id=condition_id)
+            self.db.add(baseline)
+        elif baseline.last_event_id >= last_event_id:
+            return
+        
+        baseline.stock_codes = ",".join(sorted(stock_codes))
+        baseline.last_event_id = last_event_id
+        self.db.commit()
+    
+    def save_membership_events(
+        self,
+        condition_id: int,
+        entered: Iterable[str],
+        exited: Iterable[str],
+        occurred_at: Optional[datetime] = None
+    ) -> List[MembershipEvent]:
+        """Save entry ('I') and exit ('D') events"""
+        occurred_at = occurred_at or datetime.now()
+        events = [
+            MembershipEvent(
                 condition_id=condition_id,
                 stock_code=stock_code,
-                stock_name=result_data["stock_name"],
-                current_price=result_data.get("current_price"),
-                change_rate=result_data.get("change_rate"),
-                volume=result_data.get("volume"),
-                is_new_entry=is_new_entry,
-                searched_at=datetime.now()
+                event=event,
+                occurred_at=occurred_at
             )
+            for event, codes in (("I", entered), ("D", exited))
+            for stock_code in codes
+        ]
+        
+        if events:
+            self.db.add_all(events)
+            self.db.commit()
+        
+        return events
+    
+    def save_search_batch(
+        self,
+        condition_id: int,
+        results: List[dict],
+        previous_stock_codes: AbstractSet[str],
+        searched_at: Optional[datetime] = None,
+        record_history: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Save a whole result batch (and its history row) in one transaction
+        
+        Rows go out as one executemany; IDs come back through
+        INSERT ... RETURNING where the dialect supports it. All rows of the
+        batch share one searched_at.
+        
+        Args:
+            condition_id: Condition ID
+            results: Result data (stock_code, stock_name, current_price, ...)
+            previous_stock_codes: Current members (others are new entries)
+            searched_at: Batch time (default: now)
+            record_history: Also write the monitoring history row
+        
+        Returns:
+            Stored rows as dictionaries (SearchResultResponse fields),
+            built without re-reading them
+        """
+        searched_at = searched_at or datetime.now()
+        rows = [
+            {
+                "condition_id": condition_id,
+                "stock_code": result_data["stock_code"],
+                "stock_name": result_data["stock_name"],
+                "current_price": result_data.get("current_price"),
+                "change_rate": result_data.get("change_rate"),
+                "volume": result_data.get("volume"),
+                "is_new_entry": result_data["stock_code"] not in previous_stock_codes,
+                "searched_at": searched_at,
+            }
+            for result_data in results
+        ]
+        
+        try:
+            if rows:
+                for row, result_id in zip(rows, self._insert_results(rows)):
+                    row["id"] = result_id
             
-            self.db.add(result)
-            saved_results.append(result)
+            if record_history:
+                self.db.add(MonitoringHistory(
+                    condition_id=condition_id,
+                    execution_time=searched_at,
+                    result_count=len(rows),
+                    new_entry_count=sum(1 for row in rows if row["is_new_entry"]),
+                    status="success"
+                ))
+            
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         
-        self.db.commit()
+        return rows
+    
+    def _insert_results(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert result rows and return their IDs in row order"""
+        table = SearchResult.__table__
+        dialect = self.db.get_bind().dialect
+        
+        if dialect.insert_executemany_returning_sort_by_parameter_order:
+            statement = table.insert().returning(table.c.id, sort_by_parameter_order=True)
+            return list(self.db.execute(statement, rows).scalars())
+        
+        # No multi-row RETURNING: plain executemany, then read the IDs above
+        # the previous maximum (earlier pages of a streamed run share
+        # searched_at, so the time alone does not identify this batch)
+        condition_id = rows[0]["condition_id"]
+        last_id = self.db.query(func.max(SearchResult.id)).filter(
+            SearchResult.condition_id == condition_id
+        ).scalar() or 0
+        self.db.execute(table.insert(), rows)
+        return [
+            row.id for row in self.db.query(SearchResult.id).filter(
+                SearchResult.condition_id == condition_id,
+                SearchResult.searched_at == rows[0]["searched_at"],
+                SearchResult.id > last_id
+            ).order_by(SearchResult.id)
+        ]
+    
+    def get_latest_snapshot(
+        self,
+        condition_id: int,
+        at: Optional[datetime] = None,
+        keyframe_only: bool = False
+    ) -> Optional[ResultSnapshot]:
+        """Most recent delta-storage snapshot (optionally at or before a time)"""
+        query = self.db.query(ResultSnapshot).filter(
+            ResultSnapshot.condition_id == condition_id
+        )
+        
+        if at is not None:
+            query = query.filter(ResultSnapshot.searched_at <= at)
+        if keyframe_only:
+            query = query.filter(ResultSnapshot.is_keyframe == True)
+        
+        return query.order_by(desc(ResultSnapshot.searched_at), desc(ResultSnapshot.id)).first()
+    
+    def count_snapshots_after(self, snapshot: ResultSnapshot) -> int:
+        """Number of snapshots of the same condition stored after a snapshot"""
+        return self.db.query(func.count(ResultSnapshot.id)).filter(
+            ResultSnapshot.condition_id == snapshot.condition_id,
+            ResultSnapshot.id > snapshot.id
+        ).scalar()
+    
+    def get_stock_names(self, stock_codes: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Stored stock names (all, or only the given codes)"""
+        query = self.db.query(StockName.stock_code, StockName.stock_name)
+        
+        if stock_codes is not None:
+            query = query.filter(StockName.stock_code.in_(list(stock_codes)))
+        
+        return {row.stock_code: row.stock_name for row in query}
+    
+    def save_stock_names(self, names: Dict[str, str]) -> None:
+        """Insert or update stock names (committed with the caller's transaction)"""
+        for stock_code, stock_name in names.items():
+            self.db.merge(StockName(stock_code=stock_code, stock_name=stock_name))
+    
+    def reconstruct_results(
+        self,
+        condition_id: int,
+        at: datetime
+    ) -> Optional[Tuple[datetime, List[Dict[str, Any]]]]:
+        """
+        Rebuild a condition's result from delta storage as of a time
+        
+        Starts at the last keyframe at or before `at`, applies membership
+        events and value changes stored after it up to `at`.
+        
+        Args:
+            condition_id: Condition ID
+            at: Point in time
+        
+        Returns:
+            (time of the last run at or before `at`, rows sorted by stock code),
+            or None if no keyframe precedes `at`
+        """
+        keyframe = self.get_latest_snapshot(condition_id, at, keyframe_only=True)
+        if keyframe is None:
+            return None
+        
+        rows = self.db.query(
+            ResultDelta.snapshot_id,
+            ResultDelta.stock_code,
+            ResultDelta.current_price,
+            ResultDelta.change_rate,
+            ResultDelta.volume
+        ).join(ResultSnapshot).filter(
+            ResultSnapshot.condition_id == condition_id,
+            ResultSnapshot.id >= keyframe.id,
+            ResultSnapshot.searched_at <= at
+        ).order_by(ResultDelta.id)
+        
+        members = set()
+        values: Dict[str, List[Any]] = {}
+        for row in rows:
+            fields = (row.current_price, row.change_rate, row.volume)
+            if row.snapshot_id == keyframe.id:
+                members.add(row.stock_code)
+                values[row.stock_code] = list(fields)
+            else:
+                current = values.setdefault(row.stock_code, [None, None, None])
+                for index, value in enumerate(fields):
+                    if value is not None:
+                        current[index] = value
         
-        for result in saved_results:
-            self.db.refresh(result)
+        # Membership changes since the keyframe (those of the keyframe run
+        # itself agree with its rows and only mark new entries)
+        searched_at = self.get_latest_snapshot(condition_id, at).searched_at
+        events = self.db.query(
+            MembershipEvent.stock_code,
+            MembershipEvent.event,
+            MembershipEvent.occurred_at
+        ).filter(
+            MembershipEvent.condition_id == condition_id,
+            MembershipEvent.occurred_at >= keyframe.searched_at,
+            MembershipEvent.occurred_at <= at
+        ).order_by(MembershipEvent.id)
+        entered_last_run = set()
+        for event in events:
+            if event.event == "I":
+                members.add(event.stock_code)
+                if event.occurred_at == searched_at:
+                    entered_last_run.add(event.stock_code)
+            else:
+                members.discard(event.stock_code)
         
-        return saved_results
+        names = self.get_stock_names(members)
+        results = []
+        for stock_code in sorted(members):
+            current_price, change_rate, volume = values.get(stock_code, (None, None, None))
+            results.append({
+                "condition_id": condition_id,
+                "stock_code": stock_code,
+                "stock_name": names.get(stock_code, ""),
+                "current_price": current_price,
+                "change_rate": change_rate,
+                "volume": volume,
+                "is_new_entry": stock_code in entered_last_run,
+                "searched_at": searched_at,
+            })
+        return searched_at, results
     
     def save_monitoring_history(
         self,
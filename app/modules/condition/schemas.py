@@ -41,7 +41,7 @@ class SearchResultBase(BaseModel):
 
 class SearchResultResponse(SearchResultBase):
     """Search result response schema"""
-    id: int
+    id: Optional[int] = None  # None with delta-encoded storage
     condition_id: int
     is_new_entry: bool
     searched_at: datetime
@@ -66,6 +66,16 @@ class ConditionSearchResponse(BaseModel):
     searched_at: datetime
 
 
+class ConditionMembersResponse(BaseModel):
+    """Point-in-time condition membership response schema"""
+    condition_seq: str
+    condition_name: str
+    at: datetime
+    searched_at: Optional[datetime] = None  # Last search at or before `at`
+    total_count: int
+    results: List[SearchResultResponse]
+
+
 class MonitoringHistoryResponse(BaseModel):
     """Monitoring history response schema"""
     id: int
@@ -2,20 +2,48 @@
 Condition search service
 """
 
-from typing import List, Optional
-from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, AsyncIterator
+from datetime import datetime
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.core.logging import logger
+from app.core.constants import TR_ID_CONDITION_LIST
 from app.client.rest_client import KiwoomRestClient
+from app.client.websocket_client import get_websocket_client
+from app.client.fid import ConditionRow, decode_condition_row
 from .repository import ConditionRepository
+from .membership import get_membership_store
+from .history import get_delta_store
 from .schemas import (
     ConditionResponse,
     ConditionCreate,
     ConditionSearchResponse,
+    ConditionMembersResponse,
     SearchResultResponse,
 )
 
+settings = get_settings()
+
+
+def search_result_data(row: ConditionRow) -> Dict[str, Any]:
+    """
+    Convert a decoded CNSRREQ row to result data
+    
+    Args:
+        row: Record from decode_condition_row
+    
+    Returns:
+        Dictionary accepted by ConditionRepository.save_search_batch
+    """
+    return {
+        "stock_code": row.stock_code,
+        "stock_name": row.stock_name,
+        "current_price": row.current_price,
+        "change_rate": row.change_rate,
+        "volume": row.volume,
+    }
+
 
 class ConditionService:
     """Condition search service"""
@@ -23,6 +51,11 @@ class ConditionService:
     def __init__(self, db: Session):
         self.db = db
         self.repository = ConditionRepository(db)
+        self.membership = get_membership_store()
+        # Delta-encoded result storage (None: every row in search_results)
+        self.result_store = (
+            get_delta_store() if settings.CONDITION_RESULT_STORAGE == "delta" else None
+        )
         self.client = KiwoomRestClient()
     
     async def fetch_and_sync_conditions(self) -> List[ConditionResponse]:
@@ -34,6 +67,9 @@ class ConditionService:
         """
         logger.info("Fetching condition list from API...")
         
+        # Explicit sync must not be served from the response cache
+        self.client.invalidate_cache(TR_ID_CONDITION_LIST)
+        
         async with self.client:
             response = await self.client.get_condition_list()
         
@@ -70,7 +106,8 @@ class ConditionService:
     async def execute_condition_search(
         self,
         user_id: str,
-        seq: str
+        seq: str,
+        source: str = "search"
     ) -> ConditionSearchResponse:
         """
         Execute condition search and save results
@@ -78,28 +115,16 @@ class ConditionService:
         Args:
             user_id: User ID
             seq: Condition sequence number
+            source: Membership change label ("reconcile": the realtime
+                engine notifies entries that pushes missed)
         
         Returns:
             Search results
         """
         logger.info(f"Executing condition search (seq: {seq})...")
         
-        # Get condition from DB
-        condition = self.repository.get_condition_by_seq(seq)
-        if not condition:
-            # Create if not exists
-            condition = self.repository.create_condition(
-                ConditionCreate(
-                    seq=seq,
-                    name=f"Condition {seq}",
-                    is_active=True
-                )
-            )
-        
-        # Get previous results (last hour)
-        since = datetime.now() - timedelta(hours=1)
-        previous_results = self.repository.get_previous_results(condition.id, since)
-        previous_stock_codes = {r.stock_code for r in previous_results}
+        condition = self._get_or_create_condition(seq)
+        previous_stock_codes = self.membership.get(self.db, condition.id)
         
         # Execute search via API
         async with self.client:
@@ -110,6 +135,10 @@ class ConditionService:
         
         results_data = []
         for item in api_results:
+            if "9001" in item:
+                # FID-keyed rows (same layout as WebSocket CNSRREQ)
+                results_data.append(search_result_data(decode_condition_row(item)))
+                continue
             results_data.append({
                 "stock_code": item.get("stock_code", ""),
                 "stock_name": item.get("stock_name", ""),
@@ -118,36 +147,243 @@ class ConditionService:
                 "volume": item.get("volume"),
             })
         
-        # Save results
-        saved_results = self.repository.save_search_results(
+        # Save results and monitoring history (one transaction)
+        searched_at = datetime.now()
+        if self.result_store is not None:
+            saved_results = self.result_store.save_run(
+                self.db,
+                condition.id,
+                results_data,
+                previous_stock_codes,
+                searched_at=searched_at
+            )
+        else:
+            saved_results = self.repository.save_search_batch(
+                condition.id,
+                results_data,
+                previous_stock_codes,
+                searched_at=searched_at
+            )
+        
+        membership = self.membership.update(
+            self.db,
             condition.id,
-            results_data,
-            previous_stock_codes
+            (r["stock_code"] for r in results_data),
+            occurred_at=searched_at,
+            source=source
         )
         
         # Count new entries
-        new_entry_count = sum(1 for r in saved_results if r.is_new_entry)
+        new_entry_count = sum(1 for r in saved_results if r["is_new_entry"])
+        
+        logger.info(
+            f"Search completed: {len(saved_results)} results, "
+            f"{new_entry_count} new entries, {len(membership.exited)} exits"
+        )
+        
+        return ConditionSearchResponse(
+            condition_seq=condition.seq,
+            condition_name=condition.name,
+            total_count=len(saved_results),
+            new_entry_count=new_entry_count,
+            results=[SearchResultResponse(**r) for r in saved_results],
+            searched_at=searched_at
+        )
+    
+    async def stream_condition_search(
+        self,
+        user_id: str,
+        seq: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute condition search page by page and stream the results
+        
+        Follows WebSocket continuation pages (cont_yn/next_key). Each page is
+        saved and emitted before the next one is processed, so large result
+        sets are never held in memory at once.
+        
+        Args:
+            user_id: User ID
+            seq: Condition sequence number
+        
+        Yields:
+            {"type": "result", ...} per stock, then one {"type": "summary", ...}
+            ({"type": "error", "detail": ...} if the search fails midway)
+        """
+        logger.info(f"Streaming condition search (seq: {seq}, user: {user_id})...")
+        
+        condition = self._get_or_create_condition(seq)
+        previous_stock_codes = self.membership.get(self.db, condition.id)
+        found_codes = set()
+        searched_at = datetime.now()
+        
+        total_count = 0
+        new_entry_count = 0
+        pages = 0
+        run = None
+        
+        try:
+            if self.result_store is not None:
+                run = self.result_store.start_run(self.db, condition.id, searched_at)
+            
+            # WebSocket LOGIN needs a valid token
+            await self.client.ensure_authenticated()
+            ws_client = get_websocket_client()
+            
+            async for page in ws_client.iter_condition_results(seq):
+                pages += 1
+                results_data = [
+                    search_result_data(decode_condition_row(row))
+                    for row in page.get("data") or []
+                ]
+                if run is not None:
+                    saved_results = run.add(results_data, previous_stock_codes)
+                else:
+                    saved_results = self.repository.save_search_batch(
+                        condition.id,
+                        results_data,
+                        previous_stock_codes,
+                        searched_at=searched_at,
+                        record_history=False
+                    )
+                for result in saved_results:
+                    found_codes.add(result["stock_code"])
+                    total_count += 1
+                    new_entry_count += result["is_new_entry"]
+                    yield {
+                        "type": "result",
+                        **SearchResultResponse(**result).model_dump(mode="json"),
+                    }
+        except Exception as e:
+            logger.error(f"Condition search stream failed (seq: {seq}): {e}")
+            self._close_partial_search(
+                condition, run, found_codes, total_count, new_entry_count, searched_at, str(e)
+            )
+            yield {"type": "error", "detail": str(e)}
+            return
+        except BaseException:
+            # Client disconnected (GeneratorExit) or the task was cancelled:
+            # close the run before the generator goes away
+            logger.warning(f"Condition search stream abandoned (seq: {seq}) after {pages} pages")
+            self._close_partial_search(
+                condition, run, found_codes, total_count, new_entry_count, searched_at,
+                "Stream abandoned by client"
+            )
+            raise
+        
+        if run is not None:
+            run.finish()
+        membership = self.membership.update(
+            self.db,
+            condition.id,
+            found_codes,
+            occurred_at=searched_at
+        )
         
-        # Save monitoring history
         self.repository.save_monitoring_history(
             condition.id,
-            result_count=len(saved_results),
+            result_count=total_count,
             new_entry_count=new_entry_count,
             status="success"
         )
         
         logger.info(
-            f"Search completed: {len(saved_results)} results, "
-            f"{new_entry_count} new entries"
+            f"Search stream completed: {total_count} results in {pages} pages, "
+            f"{new_entry_count} new entries, {len(membership.exited)} exits"
         )
         
-        return ConditionSearchResponse(
+        yield {
+            "type": "summary",
+            "condition_seq": condition.seq,
+            "condition_name": condition.name,
+            "total_count": total_count,
+            "new_entry_count": new_entry_count,
+            "exit_count": len(membership.exited),
+            "pages": pages,
+            "searched_at": searched_at.isoformat(),
+        }
+    
+    def _close_partial_search(
+        self,
+        condition,
+        run,
+        found_codes: set,
+        total_count: int,
+        new_entry_count: int,
+        searched_at: datetime,
+        error_message: str
+    ) -> None:
+        """Record a search that ended midway: partial run, entries so far, failed history"""
+        # Partial result: record entries, but absent stocks may be on unread pages
+        if run is not None:
+            try:
+                run.finish(complete=False)
+            except Exception as e:
+                logger.warning(f"Failed to close partial result run (seq: {condition.seq}): {e}")
+        try:
+            self.membership.update(
+                self.db,
+                condition.id,
+                found_codes,
+                complete=False,
+                occurred_at=searched_at
+            )
+            self.repository.save_monitoring_history(
+                condition.id,
+                result_count=total_count,
+                new_entry_count=new_entry_count,
+                status="failed",
+                error_message=error_message
+            )
+        except Exception as e:
+            logger.error(f"Failed to record partial condition search (seq: {condition.seq}): {e}")
+    
+    def _get_or_create_condition(self, seq: str):
+        """Get condition by seq, creating a placeholder if unknown"""
+        condition = self.repository.get_condition_by_seq(seq)
+        if not condition:
+            condition = self.repository.create_condition(
+                ConditionCreate(
+                    seq=seq,
+                    name=f"Condition {seq}",
+                    is_active=True
+                )
+            )
+        return condition
+    
+    def get_members_at(
+        self,
+        seq: str,
+        at: Optional[datetime] = None
+    ) -> Optional[ConditionMembersResponse]:
+        """
+        Stocks that matched a condition at a point in time
+        
+        Args:
+            seq: Condition sequence number
+            at: Point in time (default: now)
+        
+        Returns:
+            Result of the last search at or before `at`
+            (None if the condition is unknown)
+        """
+        condition = self.repository.get_condition_by_seq(seq)
+        if not condition:
+            return None
+        
+        at = at or datetime.now()
+        if at.tzinfo is not None:
+            # Stored times are naive local time
+            at = at.astimezone().replace(tzinfo=None)
+        searched_at, rows = self.repository.get_members_at(condition.id, at)
+        
+        return ConditionMembersResponse(
             condition_seq=condition.seq,
             condition_name=condition.name,
-            total_count=len(saved_results),
-            new_entry_count=new_entry_count,
-            results=[SearchResultResponse.model_validate(r) for r in saved_results],
-            searched_at=datetime.now()
+            at=at,
+            searched_at=searched_at,
+            total_count=len(rows),
+            results=[SearchResultResponse(**row) for row in rows]
         )
     
     def get_all_conditions(self, active_only: bool = False) -> List[ConditionResponse]:
@@ -0,0 +1,40 @@
+"""
+Stock information API endpoints
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core.logging import logger
+from .service import StockService
+from .schemas import StockPricesRequest, StockPricesResponse
+
+router = APIRouter(prefix="/stocks", tags=["Stock"])
+
+
+def get_stock_service() -> StockService:
+    """Get stock service instance"""
+    return StockService()
+
+
+@router.post("/prices", response_model=StockPricesResponse)
+async def get_stock_prices(
+    request: StockPricesRequest,
+    stock_service: StockService = Depends(get_stock_service)
+):
+    """
+    Get current prices for many stocks at once
+    
+    Args:
+        request: Stock codes and market code
+    
+    Returns:
+        Prices keyed by stock code, with a report of codes that failed
+    """
+    try:
+        return await stock_service.get_stock_prices(
+            stock_codes=request.stock_codes,
+            market_code=request.market_code
+        )
+    except Exception as e:
+        logger.error(f"Bulk stock price request failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,40 @@
+"""
+Stock information schemas
+"""
+
+from typing import Any, Dict, List
+from pydantic import BaseModel, Field, field_validator
+
+from app.shared.utils.validators import validate_stock_code, validate_market_code
+
+
+class StockPricesRequest(BaseModel):
+    """Bulk stock price request schema"""
+    stock_codes: List[str] = Field(..., min_length=1, max_length=500)
+    market_code: str = "J"
+    
+    @field_validator('stock_codes')
+    @classmethod
+    def validate_stock_codes(cls, v):
+        """Validate 6-digit stock codes"""
+        invalid = [code for code in v if not validate_stock_code(code)]
+        if invalid:
+            raise ValueError(f"Invalid stock codes: {', '.join(invalid[:10])}")
+        return v
+    
+    @field_validator('market_code')
+    @classmethod
+    def validate_market(cls, v):
+        """Validate market code"""
+        if not validate_market_code(v):
+            raise ValueError(f"Invalid market code: {v}")
+        return v
+
+
+class StockPricesResponse(BaseModel):
+    """Bulk stock price response schema"""
+    requested_count: int
+    success_count: int
+    failed_count: int
+    prices: Dict[str, Dict[str, Any]]
+    errors: Dict[str, str]
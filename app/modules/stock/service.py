@@ -0,0 +1,48 @@
+"""
+Stock information service
+"""
+
+from typing import List
+
+from app.core.logging import logger
+from app.client.rest_client import KiwoomRestClient
+from .schemas import StockPricesResponse
+
+
+class StockService:
+    """Stock information service"""
+    
+    def __init__(self):
+        self.client = KiwoomRestClient()
+    
+    async def get_stock_prices(
+        self,
+        stock_codes: List[str],
+        market_code: str = "J"
+    ) -> StockPricesResponse:
+        """
+        Get current prices for many stocks
+        
+        Args:
+            stock_codes: 6-digit stock codes (duplicates are fetched once)
+            market_code: Market code (J: KOSPI, Q: KOSDAQ)
+        
+        Returns:
+            Prices keyed by stock code with per-code failures
+        """
+        async with self.client:
+            result = await self.client.get_stock_prices(stock_codes, market_code)
+        
+        prices = result["prices"]
+        errors = result["errors"]
+        
+        if errors:
+            logger.warning(f"Bulk price request: {len(errors)} codes failed")
+        
+        return StockPricesResponse(
+            requested_count=len(prices) + len(errors),
+            success_count=len(prices),
+            failed_count=len(errors),
+            prices=prices,
+            errors=errors,
+        )
@@ -24,7 +24,7 @@ def register_jobs(scheduler: AsyncIOScheduler):
         logger.info("Scheduler is disabled")
         return
     
-    # Job 1: Check conditions periodically
+    # Job 1: Check conditions periodically (reconciliation only while realtime pushes are live)
     scheduler.add_job(
         check_conditions_task,
         trigger=IntervalTrigger(seconds=settings.CONDITION_CHECK_INTERVAL),
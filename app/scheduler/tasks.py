@@ -5,24 +5,47 @@ Scheduler tasks
 from datetime import datetime
 from typing import List
 
+from app.core.config import get_settings
 from app.core.logging import logger
 from app.core.database import SessionLocal
+from app.core.constants import LANE_MONITORING
+from app.client.priority import request_priority
 from app.shared.utils.datetime import is_market_open
 from app.modules.condition.service import ConditionService
 from app.modules.notifications.service import NotificationService
 
+settings = get_settings()
+
 
 async def check_conditions_task():
     """
     Periodic task to check all active conditions
-    """
-    logger.info("Starting condition check task...")
     
+    While the realtime condition engine is receiving pushes this only
+    reconciles (every CONDITION_RECONCILE_INTERVAL); the engine notifies
+    entries that pushes missed. Otherwise it polls and notifies itself.
+    """
     # Check if market is open
     if not is_market_open():
         logger.info("Market is closed, skipping condition check")
         return
     
+    engine = None
+    if settings.REALTIME_CONDITIONS_ENABLED:
+        from app.modules.condition.realtime import get_realtime_engine
+        
+        engine = get_realtime_engine()
+        if engine.is_live():
+            since = engine.seconds_since_reconcile()
+            if since is not None and since < settings.CONDITION_RECONCILE_INTERVAL:
+                return
+        else:
+            engine = None
+    
+    logger.info(
+        "Starting condition reconciliation..." if engine else "Starting condition check task..."
+    )
+    
     db = SessionLocal()
     notification_service = NotificationService()
     
@@ -41,12 +64,23 @@ async def check_conditions_task():
         # Check each condition
         for condition in conditions:
             try:
-                # Execute condition search
+                # Execute condition search (monitoring lane: yields to user requests)
                 # Note: You'll need to provide user_id from settings or database
-                result = await condition_service.execute_condition_search(
-                    user_id="YOUR_USER_ID",  # TODO: Get from settings
-                    seq=condition.seq
-                )
+                with request_priority(LANE_MONITORING):
+                    result = await condition_service.execute_condition_search(
+                        user_id="YOUR_USER_ID",  # TODO: Get from settings
+                        seq=condition.seq,
+                        source="reconcile" if engine is not None else "search"
+                    )
+                
+                if engine is not None:
+                    # Entries pushes missed were announced by the engine when
+                    # the shared membership was updated
+                    engine.remember_stock_names(
+                        {stock.stock_code: stock.stock_name for stock in result.results}
+                    )
+                    engine.reconcile(condition.seq, (stock.stock_code for stock in result.results))
+                    continue
                 
                 # Send notifications for new entries
                 if result.new_entry_count > 0:
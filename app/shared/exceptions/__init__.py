@@ -7,6 +7,7 @@ from .api_exceptions import (
     APIException,
     AuthenticationException,
     RateLimitException,
+    CircuitOpenException,
     InvalidRequestException,
 )
 
@@ -15,5 +16,6 @@ __all__ = [
     "APIException",
     "AuthenticationException",
     "RateLimitException",
+    "CircuitOpenException",
     "InvalidRequestException",
 ]
@@ -2,6 +2,8 @@
 API-related exceptions
 """
 
+from typing import Optional
+
 from .base import KiwoomException
 
 
@@ -23,10 +25,18 @@ class AuthenticationException(APIException):
 class RateLimitException(APIException):
     """Rate limit exceeded exception"""
     
-    def __init__(self, message: str = "Rate limit exceeded"):
+    def __init__(self, message: str = "Rate limit exceeded", retry_after: Optional[float] = None):
+        self.retry_after = retry_after
         super().__init__(message, status_code=429, code="RATE_LIMIT_ERROR")
 
 
+class CircuitOpenException(APIException):
+    """Circuit breaker open (endpoint temporarily unavailable) exception"""
+    
+    def __init__(self, message: str = "Circuit breaker is open"):
+        super().__init__(message, status_code=503, code="CIRCUIT_OPEN")
+
+
 class InvalidRequestException(APIException):
     """Invalid request exception"""
     
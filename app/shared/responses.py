@@ -0,0 +1,16 @@
+"""
+Response classes
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.core.codec import dumps_bytes
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the application JSON codec"""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
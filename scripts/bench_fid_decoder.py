@@ -0,0 +1,106 @@
+"""
+FID 디코더 마이크로 벤치마크
+
+CNSRREQ 결과 행(FID 키, zero-padded 부호 문자열)을 변환하는 세 가지 방식을 비교한다.
+
+- dict: 기존 방식 (행마다 str() / strip() / int() 후 dict 생성)
+- record: app.client.fid 의 생성된 행 디코더 (__slots__ 레코드)
+- columns: 페이지 단위 컬럼 디코더 (숫자 컬럼은 array)
+
+사용법:
+    python scripts/bench_fid_decoder.py
+    python scripts/bench_fid_decoder.py --rows 1000 --number 200
+"""
+
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.client.fid import decode_condition_page, decode_condition_row
+import sample_payloads
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """기존 방식의 숫자 변환"""
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def dict_row(row: Dict[str, str]) -> Dict[str, Any]:
+    """기존 방식: 필드별 dict 생성"""
+    price = _to_int(row.get("10"))
+    change = _to_int(row.get("11"))
+    rate = _to_int(row.get("12"))
+    return {
+        "stock_code": str(row.get("9001", "")).strip().lstrip("A"),
+        "stock_name": str(row.get("302", "")).strip(),
+        "current_price": abs(price) if price is not None else None,
+        "change_sign": str(row.get("25", "")).strip(),
+        "change": change,
+        "change_rate": round(rate / 1000, 2) if rate is not None else None,
+        "volume": _to_int(row.get("13")),
+        "open_price": abs(_to_int(row.get("16")) or 0),
+        "high_price": abs(_to_int(row.get("17")) or 0),
+        "low_price": abs(_to_int(row.get("18")) or 0),
+    }
+
+
+def check(rows: List[Dict[str, str]]) -> None:
+    """세 방식의 결과가 같은지 확인"""
+    columns = decode_condition_page(rows)
+    for i, row in enumerate(rows):
+        expected = dict_row(row)
+        record = decode_condition_row(row)
+        for name, value in expected.items():
+            actual = getattr(record, name)
+            assert actual == value, (name, actual, value)
+            column_value = columns[name][i]
+            assert column_value == value, (name, column_value, value)
+
+
+def bench(func, number: int) -> float:
+    """1회 평균 실행 시간 (마이크로초)"""
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="FID 디코더 벤치마크")
+    parser.add_argument("--rows", type=int, default=300, help="페이지당 행 수 (기본: 300)")
+    parser.add_argument("--number", type=int, default=500, help="반복 횟수 (기본: 500)")
+    args = parser.parse_args()
+
+    rows = sample_payloads.condition_rows(args.rows)
+    check(rows)
+
+    cases = [
+        ("dict", lambda: [dict_row(row) for row in rows]),
+        ("record", lambda: [decode_condition_row(row) for row in rows]),
+        ("columns", lambda: decode_condition_page(rows)),
+    ]
+
+    print(f"CNSRREQ page: {len(rows)} rows, {len(rows[0])} FIDs\n")
+    print(f"{'decoder':<10} {'page(us)':>10} {'row(ns)':>9} {'speedup':>8}")
+    print("-" * 40)
+
+    base_us = None
+    for name, func in cases:
+        page_us = bench(func, args.number)
+        base_us = base_us or page_us
+        print(
+            f"{name:<10} {page_us:>10.1f} {page_us * 1000 / len(rows):>9.0f} "
+            f"{base_us / page_us:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
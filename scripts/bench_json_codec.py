@@ -0,0 +1,105 @@
+"""
+JSON 코덱 마이크로 벤치마크
+
+표준 라이브러리 json 과 app.core.codec 의 선택된 백엔드(orjson/ujson)를
+키움 페이로드(조건검색 결과, 실시간 체결, 조건목록)로 비교한다.
+
+사용법:
+    python scripts/bench_json_codec.py
+    python scripts/bench_json_codec.py --file recorded.jsonl   # 녹화된 프레임 사용
+"""
+
+import sys
+import json
+import timeit
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core import codec
+import sample_payloads
+
+
+def load_payloads(file_path: str = None) -> dict:
+    """벤치마크 대상 페이로드 (JSON 문자열)"""
+    if file_path:
+        frames = {}
+        with open(file_path, "r", encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                # Mock 서버 녹화 형식: {"response": {...}} 또는 원본 프레임
+                frame = record.get("response", record)
+                frames[f"frame_{i}:{frame.get('trnm', 'REST')}"] = json.dumps(
+                    frame, ensure_ascii=False
+                )
+        return frames
+
+    codes = [f"{100000 + i:06d}" for i in range(50)]
+    return {
+        "CNSRREQ (300 rows)": json.dumps(
+            sample_payloads.condition_search(count=300), ensure_ascii=False
+        ),
+        "REAL 0B (50 ticks)": json.dumps(
+            sample_payloads.realtime_ticks(codes), ensure_ascii=False
+        ),
+        "REAL 0B (1 tick)": json.dumps(
+            sample_payloads.realtime_ticks(codes[:1]), ensure_ascii=False
+        ),
+        "CNSRLST (20)": json.dumps(sample_payloads.condition_list(20), ensure_ascii=False),
+        "inquire-price": json.dumps(sample_payloads.stock_price("005930"), ensure_ascii=False),
+    }
+
+
+def bench(func, number: int) -> float:
+    """1회 평균 실행 시간 (마이크로초)"""
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JSON 코덱 벤치마크")
+    parser.add_argument("--file", help="녹화된 JSONL 프레임 파일")
+    parser.add_argument("--number", type=int, default=2000, help="반복 횟수 (기본: 2000)")
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.file)
+
+    print(f"JSON backend: {codec.JSON_BACKEND}\n")
+    print(f"{'payload':<24} {'bytes':>8} {'op':<6} {'stdlib(us)':>11} {'codec(us)':>10} {'speedup':>8}")
+    print("-" * 72)
+
+    for name, text in payloads.items():
+        obj = json.loads(text)
+        raw = text.encode("utf-8")
+
+        cases = [
+            (
+                "loads",
+                lambda: json.loads(raw),
+                lambda: codec.loads(raw),
+            ),
+            (
+                "dumps",
+                lambda: json.dumps(obj, ensure_ascii=False),
+                lambda: codec.dumps(obj),
+            ),
+        ]
+
+        for op, baseline, candidate in cases:
+            base_us = bench(baseline, args.number)
+            codec_us = bench(candidate, args.number)
+            print(
+                f"{name[:24]:<24} {len(raw):>8} {op:<6} "
+                f"{base_us:>11.2f} {codec_us:>10.2f} {base_us / codec_us:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+조건검색 결과 저장 벤치마크
+
+세 가지 저장 경로를 비교한다.
+
+- legacy: 기존 저장 방식 재현 (행마다 db.add + commit 후 행마다 refresh) +
+  save_monitoring_history (별도 commit)
+- batch: save_search_batch (executemany + INSERT ... RETURNING, 이력 포함 단일 트랜잭션)
+- delta: DeltaResultStore (keyframe + 변경분만 저장, CONDITION_RESULT_STORAGE=delta)
+
+모든 경로는 운영과 같이 MembershipStore 로 편입/이탈 이벤트도 기록한다.
+경로마다 별도의 임시 SQLite 파일을 사용하므로 운영 DB 에는 영향이 없다.
+
+사용법:
+    python scripts/bench_result_storage.py
+    python scripts/bench_result_storage.py --rows 300 --runs 100 --change-ratio 0.2
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.client.fid import decode_condition_row
+from app.modules.condition.models import Condition, SearchResult
+from app.modules.condition.repository import ConditionRepository
+from app.modules.condition.membership import MembershipStore
+from app.modules.condition.history import DeltaResultStore
+from app.modules.condition.service import search_result_data
+import sample_payloads
+
+
+def make_batches(rows: int, runs: int, change_ratio: float, seed: int = 0) -> list:
+    """
+    연속된 검색 결과 생성
+
+    매 회차마다 change_ratio 비율의 종목 값(가격/등락률/거래량)이 바뀌고,
+    1~2 종목이 이탈/편입된다.
+    """
+    rng = random.Random(seed)
+    universe = [
+        search_result_data(decode_condition_row(row))
+        for row in sample_payloads.condition_rows(rows * 2, seed=seed)
+    ]
+    members = universe[:rows]
+    waiting = universe[rows:]
+    batches = []
+    for _ in range(runs):
+        members = [dict(result) for result in members]
+        for result in rng.sample(members, int(len(members) * change_ratio)):
+            result["current_price"] += rng.randint(-10, 10) * 10
+            result["change_rate"] = round(rng.uniform(-10, 10), 2)
+            result["volume"] += rng.randint(1, 10_000)
+        for _ in range(rng.randint(1, 2)):
+            waiting.append(members.pop(rng.randrange(len(members))))
+            members.append(waiting.pop(0))
+        batches.append(members)
+    return batches
+
+
+def legacy_save(db, repository, membership, delta_store, condition_id, results):
+    """기존 방식: 결과 저장 + 이력 저장 (각각 commit, 행마다 refresh)"""
+    previous = membership.get(db, condition_id)
+    saved = []
+    for result_data in results:
+        result = SearchResult(
+            condition_id=condition_id,
+            stock_code=result_data["stock_code"],
+            stock_name=result_data["stock_name"],
+            current_price=result_data.get("current_price"),
+            change_rate=result_data.get("change_rate"),
+            volume=result_data.get("volume"),
+            is_new_entry=result_data["stock_code"] not in previous,
+            searched_at=datetime.now(),
+        )
+        db.add(result)
+        saved.append(result)
+    db.commit()
+    for result in saved:
+        db.refresh(result)
+    repository.save_monitoring_history(
+        condition_id,
+        result_count=len(saved),
+        new_entry_count=sum(1 for r in saved if r.is_new_entry),
+    )
+    membership.update(db, condition_id, (r["stock_code"] for r in results))
+
+
+def batch_save(db, repository, membership, delta_store, condition_id, results):
+    """일괄 저장: 결과 + 이력 단일 트랜잭션"""
+    previous = membership.get(db, condition_id)
+    repository.save_search_batch(condition_id, results, previous)
+    membership.update(db, condition_id, (r["stock_code"] for r in results))
+
+
+def delta_save(db, repository, membership, delta_store, condition_id, results):
+    """delta 저장: keyframe + 변경분"""
+    previous = membership.get(db, condition_id)
+    delta_store.save_run(db, condition_id, results, previous)
+    membership.update(db, condition_id, (r["stock_code"] for r in results))
+
+
+def run_path(tmp_dir: str, name: str, save, batches: list, keyframe_interval: int) -> dict:
+    """한 경로로 batches 를 모두 저장하고 처리량/저장량 반환"""
+    db_file = os.path.join(tmp_dir, f"{name}.db")
+    engine = create_engine(f"sqlite:///{db_file}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        condition = Condition(seq=f"bench-{name}", name=name)
+        db.add(condition)
+        db.commit()
+        condition_id = condition.id
+
+        repository = ConditionRepository(db)
+        membership = MembershipStore()
+        delta_store = DeltaResultStore(keyframe_interval)
+
+        rows = 0
+        started = time.perf_counter()
+        for results in batches:
+            save(db, repository, membership, delta_store, condition_id, results)
+            rows += len(results)
+        elapsed = time.perf_counter() - started
+
+        stored = sum(
+            db.query(func.count()).select_from(table).scalar()
+            for table in Base.metadata.sorted_tables
+            if table.name not in ("conditions", "monitoring_history", "token_history")
+        )
+    finally:
+        db.close()
+        engine.dispose()
+
+    return {
+        "rows_per_second": rows / elapsed,
+        "stored_rows": stored,
+        "db_bytes": os.path.getsize(db_file),
+    }
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="조건검색 결과 저장 벤치마크")
+    parser.add_argument("--rows", type=int, default=100, help="검색 1회당 결과 수 (기본: 100)")
+    parser.add_argument("--runs", type=int, default=60, help="검색 횟수 (기본: 60)")
+    parser.add_argument(
+        "--change-ratio", type=float, default=0.1,
+        help="회차마다 값이 바뀌는 종목 비율 (기본: 0.1)",
+    )
+    parser.add_argument("--keyframe-interval", type=int, default=20, help="delta keyframe 간격 (기본: 20)")
+    args = parser.parse_args()
+
+    batches = make_batches(args.rows, args.runs, args.change_ratio)
+
+    print(
+        f"{args.runs} runs x {args.rows} rows, change ratio {args.change_ratio}, "
+        f"keyframe every {args.keyframe_interval} runs\n"
+    )
+    print(f"{'path':<8} {'rows/s':>10} {'ms/run':>8} {'stored rows':>12} {'db KB':>8}")
+    print("-" * 50)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, save in (("legacy", legacy_save), ("batch", batch_save), ("delta", delta_save)):
+            result = run_path(tmp_dir, name, save, batches, args.keyframe_interval)
+            results[name] = result
+            print(
+                f"{name:<8} {result['rows_per_second']:>10.0f} "
+                f"{args.rows / result['rows_per_second'] * 1000:>8.2f} "
+                f"{result['stored_rows']:>12} {result['db_bytes'] / 1024:>8.0f}"
+            )
+
+    legacy, batch, delta = results["legacy"], results["batch"], results["delta"]
+    print(f"\nbatch vs legacy: {batch['rows_per_second'] / legacy['rows_per_second']:.1f}x rows/s")
+    print(
+        f"delta vs batch: {batch['stored_rows'] / delta['stored_rows']:.1f}x fewer rows, "
+        f"{batch['db_bytes'] / delta['db_bytes']:.1f}x smaller DB"
+    )
+
+
+if __name__ == "__main__":
+    main()
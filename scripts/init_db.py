@@ -13,7 +13,16 @@ from app.core.logging import logger
 
 # Import all models to ensure they are registered
 from app.modules.auth.models import TokenHistory
-from app.modules.condition.models import Condition, SearchResult, MonitoringHistory
+from app.modules.condition.models import (
+    Condition,
+    SearchResult,
+    MonitoringHistory,
+    MembershipEvent,
+    MembershipBaseline,
+    StockName,
+    ResultSnapshot,
+    ResultDelta,
+)
 
 
 def main():
@@ -21,8 +30,8 @@ def main():
     logger.info("Initializing database...")
     
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        # Create all tables (and indexes missing on existing tables)
+        init_db()
         
         logger.info("Database tables created successfully:")
         for table in Base.metadata.sorted_tables:
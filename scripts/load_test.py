@@ -0,0 +1,189 @@
+"""
+Mock 서버 대상 전체 스택 부하 테스트
+
+KiwoomRestClient / KiwoomWebSocketClient 를 그대로 사용해 로컬 Mock 서버
+(scripts/mock_kiwoom_server.py)에 요청을 보내고 처리량과 지연시간을 측정한다.
+rate limiter, retry, circuit breaker, cache 등 클라이언트 계층이 모두 포함된다.
+
+사용법:
+    python scripts/mock_kiwoom_server.py --port 9000 &
+    python scripts/load_test.py --scenario prices --count 500
+    python scripts/load_test.py --scenario search --count 50 --concurrency 5
+    python scripts/load_test.py --scenario ws-search --count 50
+    python scripts/load_test.py --scenario prices --rate-per-second 200   # 클라이언트 제한 완화
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def parse_args() -> argparse.Namespace:
+    """명령행 인자"""
+    parser = argparse.ArgumentParser(description="Mock 서버 대상 부하 테스트")
+    parser.add_argument("--base-url", default="http://127.0.0.1:9000", help="Mock 서버 REST URL")
+    parser.add_argument("--ws-uri", help="Mock 서버 WebSocket URI (기본: base-url 기준)")
+    parser.add_argument(
+        "--scenario",
+        choices=["prices", "search", "ws-search"],
+        default="prices",
+        help="prices: 현재가 일괄조회, search: REST 조건검색, ws-search: WebSocket 조건검색",
+    )
+    parser.add_argument("--count", type=int, default=200, help="요청 수 (기본: 200)")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 요청 수 (기본: 20)")
+    parser.add_argument("--conditions", type=int, default=10, help="조건식 개수 (seq 순환)")
+    parser.add_argument("--rate-per-second", type=int, help="클라이언트 초당 제한 (기본: 상수값)")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# 앱 설정 로드 전에 Mock 서버로 향하도록 환경변수 지정 (실제 토큰 파일은 건드리지 않음)
+os.environ["KIWOOM_BASE_URL"] = args.base_url
+os.environ["KIWOOM_WEBSOCKET_URI"] = args.ws_uri or (
+    args.base_url.replace("http://", "ws://").replace("https://", "wss://")
+    + "/api/dostk/websocket"
+)
+os.environ["KIWOOM_TOKEN_FILE"] = "data/.token.mock"
+os.environ.setdefault("KIWOOM_APP_KEY", "mock-app-key")
+os.environ.setdefault("KIWOOM_APP_SECRET", "mock-app-secret")
+
+import httpx
+
+from app.core.metrics import metrics
+from app.client.rate_limiter import RateLimiter
+from app.client.rest_client import KiwoomRestClient
+from app.client.websocket_client import KiwoomWebSocketClient
+
+
+def percentile(values: List[float], q: float) -> float:
+    """정렬된 값의 분위수"""
+    if not values:
+        return 0.0
+    index = min(int(q * len(values)), len(values) - 1)
+    return values[index]
+
+
+async def run_concurrent(
+    count: int,
+    concurrency: int,
+    request: Callable[[int], Awaitable[None]],
+) -> List[float]:
+    """요청을 동시 실행하고 요청별 지연시간 목록 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await request(i)
+            except Exception as e:
+                errors += 1
+                if errors <= 5:
+                    print(f"[ERROR] request {i}: {e}")
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    if errors:
+        print(f"[WARN] {errors}/{count} requests failed")
+    return latencies
+
+
+def print_report(name: str, count: int, elapsed: float, latencies: List[float]) -> None:
+    """결과 출력"""
+    latencies = sorted(latencies)
+    print(f"\n{'='*60}")
+    print(f"  {name}")
+    print(f"{'='*60}")
+    print(f"requests     : {count}")
+    print(f"elapsed      : {elapsed:.2f}s")
+    print(f"throughput   : {count / elapsed:.1f} req/s")
+    if latencies:
+        print(
+            f"latency (ms) : p50={percentile(latencies, 0.5) * 1000:.1f} "
+            f"p90={percentile(latencies, 0.9) * 1000:.1f} "
+            f"p99={percentile(latencies, 0.99) * 1000:.1f} "
+            f"max={latencies[-1] * 1000:.1f}"
+        )
+
+    # 클라이언트 계층별 시간 분해 (app.core.metrics)
+    snapshot = metrics.snapshot()["metrics"]
+    print("\nbreakdown (mean / p99 ms):")
+    for metric_name, children in snapshot.items():
+        if not metric_name.endswith("_seconds"):
+            continue
+        for child in children:
+            labels = ",".join(v for v in child["labels"].values() if v)
+            print(
+                f"  {metric_name:<36} {labels:<64} "
+                f"{child['mean'] * 1000:>8.2f} {child['p99'] * 1000:>8.2f}  (n={child['count']})"
+            )
+
+
+async def print_server_stats() -> None:
+    """Mock 서버 카운터 출력"""
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"{args.base_url}/_mock/stats")
+            print(f"\nmock server: {response.json()}")
+    except httpx.HTTPError as e:
+        print(f"\n[WARN] mock server stats unavailable: {e}")
+
+
+async def main():
+    """메인 함수"""
+    rate_limiter = None
+    if args.rate_per_second:
+        rate_limiter = RateLimiter(
+            per_second=args.rate_per_second,
+            per_minute=args.rate_per_second * 60,
+            name="load_test",
+        )
+    client = KiwoomRestClient(rate_limiter=rate_limiter)
+    await client.get_access_token()
+
+    started = time.perf_counter()
+
+    if args.scenario == "prices":
+        async def price(i: int):
+            # 종목코드가 모두 달라 응답 캐시는 적중하지 않음
+            await client.get_stock_price(f"{100000 + i:06d}")
+
+        latencies = await run_concurrent(args.count, args.concurrency, price)
+
+    elif args.scenario == "search":
+        async def search(i: int):
+            await client.search_by_condition("mock", str(i % args.conditions))
+
+        latencies = await run_concurrent(args.count, args.concurrency, search)
+
+    else:
+        ws_client = KiwoomWebSocketClient()
+        if not await ws_client.connect():
+            print("[ERROR] WebSocket 연결 실패")
+            return
+
+        async def ws_search(i: int):
+            await ws_client.search_condition(seq=str(i % args.conditions))
+
+        # 한 연결에서 동시 요청 (응답은 trnm + seq 로 매칭)
+        latencies = await run_concurrent(args.count, args.concurrency, ws_search)
+        await ws_client.disconnect()
+
+    elapsed = time.perf_counter() - started
+    print_report(f"scenario: {args.scenario}", args.count, elapsed, latencies)
+    await print_server_stats()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,590 @@
+"""
+키움 API Mock 서버 (오프라인 부하 테스트용)
+
+실제 api.kiwoom.com 대신 로컬에서 다음을 제공한다.
+- REST: /oauth2/token, psearch-result (조건목록/조건검색), inquire-price
+- WebSocket: /api/dostk/websocket (LOGIN / PING / CNSRLST / CNSRREQ / REG / REMOVE, 실시간 체결 푸시)
+
+지연시간, 응답 크기, 오류율, 429(Retry-After) 동작을 옵션으로 조절할 수 있고,
+실서버 세션을 녹화(--record, 프록시 모드)한 뒤 재생(--replay)할 수 있다.
+
+사용법:
+    python scripts/mock_kiwoom_server.py --port 9000 --latency-ms 30 --rows 300
+    python scripts/mock_kiwoom_server.py --rate-limit 20 --retry-after 1 --error-rate 0.01
+    python scripts/mock_kiwoom_server.py --record session.jsonl   # 실서버 프록시 + 녹화
+    python scripts/mock_kiwoom_server.py --replay session.jsonl   # 녹화 재생
+
+애플리케이션 연결 (.env):
+    KIWOOM_BASE_URL=http://127.0.0.1:9000
+    KIWOOM_WEBSOCKET_URI=ws://127.0.0.1:9000/api/dostk/websocket
+    KIWOOM_TOKEN_FILE=data/.token.mock
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import itertools
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import sample_payloads
+from app.client.fid import parse_rate
+
+TR_ID_CONDITION_LIST = "HHKST03900300"
+TR_ID_CONDITION_SEARCH = "HHKST03900400"
+
+UPSTREAM_REST_URL = "https://api.kiwoom.com"
+UPSTREAM_WS_URL = "wss://api.kiwoom.com:10000/api/dostk/websocket"
+
+# 녹화 시 저장하지 않는 프레임 (토큰 포함 / 의미 없음)
+SKIP_RECORD_TRNM = {"LOGIN", "PING"}
+
+
+class MockConfig:
+    """Mock 서버 동작 설정"""
+
+    def __init__(
+        self,
+        latency_ms: float = 20.0,
+        jitter_ms: float = 10.0,
+        rows: int = 100,
+        page_size: int = 100,
+        conditions: int = 10,
+        error_rate: float = 0.0,
+        rate_limit: int = 0,
+        retry_after: float = 1.0,
+        token_ttl: int = 86400,
+        ping_interval: float = 0.0,
+        tick_interval: float = 1.0,
+        seed: int = 0,
+        record: Optional[str] = None,
+        replay: Optional[str] = None,
+        upstream_rest_url: str = UPSTREAM_REST_URL,
+        upstream_ws_url: str = UPSTREAM_WS_URL,
+    ):
+        self.latency_ms = latency_ms  # 응답 기본 지연
+        self.jitter_ms = jitter_ms  # 지연 편차 (균등분포 0~jitter)
+        self.rows = rows  # 조건검색 결과 종목 수
+        self.page_size = page_size  # WebSocket CNSRREQ 한 페이지 종목 수 (연속조회)
+        self.conditions = conditions  # 조건식 개수
+        self.error_rate = error_rate  # 오류 응답 비율 (REST 500 / WS return_code=1)
+        self.rate_limit = rate_limit  # REST 앱키별 초당 허용 요청 수 (0: 무제한), 초과 시 429
+        self.retry_after = retry_after  # 429 응답의 Retry-After (초)
+        self.token_ttl = token_ttl  # 발급 토큰 유효시간 (초)
+        self.ping_interval = ping_interval  # 서버 PING 주기 (0: 보내지 않음)
+        self.tick_interval = tick_interval  # REG 등록 종목 실시간 체결(0B) 푸시 주기 (0: 보내지 않음)
+        self.seed = seed
+        self.record = record
+        self.replay = replay
+        self.upstream_rest_url = upstream_rest_url
+        self.upstream_ws_url = upstream_ws_url
+
+
+class MockStats:
+    """요청/응답 카운터"""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.counters: Dict[str, int] = defaultdict(int)
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started_at
+        rest = self.counters.get("rest_requests", 0)
+        return {
+            "uptime_seconds": round(elapsed, 1),
+            "rest_requests_per_second": round(rest / elapsed, 2) if elapsed else 0.0,
+            **dict(sorted(self.counters.items())),
+        }
+
+
+class RateWindow:
+    """1초 고정 윈도우 요청 제한 (초과 시 429)"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._window = 0
+        self._count = 0
+
+    def allow(self) -> bool:
+        if self.limit <= 0:
+            return True
+        window = int(time.monotonic())
+        if window != self._window:
+            self._window = window
+            self._count = 0
+        self._count += 1
+        return self._count <= self.limit
+
+
+class SessionRecorder:
+    """녹화 파일 작성 (JSONL, 한 줄에 한 응답)"""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, kind: str, key: str, response: Any, status: int = 200) -> None:
+        record = {
+            "kind": kind,
+            "key": key,
+            "status": status,
+            "recorded_at": datetime.now().isoformat(),
+            "response": response,
+        }
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SessionReplayer:
+    """녹화 파일 재생: 같은 요청 키의 응답을 녹화 순서대로 순환"""
+
+    def __init__(self, path: str):
+        self._responses: Dict[str, list] = defaultdict(list)
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    record = json.loads(line)
+                    self._responses[record["key"]].append(record)
+        self._cursors = {key: itertools.cycle(records) for key, records in self._responses.items()}
+
+    def next(self, key: str) -> Optional[Dict[str, Any]]:
+        cursor = self._cursors.get(key)
+        return next(cursor) if cursor else None
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._responses.values())
+
+
+def rest_key(path: str, tr_id: Optional[str], params: Dict[str, Any]) -> str:
+    """REST 요청 식별 키"""
+    return f"rest|{path}|{tr_id or ''}|{json.dumps(sorted(params.items()), ensure_ascii=False)}"
+
+
+def ws_key(trnm: str, seq: Any = "", next_key: Any = "") -> str:
+    """WebSocket 요청 식별 키"""
+    return f"ws|{trnm}|{seq or ''}|{next_key or ''}"
+
+
+def condition_items(count: int) -> list:
+    """REST 조건목록 output (ConditionService 파싱 형식)"""
+    return [{"seq": str(i), "name": f"조건식{i}"} for i in range(count)]
+
+
+def search_items(seq: str, count: int, seed: int) -> list:
+    """REST 조건검색 output (ConditionService 파싱 형식)"""
+    items = []
+    for row in sample_payloads.condition_rows(count, seed=f"{seq}:{seed}"):
+        items.append({
+            "stock_code": row["9001"].lstrip("A"),
+            "stock_name": row["302"],
+            "current_price": float(int(row["10"])),
+            "change_rate": parse_rate(row["12"]),
+            "volume": int(row["13"]),
+        })
+    return items
+
+
+def create_app(config: MockConfig) -> FastAPI:
+    """Mock 서버 FastAPI 앱 생성"""
+    stats = MockStats()
+    rate_windows: Dict[str, RateWindow] = defaultdict(lambda: RateWindow(config.rate_limit))
+    rng = random.Random(config.seed)
+    recorder = SessionRecorder(config.record) if config.record else None
+    replayer = SessionReplayer(config.replay) if config.replay else None
+    upstream: Dict[str, Any] = {}
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        if "client" in upstream:
+            await upstream["client"].aclose()
+        if recorder:
+            recorder.close()
+
+    app = FastAPI(title="Kiwoom Mock Server", lifespan=lifespan)
+    app.state.config = config
+    app.state.stats = stats
+
+    async def simulate_latency() -> None:
+        delay = config.latency_ms + rng.uniform(0, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def inject_error() -> bool:
+        return config.error_rate > 0 and rng.random() < config.error_rate
+
+    # ------------------------------------------------------------------
+    # REST
+    # ------------------------------------------------------------------
+
+    async def proxy_rest(request: Request, key: str) -> JSONResponse:
+        """녹화 모드: 실서버로 전달하고 응답 저장"""
+        import httpx
+
+        client = upstream.get("client")
+        if client is None:
+            client = upstream["client"] = httpx.AsyncClient(base_url=config.upstream_rest_url)
+
+        headers = {
+            k: v for k, v in request.headers.items()
+            if k.lower() not in ("host", "content-length")
+        }
+        response = await client.request(
+            request.method,
+            request.url.path,
+            params=dict(request.query_params),
+            headers=headers,
+            content=await request.body(),
+        )
+        try:
+            body = response.json()
+        except ValueError:
+            body = {"raw": response.text}
+
+        recorded = body
+        if isinstance(body, dict) and "token" in body:
+            # 실제 토큰은 녹화 파일에 남기지 않음
+            recorded = {**body, "token": "REDACTED"}
+        recorder.write("rest", key, recorded, response.status_code)
+        stats.inc("recorded")
+
+        passthrough = {
+            k: v for k, v in response.headers.items() if k.lower() == "retry-after"
+        }
+        return JSONResponse(body, status_code=response.status_code, headers=passthrough)
+
+    async def respond(
+        request: Request,
+        tr_id: Optional[str],
+        build,
+    ) -> JSONResponse:
+        """공통 REST 처리: 429 / 지연 / 오류 주입 / 녹화·재생"""
+        stats.inc("rest_requests")
+        params = dict(request.query_params)
+        key = rest_key(request.url.path, tr_id, params)
+
+        if recorder:
+            return await proxy_rest(request, key)
+
+        if not rate_windows[request.headers.get("appkey", "")].allow():
+            stats.inc("rest_429")
+            return JSONResponse(
+                {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."},
+                status_code=429,
+                headers={"Retry-After": f"{config.retry_after:g}"},
+            )
+
+        await simulate_latency()
+
+        if inject_error():
+            stats.inc("rest_500")
+            return JSONResponse({"rt_cd": "1", "msg1": "mock internal error"}, status_code=500)
+
+        if replayer:
+            record = replayer.next(key)
+            if record is not None:
+                stats.inc("replayed")
+                return JSONResponse(record["response"], status_code=record.get("status", 200))
+            stats.inc("replay_miss")
+
+        return JSONResponse(build(params))
+
+    @app.post("/oauth2/token")
+    async def issue_token(request: Request):
+        stats.inc("token_issued")
+
+        def build(_params):
+            expires_dt = datetime.now() + timedelta(seconds=config.token_ttl)
+            return {
+                "return_code": 0,
+                "return_msg": "정상적으로 처리되었습니다",
+                "token": f"MOCK{rng.getrandbits(96):024x}",
+                "token_type": "Bearer",
+                "expires_dt": expires_dt.strftime("%Y%m%d%H%M%S"),
+            }
+
+        if recorder:
+            return await respond(request, None, build)
+        # 재생 모드에서도 토큰은 항상 새로 발급
+        stats.inc("rest_requests")
+        await simulate_latency()
+        return JSONResponse(build({}))
+
+    @app.get("/uapi/domestic-stock/v1/quotations/psearch-result")
+    async def psearch_result(request: Request):
+        tr_id = request.headers.get("tr_id")
+
+        def build(params):
+            if tr_id == TR_ID_CONDITION_SEARCH:
+                output = search_items(params.get("seq", "0"), config.rows, config.seed)
+            else:
+                output = condition_items(config.conditions)
+            return {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다.", "output": output}
+
+        return await respond(request, tr_id, build)
+
+    @app.get("/uapi/domestic-stock/v1/quotations/inquire-price")
+    async def inquire_price(request: Request):
+        tr_id = request.headers.get("tr_id")
+
+        def build(params):
+            return sample_payloads.stock_price(params.get("FID_INPUT_ISCD", "000000"), config.seed)
+
+        return await respond(request, tr_id, build)
+
+    @app.get("/_mock/stats")
+    async def mock_stats():
+        """Mock 서버 카운터"""
+        return stats.snapshot()
+
+    # ------------------------------------------------------------------
+    # WebSocket
+    # ------------------------------------------------------------------
+
+    def build_ws_response(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        trnm = message.get("trnm")
+
+        if trnm == "CNSRLST":
+            return sample_payloads.condition_list(config.conditions)
+
+        if trnm == "CNSRREQ":
+            seq = str(message.get("seq", "0"))
+            offset = int(message.get("next_key") or 0)
+            count = max(min(config.page_size, config.rows - offset), 0)
+            has_next = offset + count < config.rows
+            response = sample_payloads.condition_search(
+                seq=seq,
+                count=count,
+                cont_yn="Y" if has_next else "N",
+                next_key=str(offset + count) if has_next else "",
+                seed=f"{seq}:{config.seed}:{offset}",
+            )
+            return response
+
+        return None
+
+    async def proxy_ws(websocket: WebSocket) -> None:
+        """녹화 모드: 실서버 WebSocket 중계 및 응답 저장"""
+        import websockets
+
+        pending: Dict[Tuple[str, str], Deque[str]] = defaultdict(deque)
+
+        async with websockets.connect(config.upstream_ws_url) as upstream_ws:
+
+            async def client_to_upstream():
+                while True:
+                    text = await websocket.receive_text()
+                    message = json.loads(text)
+                    trnm = message.get("trnm", "")
+                    if trnm == "CNSRREQ":
+                        pending[(trnm, str(message.get("seq", "")))].append(
+                            message.get("next_key", "")
+                        )
+                    await upstream_ws.send(text)
+
+            async def upstream_to_client():
+                async for text in upstream_ws:
+                    message = json.loads(text)
+                    trnm = message.get("trnm", "")
+                    if trnm not in SKIP_RECORD_TRNM:
+                        seq = str(message.get("seq", "")) if trnm == "CNSRREQ" else ""
+                        queue = pending.get((trnm, seq))
+                        next_key = queue.popleft() if queue else ""
+                        recorder.write("ws", ws_key(trnm, seq, next_key), message)
+                        stats.inc("recorded")
+                    await websocket.send_text(text if isinstance(text, str) else text.decode())
+
+            tasks = [
+                asyncio.create_task(client_to_upstream()),
+                asyncio.create_task(upstream_to_client()),
+            ]
+            try:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    @app.websocket("/api/dostk/websocket")
+    async def websocket_endpoint(websocket: WebSocket):
+        await websocket.accept()
+        stats.inc("ws_connections")
+
+        if recorder:
+            try:
+                await proxy_ws(websocket)
+            except WebSocketDisconnect:
+                pass
+            return
+
+        logged_in = False
+        ping_task: Optional[asyncio.Task] = None
+        tick_task: Optional[asyncio.Task] = None
+        registered: Dict[str, set] = defaultdict(set)  # grp_no -> 종목코드
+
+        async def send_pings():
+            while True:
+                await asyncio.sleep(config.ping_interval)
+                await websocket.send_text(json.dumps({"trnm": "PING"}))
+
+        async def send_ticks():
+            tick = 0
+            while True:
+                await asyncio.sleep(config.tick_interval)
+                codes = sorted(set().union(*registered.values()))
+                for start in range(0, len(codes), 100):
+                    frame = sample_payloads.realtime_ticks(codes[start:start + 100], seed=tick)
+                    await websocket.send_text(json.dumps(frame, ensure_ascii=False))
+                    stats.inc("ws_ticks", len(frame["data"]))
+                tick += 1
+
+        try:
+            while True:
+                message = json.loads(await websocket.receive_text())
+                trnm = message.get("trnm")
+                stats.inc(f"ws_{trnm}")
+
+                if trnm == "LOGIN":
+                    logged_in = bool(message.get("token"))
+                    response = {
+                        "trnm": "LOGIN",
+                        "return_code": 0 if logged_in else 1,
+                        "return_msg": "" if logged_in else "토큰이 없습니다",
+                    }
+                    await websocket.send_text(json.dumps(response, ensure_ascii=False))
+                    if logged_in and config.ping_interval > 0 and ping_task is None:
+                        ping_task = asyncio.create_task(send_pings())
+                    continue
+
+                if trnm == "PING":
+                    # 클라이언트 에코백
+                    continue
+
+                if trnm in ("REG", "REMOVE") and logged_in:
+                    group = registered[str(message.get("grp_no", "1"))]
+                    if trnm == "REG" and message.get("refresh") == "0":
+                        group.clear()
+                    for entry in message.get("data") or []:
+                        items = set(entry.get("item") or [])
+                        if trnm == "REG":
+                            group.update(items)
+                        else:
+                            group.difference_update(items)
+                    response = {"trnm": trnm, "return_code": 0, "return_msg": ""}
+                    await websocket.send_text(json.dumps(response))
+                    if config.tick_interval > 0 and tick_task is None:
+                        tick_task = asyncio.create_task(send_ticks())
+                    continue
+
+                await simulate_latency()
+
+                if not logged_in or inject_error():
+                    stats.inc("ws_errors")
+                    response = {
+                        "trnm": trnm,
+                        "seq": message.get("seq", ""),
+                        "return_code": 1,
+                        "return_msg": "mock error" if logged_in else "로그인이 필요합니다",
+                    }
+                else:
+                    response = None
+                    if replayer:
+                        record = replayer.next(
+                            ws_key(trnm, message.get("seq", ""), message.get("next_key", ""))
+                        )
+                        if record is not None:
+                            stats.inc("replayed")
+                            response = record["response"]
+                        else:
+                            stats.inc("replay_miss")
+                    if response is None:
+                        response = build_ws_response(message)
+                    if response is None:
+                        stats.inc("ws_unknown")
+                        continue
+
+                await websocket.send_text(json.dumps(response, ensure_ascii=False))
+
+        except WebSocketDisconnect:
+            pass
+        finally:
+            if ping_task:
+                ping_task.cancel()
+            if tick_task:
+                tick_task.cancel()
+
+    return app
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="키움 API Mock 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="응답 지연 (기본: 20ms)")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="지연 편차 (기본: 10ms)")
+    parser.add_argument("--rows", type=int, default=100, help="조건검색 결과 종목 수 (기본: 100)")
+    parser.add_argument("--page-size", type=int, default=100, help="WebSocket 연속조회 페이지 크기")
+    parser.add_argument("--conditions", type=int, default=10, help="조건식 개수 (기본: 10)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument("--rate-limit", type=int, default=0, help="REST 앱키별 초당 허용 요청 수 (0: 무제한)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 Retry-After 초")
+    parser.add_argument("--token-ttl", type=int, default=86400, help="토큰 유효시간 초")
+    parser.add_argument("--ping-interval", type=float, default=0.0, help="서버 PING 주기 초")
+    parser.add_argument("--tick-interval", type=float, default=1.0, help="실시간 체결 푸시 주기 초 (0: 끔)")
+    parser.add_argument("--seed", type=int, default=0)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", help="실서버 프록시 + 세션 녹화 파일 (JSONL)")
+    mode.add_argument("--replay", help="녹화 세션 재생 파일 (JSONL)")
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rows=args.rows,
+        page_size=args.page_size,
+        conditions=args.conditions,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        token_ttl=args.token_ttl,
+        ping_interval=args.ping_interval,
+        tick_interval=args.tick_interval,
+        seed=args.seed,
+        record=args.record,
+        replay=args.replay,
+    )
+
+    import uvicorn
+
+    print(f"Kiwoom mock server: http://{args.host}:{args.port}")
+    print(f"  KIWOOM_BASE_URL=http://{args.host}:{args.port}")
+    print(f"  KIWOOM_WEBSOCKET_URI=ws://{args.host}:{args.port}/api/dostk/websocket")
+    if args.record:
+        print(f"  recording to {args.record} (upstream: {config.upstream_rest_url})")
+    if args.replay:
+        print(f"  replaying {args.replay}")
+
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+키움 API 샘플 페이로드 생성기 (벤치마크 / Mock 서버 공용)
+
+실제 응답 형식(docs/WEBSOCKET_CONDITION_LIST.md, docs/CONDITION_SEARCH_GUIDE.md)을
+따르는 결정적(deterministic) 샘플 데이터를 생성한다.
+"""
+
+import random
+from datetime import datetime
+from typing import Any, Dict, List
+
+STOCK_NAMES = [
+    "삼성전자", "SK하이닉스", "LG에너지솔루션", "삼성바이오로직스", "현대차",
+    "기아", "셀트리온", "POSCO홀딩스", "NAVER", "카카오",
+    "LG화학", "삼성SDI", "KB금융", "신한지주", "현대모비스",
+]
+
+
+def _signed(value: int, width: int = 9) -> str:
+    """키움 형식 부호 포함 zero-padded 숫자 문자열 (예: '-00000100')"""
+    sign = "-" if value < 0 else ""
+    return f"{sign}{abs(value):0{width - len(sign)}d}"
+
+
+def condition_list(count: int = 10) -> Dict[str, Any]:
+    """CNSRLST 응답"""
+    return {
+        "trnm": "CNSRLST",
+        "return_code": 0,
+        "return_msg": "",
+        "data": [[str(i), f"조건식{i}"] for i in range(count)],
+    }
+
+
+def condition_rows(count: int, seed: Any = 0) -> List[Dict[str, str]]:
+    """CNSRREQ 결과 행 (FID 키)"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        price = rng.randint(1_000, 900_000)
+        change = rng.randint(-price // 10, price // 10)
+        sign = "2" if change > 0 else ("5" if change < 0 else "3")
+        rows.append({
+            "9001": f"A{100000 + (i * 7919) % 900000:06d}",
+            "302": f"{STOCK_NAMES[i % len(STOCK_NAMES)]}{i // len(STOCK_NAMES) or ''}",
+            "10": _signed(price),
+            "25": sign,
+            "11": _signed(change),
+            "12": _signed(round(change * 10000 / price) * 10),  # -0.13% -> '-00000130'
+            "13": _signed(rng.randint(0, 50_000_000), 12),
+            "16": _signed(price - rng.randint(0, price // 20)),
+            "17": _signed(price + rng.randint(0, price // 20)),
+            "18": _signed(price - rng.randint(0, price // 20)),
+        })
+    return rows
+
+
+def condition_search(
+    seq: str = "0",
+    count: int = 100,
+    cont_yn: str = "N",
+    next_key: str = "",
+    seed: Any = 0,
+) -> Dict[str, Any]:
+    """CNSRREQ 응답 (한 페이지)"""
+    return {
+        "trnm": "CNSRREQ",
+        "seq": seq,
+        "cont_yn": cont_yn,
+        "next_key": next_key,
+        "return_code": 0,
+        "return_msg": "",
+        "data": condition_rows(count, seed),
+    }
+
+
+def realtime_ticks(codes: List[str], seed: int = 0) -> Dict[str, Any]:
+    """REAL 주식체결(0B) 프레임"""
+    rng = random.Random(seed)
+    now = datetime.now().strftime("%H%M%S")
+    data = []
+    for code in codes:
+        price = rng.randint(1_000, 900_000)
+        change = rng.randint(-price // 10, price // 10)
+        data.append({
+            "type": "0B",
+            "name": "주식체결",
+            "item": code,
+            "values": {
+                "20": now,
+                "10": f"{'+' if change >= 0 else '-'}{price}",
+                "11": f"{'+' if change >= 0 else '-'}{abs(change)}",
+                "12": f"{change * 100 / price:+.2f}",
+                "27": f"+{price + 10}",
+                "28": f"+{price}",
+                "15": f"+{rng.randint(1, 5000)}",
+                "13": str(rng.randint(0, 50_000_000)),
+                "25": "2" if change > 0 else "5",
+            },
+        })
+    return {"trnm": "REAL", "data": data}
+
+
+def stock_price(stock_code: str, seed: int = 0) -> Dict[str, Any]:
+    """REST 주식 현재가 응답"""
+    rng = random.Random(f"{stock_code}:{seed}")
+    price = rng.randint(1_000, 900_000)
+    change = rng.randint(-price // 10, price // 10)
+    return {
+        "rt_cd": "0",
+        "msg_cd": "MCA00000",
+        "msg1": "정상처리 되었습니다.",
+        "output": {
+            "stck_shrn_iscd": stock_code,
+            "stck_prpr": str(price),
+            "prdy_vrss": str(change),
+            "prdy_vrss_sign": "2" if change > 0 else "5",
+            "prdy_ctrt": f"{change * 100 / price:.2f}",
+            "acml_vol": str(rng.randint(0, 50_000_000)),
+        },
+    }
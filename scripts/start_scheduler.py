@@ -10,10 +10,16 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from app.core.config import get_settings
 from app.core.logging import logger
 from app.core.database import init_db
+from app.client.transport import get_http_transport, close_http_transport
+from app.client.token_provider import start_token_refresher, stop_token_refresher
 from app.scheduler.config import create_scheduler
 from app.scheduler.jobs import start_scheduler, stop_scheduler
+from app.modules.condition.membership import get_membership_store
+
+settings = get_settings()
 
 
 async def main():
@@ -30,6 +36,15 @@ async def main():
         logger.error(f"Database initialization failed: {e}")
         return
     
+    # Current condition membership (entry/exit detection)
+    get_membership_store().warm()
+    
+    # Shared HTTP connection pool for Kiwoom API clients
+    get_http_transport()
+    
+    # Rotate access tokens before they expire
+    start_token_refresher()
+    
     # Create and start scheduler
     scheduler = create_scheduler()
     
@@ -46,6 +61,17 @@ async def main():
     # Start scheduler
     start_scheduler(scheduler)
     
+    # Realtime condition pushes (polling job falls back while the session is down)
+    engine = None
+    if settings.REALTIME_CONDITIONS_ENABLED:
+        from app.modules.condition.realtime import get_realtime_engine
+        
+        engine = get_realtime_engine()
+        try:
+            await engine.start()
+        except Exception as e:
+            logger.error(f"Realtime condition engine failed to start: {e}")
+    
     logger.info("Scheduler is running. Press Ctrl+C to stop.")
     
     # Keep running
@@ -56,6 +82,11 @@ async def main():
         logger.info("Keyboard interrupt received")
     finally:
         stop_scheduler(scheduler)
+        if engine is not None:
+            await engine.stop()
+            await engine.ws_client.disconnect()
+        await stop_token_refresher()
+        await close_http_transport()
 
 
 if __name__ == "__main__":